@@ -2,12 +2,14 @@
 
 from .auth import router as auth_router
 from .channels import router as channels_router
+from .dashboard import router as dashboard_router
 from .system import router as system_router
 from .users import router as users_router
 
 __all__ = [
     "auth_router",
     "channels_router",
+    "dashboard_router",
     "system_router",
     "users_router",
 ]
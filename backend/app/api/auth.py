@@ -7,6 +7,7 @@ from fastapi.security import OAuth2PasswordRequestForm
 from ..models.user import Token, User, UserCreate, UserRole
 from ..core.security import create_access_token, ACCESS_TOKEN_EXPIRE_MINUTES
 from ..core.deps import get_current_active_user
+from ..core.executors import run_io
 from ..database import authenticate_user, create_user as db_create_user, get_user_by_username
 
 router = APIRouter(prefix="/api/auth", tags=["Authentication"])
@@ -15,7 +16,7 @@ router = APIRouter(prefix="/api/auth", tags=["Authentication"])
 @router.post("/login", response_model=Token)
 async def login(form_data: OAuth2PasswordRequestForm = Depends()):
     """Login endpoint - returns JWT token"""
-    user_dict = authenticate_user(form_data.username, form_data.password)
+    user_dict = await run_io(authenticate_user, form_data.username, form_data.password)
     if not user_dict:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -47,7 +48,8 @@ async def register_user(
             detail="Only admin can create users"
         )
 
-    success = db_create_user(
+    success = await run_io(
+        db_create_user,
         user_data.username,
         user_data.password,
         user_data.email,
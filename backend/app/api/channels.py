@@ -1,30 +1,40 @@
 """Channels API router - CRUD operations and streaming control"""
 
+import heapq
+import json
 import os
 import subprocess
 import uuid
 from datetime import datetime
+from operator import itemgetter
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
-import pandas as pd
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, UploadFile, File
 
 from ..models.user import User, UserRole
 from ..models.channel import Channel, ChannelBase, ChannelUpdate
 from ..core.deps import get_current_active_user, require_admin
 from ..core.websocket import manager
+from ..core.executors import run_io, run_process
 from ..services.channel_service import (
-    load_channels, save_channels, get_channel_by_name,
+    load_channels, save_channels, get_channel_by_name, config_lock,
     create_channel as service_create_channel,
+    update_channel as service_update_channel,
     delete_channel as service_delete_channel,
-    stop_channel_process, check_channel_status,
-    get_channel_stats_file, get_channel_log_file,
-    STATS_FOLDER, LOGS_FOLDER
+    stop_channel_process, query_channels, ensure_indexes,
+    get_channel_stats_file, get_channel_log_file, get_channel_log_files,
+    get_channel_stats_files, STATS_FOLDER, LOGS_FOLDER
 )
-from ..services.stream_analyzer import get_cached_stream_info, get_all_cached_stream_info, analyze_stream_sync
+from ..services.stream_analyzer import get_cached_stream_info, get_all_cached_stream_info, probe_channel, get_analyzer_stats, drop_stream_info
 from ..services.srt_command_builder import build_secure_srt_command_from_channel, build_srt_command_for_destination
-from ..services.srt_stats_service import get_combined_channel_info, get_srt_connections, parse_srt_stats_csv
+from ..services.srt_stats_service import get_combined_channel_info, get_ts_health, parse_srt_stats_csv, read_stats_rows
+from ..services.socket_inventory import get_sockets_for_pids
+from ..services.connection_index import get_connection_index, drop_connection_index
+from ..services.log_index import get_log_index, drop_log_index, parse_levels
+from ..services.stats_ingest import get_stats_ingester, drop_stats_ingester, correlate_clients
+from ..services.telemetry import build_fleet_summary
+from ..services.port_registry import PORT_POOLS, PortConflictError, port_registry
 
 # Upload folder
 UPLOAD_FOLDER = Path("static/uploads")
@@ -33,17 +43,98 @@ UPLOAD_FOLDER.mkdir(parents=True, exist_ok=True)
 router = APIRouter(prefix="/api/channels", tags=["Channels"])
 
 
+def _port_conflict(e: PortConflictError) -> HTTPException:
+    return HTTPException(status_code=409, detail={"message": str(e), "conflicts": e.conflicts})
+
+
+def _split(value: Optional[str]) -> Optional[List[str]]:
+    """Comma-separated query parameter as a list"""
+    if not value:
+        return None
+    return [item.strip() for item in value.split(",") if item.strip()] or None
+
+
+def _channel_page(fields: Optional[List[str]], **filters) -> Tuple[bytes, int, Optional[str]]:
+    channels, total, next_cursor = query_channels(**filters)
+    if fields:
+        channels = [{field: ch.get(field) for field in fields} for ch in channels]
+    return json.dumps(channels, separators=(",", ":"), default=str).encode(), total, next_cursor
+
+
 @router.get("", response_model=List[Channel])
-async def get_channels(current_user: User = Depends(get_current_active_user)):
-    """Get list of all channels"""
-    channels = load_channels()
+async def get_channels(
+    status: Optional[str] = Query(None, description="Comma-separated statuses (running, stopped, error)"),
+    protocol: Optional[str] = Query(None, description="Comma-separated protocols of any input or output"),
+    mode: Optional[str] = Query(None, description="Comma-separated modes of any input or output"),
+    tag: Optional[str] = Query(None, description="Comma-separated tags, all of which a channel must carry"),
+    name_prefix: Optional[str] = Query(None, description="Channel names starting with this"),
+    name_contains: Optional[str] = Query(None, description="Channel names containing this (case-insensitive)"),
+    port_min: Optional[int] = Query(None, ge=1, le=65535, description="Lowest port any input/output/tap may use"),
+    port_max: Optional[int] = Query(None, ge=1, le=65535, description="Highest port any input/output/tap may use"),
+    sort: Optional[str] = Query(None, description="Sort field, '-' prefix for descending (default: config order)"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
+    limit: Optional[int] = Query(None, ge=1, description="Page size (default: all matching channels)"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return (channel_name is always included)"),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Get list of channels, optionally filtered, sorted and paginated
+
+    The total number of matches is returned in X-Total-Count and, when more
+    pages follow, the cursor of the next one in X-Next-Cursor.
+    """
+    selected = _split(fields)
+    if selected:
+        unknown = [field for field in selected if field not in Channel.model_fields]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+        selected = ["channel_name"] + [field for field in selected if field != "channel_name"]
+
+    try:
+        # Statuses are checked against the process table on the way
+        content, total, next_cursor = await run_io(
+            _channel_page, selected,
+            status=_split(status), protocol=_split(protocol), mode=_split(mode), tags=_split(tag),
+            name_prefix=name_prefix, name_contains=name_contains, port_min=port_min, port_max=port_max,
+            sort=sort, cursor=cursor, limit=limit,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    headers = {"X-Total-Count": str(total)}
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    return Response(content=content, media_type="application/json", headers=headers)
+
+
+def _port_conflicts() -> dict:
+    ensure_indexes()
+    conflicts = port_registry.conflicts()
+    return {"conflicts": conflicts, "total": len(conflicts)}
+
+
+@router.get("/ports/conflicts")
+async def get_port_conflicts(current_user: User = Depends(get_current_active_user)):
+    """Every port claimed by more than one channel across the fleet"""
+    return await run_io(_port_conflicts)
+
+
+def _free_ports(pool: str, count: int) -> dict:
+    ensure_indexes()
+    return {"pool": pool, "ports": port_registry.free_ports(pool, count)}
 
-    # Update channel status by checking if process is running
-    for channel in channels:
-        check_channel_status(channel)
 
-    save_channels(channels)
-    return channels
+@router.get("/ports/free")
+async def get_free_ports(
+    pool: str = Query(default="input", description=f"Port pool ({', '.join(PORT_POOLS)})"),
+    count: int = Query(default=1, ge=1, le=100),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Propose ports of a pool that no channel uses"""
+    try:
+        return await run_io(_free_ports, pool, count)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.get("/{channel_name}", response_model=Channel)
@@ -52,7 +143,7 @@ async def get_channel(
     current_user: User = Depends(get_current_active_user)
 ):
     """Get information about specific channel"""
-    channel = get_channel_by_name(channel_name)
+    channel = await run_io(get_channel_by_name, channel_name)
     if not channel:
         raise HTTPException(status_code=404, detail="Channel not found")
     return channel
@@ -65,7 +156,7 @@ async def create_channel(
 ):
     """Create new channel (admin only)"""
     try:
-        new_channel = service_create_channel(channel)
+        new_channel = await run_io(service_create_channel, channel)
 
         # Broadcast via WebSocket
         await manager.broadcast({
@@ -74,6 +165,8 @@ async def create_channel(
         })
 
         return new_channel
+    except PortConflictError as e:
+        raise _port_conflict(e)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -85,33 +178,32 @@ async def update_channel(
     current_user: User = Depends(require_admin)
 ):
     """Update channel (admin only)"""
-    channels = load_channels()
-
-    for i, channel in enumerate(channels):
-        if channel.channel_name == channel_name:
-            # Cannot update running channel
-            if channel.status == "running":
-                raise HTTPException(
-                    status_code=400,
-                    detail="Cannot update running channel. Stop it first."
-                )
+    try:
+        # Cannot update running channel
+        channel = await run_io(service_update_channel, channel_name, update)
+    except PortConflictError as e:
+        raise _port_conflict(e)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-            # Update only provided fields
-            update_data = update.model_dump(exclude_unset=True)
-            for key, value in update_data.items():
-                setattr(channel, key, value)
+    if channel is None:
+        raise HTTPException(status_code=404, detail="Channel not found")
 
-            channels[i] = channel
-            save_channels(channels)
+    await manager.broadcast({
+        "type": "channel_updated",
+        "channel": channel.model_dump()
+    })
 
-            await manager.broadcast({
-                "type": "channel_updated",
-                "channel": channel.model_dump()
-            })
+    return channel
 
-            return channel
 
-    raise HTTPException(status_code=404, detail="Channel not found")
+def _drop_channel_indexes(channel: Channel):
+    """Forget the log and stats indexes kept for a deleted channel"""
+    for log_info in get_channel_log_files(channel):
+        drop_connection_index(log_info["file"])
+        drop_log_index(log_info["file"])
+    for stats_info in get_channel_stats_files(channel):
+        drop_stats_ingester(stats_info["file"])
 
 
 @router.delete("/{channel_name}")
@@ -120,10 +212,14 @@ async def delete_channel(
     current_user: User = Depends(require_admin)
 ):
     """Delete channel (admin only)"""
-    success = service_delete_channel(channel_name)
+    channel = await run_io(get_channel_by_name, channel_name)
+    success = await run_io(service_delete_channel, channel_name)
     if not success:
         raise HTTPException(status_code=404, detail="Channel not found")
 
+    await run_io(_drop_channel_indexes, channel)
+    drop_stream_info(channel_name)
+
     await manager.broadcast({
         "type": "channel_deleted",
         "channel_name": channel_name
@@ -132,56 +228,80 @@ async def delete_channel(
     return {"message": "Channel deleted successfully"}
 
 
-@router.post("/{channel_name}/start")
-async def start_channel(
-    channel_name: str,
-    current_user: User = Depends(require_admin)
-):
-    """Start channel (admin only)"""
-    channels = load_channels()
+def _start_channel(channel_name: str) -> Channel:
+    """Spawn a channel's srt-live-transmit process(es) and mark it running"""
+    with config_lock:
+        channels = load_channels()
 
-    for i, channel in enumerate(channels):
-        if channel.channel_name == channel_name:
-            if channel.status == "running":
-                raise HTTPException(status_code=400, detail="Channel is already running")
+        for i, channel in enumerate(channels):
+            if channel.channel_name == channel_name:
+                if channel.status == "running":
+                    raise HTTPException(status_code=400, detail="Channel is already running")
 
-            try:
-                # Create stats and log files
-                sanitized_name = channel.channel_name.replace(' ', '_').replace('/', '_').replace('\\', '_')
-                stats_file = STATS_FOLDER / f"{sanitized_name}.csv"
-
-                pids = []
-
-                # Check if channel has multiple destinations
-                if channel.destinations and len(channel.destinations) > 0:
-                    # Build source configuration from channel input settings
-                    source = {
-                        'protocol': channel.input_protocol,
-                        'ip': channel.input_ip,
-                        'port': channel.input_port,
-                        'mode': channel.input_mode,
-                        'passphrase': channel.input_passphrase or channel.passphrase,
-                        'pbkeylen': channel.input_pbkeylen or channel.pbkeylen,
-                        'extra_params': getattr(channel, 'input_extra_params', ''),
-                    }
-
-                    # Start a process for each destination
-                    for idx, dest in enumerate(channel.destinations):
-                        dest_log_file = LOGS_FOLDER / f"{sanitized_name}_dest{idx}.log"
-                        dest_stats_file = STATS_FOLDER / f"{sanitized_name}_dest{idx}.csv"
-
-                        # Build command for this destination
-                        cmd = build_srt_command_for_destination(
-                            channel.model_dump(),
-                            source,
-                            dest,
-                            dest_stats_file,
-                            idx
-                        )
-                        print(f"Starting destination {idx} with command: {' '.join(cmd)}")
-
-                        # Start process for this destination
-                        with open(dest_log_file, 'a') as log_f:
+                # A port a running channel holds would only fail to bind in the log
+                ensure_indexes()
+                try:
+                    port_registry.check(channel.model_dump(), running_only=True)
+                except PortConflictError as e:
+                    raise _port_conflict(e)
+
+                try:
+                    # Create stats and log files
+                    sanitized_name = channel.channel_name.replace(' ', '_').replace('/', '_').replace('\\', '_')
+                    stats_file = STATS_FOLDER / f"{sanitized_name}.csv"
+
+                    pids = []
+
+                    # Check if channel has multiple destinations
+                    if channel.destinations and len(channel.destinations) > 0:
+                        # Build source configuration from channel input settings
+                        source = {
+                            'protocol': channel.input_protocol,
+                            'ip': channel.input_ip,
+                            'port': channel.input_port,
+                            'mode': channel.input_mode,
+                            'passphrase': channel.input_passphrase or channel.passphrase,
+                            'pbkeylen': channel.input_pbkeylen or channel.pbkeylen,
+                            'extra_params': getattr(channel, 'input_extra_params', ''),
+                        }
+
+                        # Start a process for each destination
+                        for idx, dest in enumerate(channel.destinations):
+                            dest_log_file = LOGS_FOLDER / f"{sanitized_name}_dest{idx}.log"
+                            dest_stats_file = STATS_FOLDER / f"{sanitized_name}_dest{idx}.csv"
+
+                            # Build command for this destination
+                            cmd = build_srt_command_for_destination(
+                                channel.model_dump(),
+                                source,
+                                dest,
+                                dest_stats_file,
+                                idx
+                            )
+                            print(f"Starting destination {idx} with command: {' '.join(cmd)}")
+
+                            # Start process for this destination
+                            with open(dest_log_file, 'a') as log_f:
+                                process = subprocess.Popen(
+                                    cmd,
+                                    shell=False,
+                                    stdout=log_f,
+                                    stderr=subprocess.STDOUT,
+                                    start_new_session=True
+                                )
+                                pids.append(process.pid)
+
+                        channel.stats_file = str(STATS_FOLDER / f"{sanitized_name}_dest0.csv")
+                    else:
+                        # Single output - use existing logic
+                        log_file = LOGS_FOLDER / f"{sanitized_name}.log"
+
+                        # Build secure command
+                        cmd = build_secure_srt_command_from_channel(channel, stats_file, log_file)
+                        print(f"Starting channel with command: {' '.join(cmd)}")
+
+                        # Start process without shell injection
+                        with open(log_file, 'a') as log_f:
                             process = subprocess.Popen(
                                 cmd,
                                 shell=False,
@@ -191,93 +311,90 @@ async def start_channel(
                             )
                             pids.append(process.pid)
 
-                    channel.stats_file = str(STATS_FOLDER / f"{sanitized_name}_dest0.csv")
-                else:
-                    # Single output - use existing logic
-                    log_file = LOGS_FOLDER / f"{sanitized_name}.log"
-
-                    # Build secure command
-                    cmd = build_secure_srt_command_from_channel(channel, stats_file, log_file)
-                    print(f"Starting channel with command: {' '.join(cmd)}")
-
-                    # Start process without shell injection
-                    with open(log_file, 'a') as log_f:
-                        process = subprocess.Popen(
-                            cmd,
-                            shell=False,
-                            stdout=log_f,
-                            stderr=subprocess.STDOUT,
-                            start_new_session=True
-                        )
-                        pids.append(process.pid)
-
-                    channel.stats_file = str(stats_file)
-
-                # Update channel state
-                channel.pid = pids[0] if pids else None
-                channel.pids = pids
-                channel.status = "running"
-                channel.start_date = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                channel.error_message = ""
+                        channel.stats_file = str(stats_file)
 
-                channels[i] = channel
-                save_channels(channels)
-
-                await manager.broadcast({
-                    "type": "channel_started",
-                    "channel": channel.model_dump()
-                })
+                    # Update channel state
+                    channel.pid = pids[0] if pids else None
+                    channel.pids = pids
+                    channel.status = "running"
+                    channel.start_date = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                    channel.error_message = ""
 
-                return {
-                    "message": f"Channel started successfully with {len(pids)} process(es)",
-                    "pids": channel.pids
-                }
+                    channels[i] = channel
+                    save_channels(channels)
+                    return channel
 
-            except Exception as e:
-                channel.status = "error"
-                channel.error_message = str(e)
-                channels[i] = channel
-                save_channels(channels)
-                raise HTTPException(
-                    status_code=500,
-                    detail=f"Failed to start channel: {str(e)}"
-                )
+                except Exception as e:
+                    channel.status = "error"
+                    channel.error_message = str(e)
+                    channels[i] = channel
+                    save_channels(channels)
+                    raise HTTPException(
+                        status_code=500,
+                        detail=f"Failed to start channel: {str(e)}"
+                    )
 
     raise HTTPException(status_code=404, detail="Channel not found")
 
 
-@router.post("/{channel_name}/stop")
-async def stop_channel(
+@router.post("/{channel_name}/start")
+async def start_channel(
     channel_name: str,
     current_user: User = Depends(require_admin)
 ):
-    """Stop channel (admin only)"""
-    channels = load_channels()
+    """Start channel (admin only)"""
+    channel = await run_process(_start_channel, channel_name)
+
+    await manager.broadcast({
+        "type": "channel_started",
+        "channel": channel.model_dump()
+    })
+
+    return {
+        "message": f"Channel started successfully with {len(channel.pids)} process(es)",
+        "pids": channel.pids
+    }
 
-    for i, channel in enumerate(channels):
-        if channel.channel_name == channel_name:
-            if channel.status != "running":
-                raise HTTPException(status_code=400, detail="Channel is not running")
 
-            stop_channel_process(channel)
+def _stop_channel(channel_name: str) -> Channel:
+    """Kill a channel's process(es) and mark it stopped"""
+    with config_lock:
+        channels = load_channels()
 
-            channel.pid = None
-            channel.pids = None
-            channel.status = "stopped"
+        for i, channel in enumerate(channels):
+            if channel.channel_name == channel_name:
+                if channel.status != "running":
+                    raise HTTPException(status_code=400, detail="Channel is not running")
 
-            channels[i] = channel
-            save_channels(channels)
+                stop_channel_process(channel)
 
-            await manager.broadcast({
-                "type": "channel_stopped",
-                "channel": channel.model_dump()
-            })
+                channel.pid = None
+                channel.pids = None
+                channel.status = "stopped"
 
-            return {"message": "Channel stopped successfully"}
+                channels[i] = channel
+                save_channels(channels)
+                return channel
 
     raise HTTPException(status_code=404, detail="Channel not found")
 
 
+@router.post("/{channel_name}/stop")
+async def stop_channel(
+    channel_name: str,
+    current_user: User = Depends(require_admin)
+):
+    """Stop channel (admin only)"""
+    channel = await run_process(_stop_channel, channel_name)
+
+    await manager.broadcast({
+        "type": "channel_stopped",
+        "channel": channel.model_dump()
+    })
+
+    return {"message": "Channel stopped successfully"}
+
+
 @router.post("/{channel_name}/restart")
 async def restart_channel(
     channel_name: str,
@@ -290,12 +407,8 @@ async def restart_channel(
     return await start_channel(channel_name, current_user)
 
 
-@router.get("/stats/all")
-async def get_all_channels_stats(
-    time_range: Optional[str] = "1h",
-    current_user: User = Depends(get_current_active_user)
-):
-    """Get aggregated statistics for all channels"""
+def _all_channels_stats(time_range: Optional[str]) -> dict:
+    """Read the recent stats of every channel and aggregate the latest rows"""
     channels = load_channels()
     result = {
         "channels": [],
@@ -328,16 +441,10 @@ async def get_all_channels_stats(
 
         if stats_file and os.path.exists(stats_file) and os.path.getsize(stats_file) > 0:
             try:
-                df = pd.read_csv(stats_file)
-                if not df.empty:
-                    # Filter by time range
-                    if 'Time' in df.columns:
-                        # Keep last N records based on time_range (stats every 5 sec)
-                        limits = {'5m': 60, '15m': 180, '30m': 360, '1h': 720, '6h': 4320, '24h': 17280, '7d': 120960}
-                        limit = limits.get(time_range, 720)
-                        df = df.tail(limit)
-
-                    stats_data = df.to_dict(orient='records')
+                # Keep last N records based on time_range (stats every 5 sec)
+                limits = {'5m': 60, '15m': 180, '30m': 360, '1h': 720, '6h': 4320, '24h': 17280, '7d': 120960}
+                stats_data = read_stats_rows(stats_file, limits.get(time_range, 720))
+                if stats_data:
                     channel_stats["stats"] = stats_data
 
                     if stats_data:
@@ -367,6 +474,16 @@ async def get_all_channels_stats(
     return result
 
 
+@router.get("/stats/all")
+async def get_all_channels_stats(
+    time_range: Optional[str] = "1h",
+    current_user: User = Depends(get_current_active_user)
+):
+    """Get aggregated statistics for all channels"""
+    return Response(content=await run_io(_render_json, _all_channels_stats, time_range),
+                    media_type="application/json")
+
+
 @router.get("/{channel_name}/stats")
 async def get_channel_stats(
     channel_name: str,
@@ -374,10 +491,25 @@ async def get_channel_stats(
     current_user: User = Depends(get_current_active_user)
 ):
     """Get channel statistics"""
-    channel = get_channel_by_name(channel_name)
+    channel = await run_io(get_channel_by_name, channel_name)
     if not channel:
         raise HTTPException(status_code=404, detail="Channel not found")
 
+    return Response(content=await run_io(_render_json, _channel_stats_history, channel, time_range),
+                    media_type="application/json")
+
+
+def _render_json(fn, *args) -> bytes:
+    """
+    Build a response body off the event loop. Stats rows run to thousands of
+    values per channel; encoding them through FastAPI would hold the loop.
+    """
+    return json.dumps(fn(*args), separators=(",", ":"), default=str).encode()
+
+
+def _channel_stats_history(channel: Channel, time_range: Optional[str]) -> dict:
+    """Rows of a channel's stats CSV, limited to `time_range`"""
+    channel_name = channel.channel_name
     stats_file = channel.stats_file
     if not stats_file:
         sanitized_name = channel_name.replace(' ', '_').replace('/', '_').replace('\\', '_')
@@ -391,25 +523,41 @@ async def get_channel_stats(
         return {"data": [], "message": "No stats collected yet. Start the channel to collect statistics.", "total_records": 0}
 
     try:
-        df = pd.read_csv(stats_file)
-        if df.empty:
-            return {"data": [], "message": "No stats available", "total_records": 0}
-
         # Filter by time range (stats collected every 5 seconds)
-        if time_range != "all" and 'Time' in df.columns:
+        limit = None
+        if time_range != "all":
             limits = {'5m': 60, '15m': 180, '30m': 360, '1h': 720, '6h': 4320, '24h': 17280, '7d': 120960}
-            limit = limits.get(time_range, len(df))
-            df = df.tail(limit)
+            limit = limits.get(time_range)
 
-        stats_data = df.to_dict(orient='records')
+        stats_data = read_stats_rows(stats_file, limit)
+        if not stats_data:
+            return {"data": [], "message": "No stats available", "total_records": 0}
         return {"data": stats_data, "total_records": len(stats_data)}
-    except pd.errors.EmptyDataError:
-        return {"data": [], "message": "No stats collected yet", "total_records": 0}
     except Exception as e:
         print(f"Error reading stats for {channel_name}: {e}")
         return {"data": [], "message": f"Error reading stats: {str(e)}", "total_records": 0}
 
 
+def _process_info(channel: Channel, proc_idx: int) -> dict:
+    """Describe the output of one channel process for the logs views"""
+    dest = channel.destinations[proc_idx] if channel.destinations and proc_idx < len(channel.destinations) else None
+    if dest:
+        return {
+            "idx": proc_idx,
+            "protocol": dest.get("protocol", "srt"),
+            "mode": dest.get("mode", "listener"),
+            "host": dest.get("host", ""),
+            "port": dest.get("port", 0)
+        }
+    return {
+        "idx": proc_idx,
+        "protocol": channel.output_protocol or "srt",
+        "mode": channel.mode,
+        "host": channel.destination_host or "",
+        "port": channel.output_port
+    }
+
+
 @router.get("/{channel_name}/logs")
 async def get_channel_logs(
     channel_name: str,
@@ -418,29 +566,17 @@ async def get_channel_logs(
     current_user: User = Depends(get_current_active_user)
 ):
     """Get channel logs"""
-    sanitized_name = channel_name.replace(' ', '_')
-    channel = get_channel_by_name(channel_name)
+    channel = await run_io(get_channel_by_name, channel_name)
 
     if not channel:
         raise HTTPException(status_code=404, detail="Channel not found")
 
-    # Determine which log files to read
-    log_files = []
-
-    if channel.destinations and len(channel.destinations) > 1:
-        if process_idx is not None:
-            log_file = LOGS_FOLDER / f"{sanitized_name}_dest{process_idx}.log"
-            if log_file.exists():
-                log_files.append({"file": log_file, "process_idx": process_idx})
-        else:
-            for idx in range(len(channel.destinations)):
-                log_file = LOGS_FOLDER / f"{sanitized_name}_dest{idx}.log"
-                if log_file.exists():
-                    log_files.append({"file": log_file, "process_idx": idx})
-    else:
-        log_file = LOGS_FOLDER / f"{sanitized_name}.log"
-        if log_file.exists():
-            log_files.append({"file": log_file, "process_idx": 0})
+    return await run_io(_channel_logs, channel, lines, process_idx)
+
+
+def _channel_logs(channel: Channel, lines: int, process_idx: Optional[int]) -> dict:
+    """Last `lines` log entries of each of a channel's processes"""
+    log_files = get_channel_log_files(channel, process_idx)
 
     if not log_files:
         return {
@@ -458,37 +594,16 @@ async def get_channel_logs(
             log_file = log_info["file"]
             proc_idx = log_info["process_idx"]
 
-            with open(log_file, 'r') as f:
-                all_lines = f.readlines()
-                recent_lines = all_lines[-lines:] if len(all_lines) > lines else all_lines
-
-                for line in recent_lines:
-                    if line.strip():
-                        all_logs.append({
-                            "process_idx": proc_idx,
-                            "text": line.strip(),
-                            "timestamp": datetime.now().isoformat()
-                        })
-
-            # Add process info
-            dest = channel.destinations[proc_idx] if channel.destinations and proc_idx < len(channel.destinations) else None
-            if dest:
-                process_info.append({
-                    "idx": proc_idx,
-                    "protocol": dest.get("protocol", "srt"),
-                    "mode": dest.get("mode", "listener"),
-                    "host": dest.get("host", ""),
-                    "port": dest.get("port", 0)
-                })
-            else:
-                process_info.append({
-                    "idx": proc_idx,
-                    "protocol": channel.output_protocol or "srt",
-                    "mode": channel.mode,
-                    "host": channel.destination_host or "",
-                    "port": channel.output_port
+            for entry in get_log_index(log_file).tail(lines):
+                all_logs.append({
+                    "process_idx": proc_idx,
+                    "text": entry["text"],
+                    "timestamp": entry["timestamp"],
+                    "level": entry["level"]
                 })
 
+            process_info.append(_process_info(channel, proc_idx))
+
         return {
             "logs": all_logs,
             "processes": process_info,
@@ -502,6 +617,74 @@ async def get_channel_logs(
         )
 
 
+def _naive_local(value: Optional[datetime]) -> Optional[datetime]:
+    """Log timestamps are naive local time - normalize aware query datetimes"""
+    if value is not None and value.tzinfo is not None:
+        return value.astimezone().replace(tzinfo=None)
+    return value
+
+
+@router.get("/{channel_name}/logs/search")
+async def search_channel_logs(
+    channel_name: str,
+    from_time: Optional[datetime] = Query(default=None, alias="from"),
+    to_time: Optional[datetime] = Query(default=None, alias="to"),
+    level: Optional[str] = None,
+    q: Optional[str] = None,
+    limit: int = Query(default=500, ge=1, le=10000),
+    process_idx: Optional[int] = None,
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Search channel logs by time range, level (comma-separated: error, warning,
+    info, connection) and keyword. Only index blocks that can match are read.
+    """
+    channel = await run_io(get_channel_by_name, channel_name)
+    if not channel:
+        raise HTTPException(status_code=404, detail="Channel not found")
+
+    try:
+        level_mask = parse_levels(level)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return await run_io(
+        _search_logs, channel, _naive_local(from_time), _naive_local(to_time),
+        level_mask, q, limit, process_idx
+    )
+
+
+def _search_logs(channel: Channel, start: Optional[datetime], end: Optional[datetime],
+                 level_mask: int, q: Optional[str], limit: int, process_idx: Optional[int]) -> dict:
+    per_file = []
+    scanned_blocks = 0
+    all_files = get_channel_log_files(channel)
+    log_files = [info for info in all_files if process_idx is None or info["process_idx"] == process_idx]
+    for log_info in log_files:
+        matches, scanned = get_log_index(log_info["file"]).search(start, end, level_mask, q, limit)
+        scanned_blocks += scanned
+        # Each file's matches are oldest first; lines without a timestamp keep
+        # their place after the previous stamped line
+        keyed = []
+        last = ""
+        for entry in matches:
+            entry["process_idx"] = log_info["process_idx"]
+            last = entry["timestamp"] or last
+            keyed.append((last, entry))
+        per_file.append(keyed)
+
+    # Interleave the destination logs by time, then keep the most recent
+    all_logs = [entry for _, entry in heapq.merge(*per_file, key=itemgetter(0))][-limit:]
+
+    return {
+        "logs": all_logs,
+        "processes": [_process_info(channel, info["process_idx"]) for info in all_files],
+        "has_multiple_processes": len(all_files) > 1,
+        "total_logs": len(all_logs),
+        "scanned_blocks": scanned_blocks
+    }
+
+
 @router.post("/{channel_name}/upload-logo")
 async def upload_logo(
     channel_name: str,
@@ -517,21 +700,28 @@ async def upload_logo(
     unique_filename = f"{uuid.uuid4()}.{file_extension}"
     file_path = UPLOAD_FOLDER / unique_filename
 
+    content = await file.read()
+    if not await run_io(_save_logo, channel_name, file_path, content):
+        raise HTTPException(status_code=404, detail="Channel not found")
+    return {"filename": unique_filename, "path": str(file_path)}
+
+
+def _save_logo(channel_name: str, file_path: Path, content: bytes) -> bool:
+    """Write an uploaded logo and point the channel at it"""
     # Save file
     with open(file_path, 'wb') as f:
-        content = await file.read()
         f.write(content)
 
     # Update channel
-    channels = load_channels()
-    for i, channel in enumerate(channels):
-        if channel.channel_name == channel_name:
-            channel.logo = unique_filename
-            channels[i] = channel
-            save_channels(channels)
-            return {"filename": unique_filename, "path": str(file_path)}
-
-    raise HTTPException(status_code=404, detail="Channel not found")
+    with config_lock:
+        channels = load_channels()
+        for i, channel in enumerate(channels):
+            if channel.channel_name == channel_name:
+                channel.logo = file_path.name
+                channels[i] = channel
+                save_channels(channels)
+                return True
+    return False
 
 
 @router.get("/{channel_name}/stream-info")
@@ -541,7 +731,7 @@ async def get_channel_stream_info(
     current_user: User = Depends(get_current_active_user)
 ):
     """Get detailed stream information (codec, bitrate, resolution, tracks)"""
-    channel = get_channel_by_name(channel_name)
+    channel = await run_io(get_channel_by_name, channel_name)
     if not channel:
         raise HTTPException(status_code=404, detail="Channel not found")
 
@@ -559,15 +749,7 @@ async def get_channel_stream_info(
             return cached
 
     # Analyze stream directly if no cache or forced
-    import asyncio
-    loop = asyncio.get_event_loop()
-    stream_info = await loop.run_in_executor(
-        None,
-        analyze_stream_sync,
-        channel.model_dump()
-    )
-
-    return stream_info
+    return await probe_channel(channel.model_dump())
 
 
 @router.get("/stream-info/all")
@@ -578,13 +760,44 @@ async def get_all_stream_info(
     return get_all_cached_stream_info()
 
 
+@router.get("/stream-info/analyzer")
+async def get_stream_analyzer_stats(
+    current_user: User = Depends(get_current_active_user)
+):
+    """Get per-cycle timing of the background stream analyzer"""
+    return get_analyzer_stats()
+
+
+def _last_stats_row(channel_name: str, stats_file: str) -> Optional[dict]:
+    """Summary of the last row of a stats CSV"""
+    if not (stats_file and os.path.exists(stats_file) and os.path.getsize(stats_file) > 0):
+        return None
+    try:
+        rows = read_stats_rows(stats_file, 1)
+        if not rows:
+            return None
+        last_row = rows[-1]
+        return {
+            "time": last_row.get("Time", "N/A"),
+            "pktSent": int(last_row.get("pktSent", 0) or 0),
+            "pktRecv": int(last_row.get("pktRecv", 0) or 0),
+            "pktSentLoss": int(last_row.get("pktSentLoss", 0) or 0),
+            "pktRcvLoss": int(last_row.get("pktRcvLoss", 0) or 0),
+            "mbpsBandwidth": float(last_row.get("mbpsBandwidth", 0) or 0),
+            "msRTT": float(last_row.get("msRTT", 0) or 0),
+        }
+    except Exception as e:
+        print(f"Error reading stats for {channel_name}: {e}")
+        return None
+
+
 @router.get("/{channel_name}/srt-status")
 async def get_srt_status(
     channel_name: str,
     current_user: User = Depends(get_current_active_user)
 ):
     """Get SRT connection status (connected clients, statistics)"""
-    channel = get_channel_by_name(channel_name)
+    channel = await run_io(get_channel_by_name, channel_name)
     if not channel:
         raise HTTPException(status_code=404, detail="Channel not found")
 
@@ -601,27 +814,8 @@ async def get_srt_status(
         sanitized_name = channel_name.replace(' ', '_').replace('/', '_').replace('\\', '_')
         stats_file = str(STATS_FOLDER / f"{sanitized_name}.csv")
 
-    connected = False
-    last_stats = None
-
-    if stats_file and os.path.exists(stats_file) and os.path.getsize(stats_file) > 0:
-        try:
-            df = pd.read_csv(stats_file)
-            if not df.empty:
-                last_row = df.iloc[-1]
-                connected = True  # If we have stats, someone is connected
-
-                last_stats = {
-                    "time": last_row.get("Time", "N/A"),
-                    "pktSent": int(last_row.get("pktSent", 0) or 0),
-                    "pktRecv": int(last_row.get("pktRecv", 0) or 0),
-                    "pktSentLoss": int(last_row.get("pktSentLoss", 0) or 0),
-                    "pktRcvLoss": int(last_row.get("pktRcvLoss", 0) or 0),
-                    "mbpsBandwidth": float(last_row.get("mbpsBandwidth", 0) or 0),
-                    "msRTT": float(last_row.get("msRTT", 0) or 0),
-                }
-        except Exception as e:
-            print(f"Error reading stats for {channel_name}: {e}")
+    last_stats = await run_io(_last_stats_row, channel_name, stats_file)
+    connected = last_stats is not None  # If we have stats, someone is connected
 
     # Get stream info from cache
     stream_info = get_cached_stream_info(channel_name)
@@ -637,6 +831,64 @@ async def get_srt_status(
     }
 
 
+@router.get("/{channel_name}/clients")
+async def get_channel_clients(
+    channel_name: str,
+    history: int = 50,
+    ip: Optional[str] = None,
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Get connected clients and recent client sessions of a channel.
+    Sessions come from the incremental connection-event index of the SRT logs;
+    active clients carry their per-socket SRT statistics (RTT, loss, rates).
+    """
+    channel = await run_io(get_channel_by_name, channel_name)
+    if not channel:
+        raise HTTPException(status_code=404, detail="Channel not found")
+
+    return await run_io(_channel_clients, channel, history, ip)
+
+
+def _channel_clients(channel: Channel, history: int, ip: Optional[str]) -> dict:
+    """Active clients with their SRT stats, and recent sessions, from the channel's logs"""
+    active_clients = []
+    sessions = []
+    total_sessions = 0
+    unmatched_streams = []
+    stats_files = {s["process_idx"]: s["file"] for s in get_channel_stats_files(channel)}
+
+    for log_info in get_channel_log_files(channel):
+        index = get_connection_index(log_info["file"])
+        clients = index.active_clients()
+        for client in clients:
+            client["process_idx"] = log_info["process_idx"]
+            client["stats"] = None
+        stats_file = stats_files.get(log_info["process_idx"])
+        if stats_file:
+            series = get_stats_ingester(stats_file).clients()
+            for stream in correlate_clients(clients, series):
+                stream["process_idx"] = log_info["process_idx"]
+                unmatched_streams.append(stream)
+        active_clients.extend(clients)
+        for session in index.history(limit=history, ip=ip):
+            session["process_idx"] = log_info["process_idx"]
+            sessions.append(session)
+        total_sessions += index.total_sessions
+
+    sessions.sort(key=lambda s: s.get("disconnected_at") or "", reverse=True)
+
+    return {
+        "channel_name": channel.channel_name,
+        "status": channel.status,
+        "active_clients": active_clients,
+        "history": sessions[:history],
+        "total_sessions": total_sessions,
+        "unmatched_streams": unmatched_streams,
+        "timestamp": datetime.now().isoformat()
+    }
+
+
 @router.get("/{channel_name}/full-info")
 async def get_channel_full_info(
     channel_name: str,
@@ -646,10 +898,11 @@ async def get_channel_full_info(
     Get comprehensive channel information:
     - SRT statistics (bitrate, RTT, packet loss, retransmits)
     - Media info (resolution, codec, fps, audio tracks)
+    - Transport stream health (CC errors, PAT/PMT/PCR timing) when the channel has a tap
     - Connection info (remote clients, connection state)
     - Process info (PIDs, uptime)
     """
-    channel = get_channel_by_name(channel_name)
+    channel = await run_io(get_channel_by_name, channel_name)
     if not channel:
         raise HTTPException(status_code=404, detail="Channel not found")
 
@@ -679,6 +932,7 @@ async def get_channel_full_info(
 
         # Stats
         "srt_stats": None,
+        "ts_health": None,
         "media_info": None,
         "connections": [],
     }
@@ -692,10 +946,11 @@ async def get_channel_full_info(
         sanitized_name = channel_name.replace(' ', '_').replace('/', '_').replace('\\', '_')
         stats_file = str(STATS_FOLDER / f"{sanitized_name}.csv")
 
-    if stats_file and os.path.exists(stats_file):
-        stats = parse_srt_stats_csv(Path(stats_file))
+    if stats_file and await run_io(os.path.exists, stats_file):
+        stats = await run_io(parse_srt_stats_csv, Path(stats_file))
         if stats:
             result["srt_stats"] = stats
+    result["ts_health"] = get_ts_health(channel_name)
 
     # Get media info
     stream_info = get_cached_stream_info(channel_name)
@@ -708,9 +963,7 @@ async def get_channel_full_info(
         }
 
     # Get active connections
-    all_connections = get_srt_connections()
-    pids = channel.pids or ([channel.pid] if channel.pid else [])
-    result["connections"] = [c for c in all_connections if c.get("pid") in pids]
+    result["connections"] = await run_io(get_sockets_for_pids, channel.pids or [channel.pid])
 
     return result
 
@@ -727,119 +980,4 @@ async def get_analytics_summary(
     - Average RTT
     - Per-channel quick stats
     """
-    channels = load_channels()
-
-    summary = {
-        "total_channels": len(channels),
-        "running": 0,
-        "stopped": 0,
-        "total_bandwidth_mbps": 0.0,
-        "total_send_rate_mbps": 0.0,
-        "total_recv_rate_mbps": 0.0,
-        "total_packet_loss": 0,
-        "avg_rtt_ms": 0.0,
-        "channels": []
-    }
-
-    rtt_values = []
-
-    for channel in channels:
-        check_channel_status(channel)
-
-        ch_info = {
-            "name": channel.channel_name,
-            "status": channel.status,
-            "pid": channel.pid,
-            "pids": channel.pids,
-            "start_date": channel.start_date,
-            "srt_stats": None,
-            "media_info": None,
-            "connections": [],
-        }
-
-        if channel.status == "running":
-            summary["running"] += 1
-
-            # Get SRT stats
-            stats_file = channel.stats_file
-            if not stats_file:
-                sanitized_name = channel.channel_name.replace(' ', '_').replace('/', '_').replace('\\', '_')
-                stats_file = str(STATS_FOLDER / f"{sanitized_name}.csv")
-
-            if stats_file and os.path.exists(stats_file):
-                stats = parse_srt_stats_csv(Path(stats_file))
-                if stats:
-                    ch_info["srt_stats"] = {
-                        "bandwidth_mbps": stats.get("bandwidth_mbps", 0),
-                        "send_rate_mbps": stats.get("send_rate_mbps", 0),
-                        "recv_rate_mbps": stats.get("recv_rate_mbps", 0),
-                        "rtt_ms": stats.get("rtt_ms", 0),
-                        "packets_lost": stats.get("packets_lost_recv", 0) + stats.get("packets_lost_send", 0),
-                    }
-
-                    summary["total_bandwidth_mbps"] += stats.get("bandwidth_mbps", 0)
-                    summary["total_send_rate_mbps"] += stats.get("send_rate_mbps", 0)
-                    summary["total_recv_rate_mbps"] += stats.get("recv_rate_mbps", 0)
-                    summary["total_packet_loss"] += stats.get("packets_lost_recv", 0) + stats.get("packets_lost_send", 0)
-
-                    if stats.get("rtt_ms", 0) > 0:
-                        rtt_values.append(stats["rtt_ms"])
-
-            # Get media info
-            stream_info = get_cached_stream_info(channel.channel_name)
-            if stream_info and stream_info.get("success"):
-                ch_info["media_info"] = {
-                    "resolution": stream_info.get("video_streams", [{}])[0].get("resolution") if stream_info.get("video_streams") else None,
-                    "bitrate_mbps": stream_info.get("total_bitrate_mbps"),
-                }
-
-            # Get connections from SRT log file (more reliable than ss for SRT)
-            sanitized_name = channel.channel_name.replace(' ', '_').replace('/', '_').replace('\\', '_')
-            log_file = LOGS_FOLDER / f"{sanitized_name}.log"
-
-            if log_file.exists():
-                try:
-                    import re
-                    with open(log_file, 'r') as f:
-                        log_content = f.read()
-
-                    # Find the last "Accepted SRT target connection" and track active connections
-                    # Pattern: "request from: IP:PORT"
-                    connection_pattern = r'request from: (\d+\.\d+\.\d+\.\d+):(\d+)'
-                    disconnect_pattern = r'SRT target disconnected'
-
-                    lines = log_content.split('\n')
-                    active_clients = {}
-
-                    for line in lines:
-                        # Check for new connection
-                        match = re.search(connection_pattern, line)
-                        if match:
-                            ip = match.group(1)
-                            port = match.group(2)
-                            active_clients[ip] = {"ip": ip, "port": int(port)}
-
-                        # Check for disconnection (clears all - simplified logic)
-                        if disconnect_pattern in line:
-                            active_clients = {}
-
-                    # Add active clients to connections
-                    for client_ip, client_info in active_clients.items():
-                        ch_info["connections"].append({
-                            "remote_ip": client_info["ip"],
-                            "remote_port": client_info["port"],
-                            "local_port": channel.output_port,
-                            "direction": "output",
-                            "state": "ESTAB"
-                        })
-                except Exception as e:
-                    print(f"Error parsing SRT log for connections: {e}")
-        else:
-            summary["stopped"] += 1
-
-        summary["channels"].append(ch_info)
-
-    if rtt_values:
-        summary["avg_rtt_ms"] = round(sum(rtt_values) / len(rtt_values), 2)
-
-    return summary
+    return await run_io(build_fleet_summary)
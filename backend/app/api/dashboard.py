@@ -0,0 +1,132 @@
+"""Dashboard API router - everything the dashboard shows in one round trip"""
+
+import hashlib
+import json
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+
+from ..models.channel import Channel
+from ..models.user import User
+from ..core.deps import get_current_active_user
+from ..core.executors import run_io
+from ..services.channel_journal import channel_journal
+from ..services.channel_service import get_channel_log_files, query_channels
+from ..services.connection_index import get_connection_index
+from ..services.stats_ingest import get_stats_ingester
+from ..services.stream_analyzer import get_all_cached_stream_info, _persistent_view
+from ..services.system_stats import collect_server_stats
+from ..services.telemetry import build_fleet_summary, channel_stats_path, read_channel_stats
+
+router = APIRouter(prefix="/api", tags=["Dashboard"])
+
+# Sections of the dashboard response, selectable with ?fields=
+DASHBOARD_FIELDS = ("channels", "summary", "stats", "media", "server")
+
+
+def parse_fields(fields: Optional[str]) -> set:
+    """Requested dashboard sections (all when not given)"""
+    if not fields:
+        return set(DASHBOARD_FIELDS)
+    requested = {f.strip() for f in fields.split(",") if f.strip()}
+    unknown = requested - set(DASHBOARD_FIELDS)
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(sorted(unknown))} (allowed: {', '.join(DASHBOARD_FIELDS)})"
+        )
+    return requested
+
+
+def dashboard_channels() -> List[Channel]:
+    """Channels from the catalog, statuses checked against the process table"""
+    channels, _, _ = query_channels()
+    return [Channel.model_construct(**ch) for ch in channels]
+
+
+def build_dashboard(fields: set, channels: List[Channel]) -> dict:
+    """Assemble the requested sections from the channel catalog and one stats pass"""
+
+    channel_stats = None
+    if fields & {"stats", "summary"}:
+        channel_stats = {ch.channel_name: read_channel_stats(ch) for ch in channels}
+
+    dashboard = {}
+    if "channels" in fields:
+        dashboard["channels"] = [ch.model_dump() for ch in channels]
+    if "summary" in fields:
+        dashboard["summary"] = build_fleet_summary(channels, channel_stats)
+    if "stats" in fields:
+        dashboard["stats"] = {name: stats for name, stats in channel_stats.items() if stats}
+    if "media" in fields:
+        names = {ch.channel_name for ch in channels}
+        dashboard["media"] = {name: info for name, info in get_all_cached_stream_info().items() if name in names}
+    if "server" in fields:
+        dashboard["server"] = collect_server_stats().model_dump()
+    return dashboard
+
+
+def compute_etag(fields: set, channels: List[Channel]) -> str:
+    """
+    ETag from the state the sections are built from, not from the body: the
+    channel journal version, the row counters of the stats files, the client
+    session counters and the media entries without their volatile fields.
+    Measured rates are only re-read when one of those moved.
+    """
+    running = [ch for ch in channels if ch.status == "running"]
+    state = {"fields": sorted(fields), "epoch": channel_journal.epoch, "version": channel_journal.version}
+    if fields & {"stats", "summary"}:
+        state["stats"] = {ch.channel_name: get_stats_ingester(channel_stats_path(ch)).version() for ch in running}
+    if "summary" in fields:
+        state["clients"] = {ch.channel_name: [get_connection_index(log["file"]).version()
+                                              for log in get_channel_log_files(ch)] for ch in running}
+    if fields & {"media", "summary"}:
+        names = {ch.channel_name for ch in channels}
+        state["media"] = {name: _persistent_view(info) for name, info in get_all_cached_stream_info().items()
+                          if name in names}
+    digest = hashlib.blake2b(json.dumps(state, sort_keys=True, default=str).encode(), digest_size=12)
+    return 'W/"' + digest.hexdigest() + '"'
+
+
+def _render_dashboard(fields: set, if_none_match: Optional[str]) -> tuple:
+    """(ETag, body) - no body when the client's copy is current, no ETag when `server` is requested"""
+    channels = dashboard_channels()
+    etag = None
+    if "server" not in fields:
+        etag = compute_etag(fields, channels)
+        if etag_matches(if_none_match, etag):
+            return etag, None
+    body = json.dumps(build_dashboard(fields, channels), separators=(",", ":"), default=str).encode()
+    return etag, body
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {tag.strip() for tag in if_none_match.split(",")}
+    # Weak comparison - W/"x" and "x" match
+    return "*" in candidates or etag in candidates or etag[2:] in candidates
+
+
+@router.get("/dashboard")
+async def get_dashboard(
+    request: Request,
+    fields: Optional[str] = None,
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Get channels, fleet summary, per-channel latest SRT stats, cached media
+    info and server stats in one response.
+
+    `fields` selects sections (comma separated: channels, summary, stats,
+    media, server). The response carries an ETag; a request with a matching
+    If-None-Match gets 304 Not Modified without a body. Server stats change
+    on every call, so responses that include `server` carry no ETag.
+    """
+    etag, body = await run_io(_render_dashboard, parse_fields(fields), request.headers.get("if-none-match"))
+    headers = {"Cache-Control": "no-cache"}
+    if etag:
+        headers["ETag"] = etag
+    if body is None:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
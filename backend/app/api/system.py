@@ -1,24 +1,26 @@
 """System API router - network interfaces, system info"""
 
+import asyncio
 from typing import List
-import time
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import PlainTextResponse
 
 from ..models.user import User
 from ..models.system import NetworkInterface, SystemInfo, ServerStats
-from ..core.deps import get_current_active_user
+from ..core.deps import get_current_active_user, require_admin
+from ..core.executors import run_io, run_process
+from ..core.perf import perf_snapshot, prometheus_metrics
+from ..core.profiler import (
+    PROFILE_INTERVAL_MS, PROFILE_MAX_SECONDS, ProfilerBusy,
+    sample_cpu, sample_memory, collapsed, top_functions, describe_objects
+)
 from ..services.network_service import get_network_interfaces, get_local_ip
 from ..services.channel_service import load_channels
+from ..services.srt_command_builder import SRT_LIVE_TRANSMIT, SRT_SIMULATE
+from ..services import srt_stats_service, stream_analyzer, system_stats
+from ..services.system_stats import collect_server_stats
 
-import os
-import psutil
-
-# Store previous network stats for rate calculation
-_prev_net_stats = {
-    'bytes_sent': 0,
-    'bytes_recv': 0,
-    'timestamp': time.time()
-}
+import shutil
 
 router = APIRouter(prefix="/api", tags=["System"])
 
@@ -26,14 +28,14 @@ router = APIRouter(prefix="/api", tags=["System"])
 @router.get("/system/info", response_model=SystemInfo)
 async def get_system_info(current_user: User = Depends(get_current_active_user)):
     """Get system information"""
-    channels = load_channels()
+    channels = await run_io(load_channels)
     running_count = sum(1 for ch in channels if ch.status == "running")
 
     return SystemInfo(
         total_channels=len(channels),
         running_channels=running_count,
         stopped_channels=len(channels) - running_count,
-        srt_transmit_available=os.system("which srt-live-transmit > /dev/null 2>&1") == 0
+        srt_transmit_available=SRT_SIMULATE or await run_io(shutil.which, SRT_LIVE_TRANSMIT) is not None
     )
 
 
@@ -43,13 +45,13 @@ async def get_interfaces(current_user: User = Depends(get_current_active_user)):
     Get available network interfaces.
     Uses ifconfig command, falls back to ip addr if ifconfig is not available.
     """
-    return get_network_interfaces()
+    return await run_process(get_network_interfaces)
 
 
 @router.get("/network/local-ip")
 async def get_local_ip_endpoint():
     """Get local IP address for auto-detection - NO AUTHENTICATION REQUIRED"""
-    ip = get_local_ip()
+    ip = await run_io(get_local_ip)
     if ip:
         return {"ip": ip}
     return {"ip": None, "error": "Could not determine local IP"}
@@ -58,47 +60,70 @@ async def get_local_ip_endpoint():
 @router.get("/system/stats", response_model=ServerStats)
 async def get_server_stats(current_user: User = Depends(get_current_active_user)):
     """Get server resource usage - CPU, RAM, Network traffic"""
-    global _prev_net_stats
-
-    # CPU usage (non-blocking, uses cached value)
-    cpu_percent = psutil.cpu_percent(interval=None)
-
-    # Memory usage
-    memory = psutil.virtual_memory()
-    memory_percent = memory.percent
-    memory_used_gb = memory.used / (1024 ** 3)
-    memory_total_gb = memory.total / (1024 ** 3)
-
-    # Network usage
-    net_io = psutil.net_io_counters()
-    current_time = time.time()
-
-    # Calculate rates
-    time_delta = current_time - _prev_net_stats['timestamp']
-    if time_delta > 0:
-        bytes_sent_delta = net_io.bytes_sent - _prev_net_stats['bytes_sent']
-        bytes_recv_delta = net_io.bytes_recv - _prev_net_stats['bytes_recv']
-        # Convert to Mbps (megabits per second)
-        rate_sent_mbps = (bytes_sent_delta * 8) / (time_delta * 1_000_000)
-        rate_recv_mbps = (bytes_recv_delta * 8) / (time_delta * 1_000_000)
-    else:
-        rate_sent_mbps = 0.0
-        rate_recv_mbps = 0.0
-
-    # Update previous stats
-    _prev_net_stats = {
-        'bytes_sent': net_io.bytes_sent,
-        'bytes_recv': net_io.bytes_recv,
-        'timestamp': current_time
-    }
+    return await run_io(collect_server_stats)
 
-    return ServerStats(
-        cpu_percent=round(cpu_percent, 1),
-        memory_percent=round(memory_percent, 1),
-        memory_used_gb=round(memory_used_gb, 2),
-        memory_total_gb=round(memory_total_gb, 2),
-        network_bytes_sent=net_io.bytes_sent,
-        network_bytes_recv=net_io.bytes_recv,
-        network_rate_sent_mbps=round(rate_sent_mbps, 2),
-        network_rate_recv_mbps=round(rate_recv_mbps, 2)
-    )
+
+@router.get("/system/perf")
+async def get_perf(current_user: User = Depends(get_current_active_user)):
+    """
+    Get API performance data: per-route latency (p50/p95/p99), event loop lag,
+    executor queue depths and config/stats I/O counters
+    """
+    return perf_snapshot()
+
+
+@router.get("/system/metrics", response_class=PlainTextResponse)
+async def get_metrics(current_user: User = Depends(get_current_active_user)):
+    """Performance metrics in the Prometheus text format"""
+    return PlainTextResponse(prometheus_metrics(), media_type="text/plain; version=0.0.4")
+
+
+def _cache_sizes() -> dict:
+    """Sizes of the long-lived in-memory caches"""
+    return describe_objects({
+        "stream_info_cache": stream_analyzer.get_all_cached_stream_info(),
+        "srt_stats_cache": dict(srt_stats_service._srt_stats_cache),
+        "prev_net_stats": dict(system_stats._prev_net_stats),
+    })
+
+
+@router.post("/system/profile")
+async def run_profile(
+    seconds: float = Query(default=10, gt=0, le=PROFILE_MAX_SECONDS),
+    mode: str = Query(default="cpu", pattern="^(cpu|memory)$"),
+    format: str = Query(default="collapsed", pattern="^(collapsed|json)$"),
+    interval_ms: float = Query(default=PROFILE_INTERVAL_MS, ge=1, le=1000),
+    include_idle: bool = False,
+    limit: int = Query(default=25, ge=1, le=500),
+    current_user: User = Depends(require_admin)
+):
+    """
+    Profile the running backend for `seconds` (admin only).
+
+    mode=cpu samples every thread's stack and returns collapsed stacks
+    (flamegraph.pl / speedscope input) or, with format=json, the stacks and
+    the hottest functions. mode=memory compares tracemalloc snapshots taken
+    at the start and end and returns the allocation sites that grew, plus the
+    sizes of the stream info, SRT stats and network counter caches.
+    """
+    # The sampler sleeps for the whole window - keep it off the bounded pools
+    try:
+        if mode == "memory":
+            result = await asyncio.to_thread(sample_memory, seconds, limit)
+            result["caches"] = await run_io(_cache_sizes)
+            return result
+        profile = await asyncio.to_thread(sample_cpu, seconds, interval_ms, include_idle)
+    except ProfilerBusy as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+    if format == "collapsed":
+        return PlainTextResponse(collapsed(profile), headers={
+            "X-Profile-Samples": str(profile["samples"]),
+            "X-Profile-Duration": str(profile["duration_s"]),
+        })
+    stacks = sorted(profile.pop("stacks").items(), key=lambda item: item[1], reverse=True)
+    return {
+        **profile,
+        "top": top_functions({"stacks": dict(stacks)}, limit),
+        "stacks": [{"stack": stack, "count": count} for stack, count in stacks],
+    }
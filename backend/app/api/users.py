@@ -7,6 +7,7 @@ from pydantic import BaseModel
 
 from ..models.user import User, UserRole
 from ..core.deps import get_current_active_user
+from ..core.executors import run_io
 from ..database import list_users, delete_user as db_delete_user, update_user_password, update_user_role
 
 
@@ -20,7 +21,7 @@ router = APIRouter(prefix="/api/users", tags=["Users"])
 @router.get("", response_model=List[dict])
 async def get_users(current_user: User = Depends(get_current_active_user)):
     """Get list of all users"""
-    return list_users()
+    return await run_io(list_users)
 
 
 @router.delete("/{username}")
@@ -41,7 +42,7 @@ async def delete_user_endpoint(
             detail="Cannot delete admin user"
         )
 
-    success = db_delete_user(username)
+    success = await run_io(db_delete_user, username)
     if not success:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -64,7 +65,7 @@ async def change_password(
             detail="Can only change own password"
         )
 
-    success = update_user_password(username, new_password)
+    success = await run_io(update_user_password, username, new_password)
     if not success:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -93,7 +94,7 @@ async def change_role(
             detail="Cannot change admin user's role"
         )
 
-    success = update_user_role(username, role_data.role.value)
+    success = await run_io(update_user_role, username, role_data.role.value)
     if not success:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -5,6 +5,7 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import JWTError
 
 from .security import SECRET_KEY, ALGORITHM, decode_token
+from .executors import run_io
 from ..models.user import User, UserRole
 from ..database import get_user_by_username
 
@@ -34,7 +35,7 @@ async def get_current_user(
     except JWTError:
         raise credentials_exception
 
-    user_dict = get_user_by_username(username=username)
+    user_dict = await run_io(get_user_by_username, username=username)
     if user_dict is None:
         raise credentials_exception
 
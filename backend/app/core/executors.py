@@ -0,0 +1,207 @@
+"""
+Bounded executors for blocking work, and an event-loop block detector
+
+Request handlers and background tasks share one event loop, so a slow disk
+read or a process spawn made inline stalls every WebSocket and request.
+Blocking calls go through one of two pools instead:
+
+    io       - config.json, stats CSV, log and upload file access (IO_WORKERS)
+    process  - spawning/killing channel processes, which/ifconfig/ss/lsof
+               and other subprocess.run calls (PROCESS_WORKERS)
+
+Each pool has a fixed number of threads and admits at most EXECUTOR_QUEUE_LIMIT
+calls waiting for one; further callers wait on the loop for a slot, so a
+burst never builds an unbounded backlog of threads or work items.
+
+With LOOP_BLOCK_DEBUG set, a watchdog thread reports every stretch in which
+the loop did not get to run for more than LOOP_BLOCK_THRESHOLD_MS, together
+with the stack of the code holding it.
+"""
+
+import asyncio
+import functools
+import os
+import sys
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+IO_WORKERS = int(os.getenv("IO_WORKERS", "8"))
+PROCESS_WORKERS = int(os.getenv("PROCESS_WORKERS", "4"))
+# Calls allowed to wait for a worker before callers are held back
+EXECUTOR_QUEUE_LIMIT = int(os.getenv("EXECUTOR_QUEUE_LIMIT", "64"))
+
+LOOP_BLOCK_DEBUG = os.getenv("LOOP_BLOCK_DEBUG", "0").lower() in ("1", "true", "yes")
+LOOP_BLOCK_THRESHOLD_MS = float(os.getenv("LOOP_BLOCK_THRESHOLD_MS", "100"))
+
+
+class BoundedExecutor:
+    """A named thread pool with a cap on queued calls"""
+
+    def __init__(self, name: str, workers: int, queue_limit: int = EXECUTOR_QUEUE_LIMIT):
+        self.name = name
+        self.workers = workers
+        self.queue_limit = queue_limit
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"{name}-worker")
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._lock = threading.Lock()
+        self.active = 0
+        self.queued = 0
+        self.max_queued = 0
+        self.completed = 0
+        self.failed = 0
+        self.busy_s = 0.0
+
+    def _get_slots(self) -> asyncio.Semaphore:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.workers + self.queue_limit)
+        return self._slots
+
+    def _call(self, fn: Callable, args: tuple, kwargs: dict) -> Any:
+        with self._lock:
+            self.queued -= 1
+            self.active += 1
+        started = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        except BaseException:
+            with self._lock:
+                self.failed += 1
+            raise
+        finally:
+            with self._lock:
+                self.active -= 1
+                self.completed += 1
+                self.busy_s += time.perf_counter() - started
+
+    async def run(self, fn: Callable, *args, **kwargs) -> Any:
+        """Run `fn(*args, **kwargs)` on the pool and await its result"""
+        async with self._get_slots():
+            with self._lock:
+                self.queued += 1
+                self.max_queued = max(self.max_queued, self.queued)
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._pool, functools.partial(self._call, fn, args, kwargs))
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "queue_limit": self.queue_limit,
+                "active": self.active,
+                "queued": self.queued,
+                "max_queued": self.max_queued,
+                "completed": self.completed,
+                "failed": self.failed,
+                "busy_s": round(self.busy_s, 3),
+            }
+
+
+io_executor = BoundedExecutor("io", IO_WORKERS)
+process_executor = BoundedExecutor("process", PROCESS_WORKERS)
+
+
+async def run_io(fn: Callable, *args, **kwargs) -> Any:
+    """Run blocking file work off the event loop"""
+    return await io_executor.run(fn, *args, **kwargs)
+
+
+async def run_process(fn: Callable, *args, **kwargs) -> Any:
+    """Run blocking subprocess work off the event loop"""
+    return await process_executor.run(fn, *args, **kwargs)
+
+
+def executor_stats() -> dict:
+    return {"io": io_executor.stats(), "process": process_executor.stats()}
+
+
+def shutdown_executors():
+    io_executor.shutdown()
+    process_executor.shutdown()
+
+
+class LoopWatchdog:
+    """
+    Detects callbacks that keep the event loop busy.
+
+    A task on the loop stamps a heartbeat every `interval`; a watchdog thread
+    checks the stamp and, once it is older than the threshold, prints the
+    loop thread's current stack - the code that is blocking it. Each stall
+    is reported once when detected and once more with its total duration.
+    """
+
+    def __init__(self, threshold_ms: float = LOOP_BLOCK_THRESHOLD_MS):
+        self.threshold = threshold_ms / 1000
+        self.interval = max(self.threshold / 4, 0.005)
+        self.blocks = 0
+        self.longest_ms = 0.0
+        self._beat = time.monotonic()
+        self._loop_thread: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def start(self):
+        """Start watching the running loop (call from the loop)"""
+        if self._task is not None:
+            return
+        self._loop_thread = threading.get_ident()
+        self._beat = time.monotonic()
+        self._stop.clear()
+        self._task = asyncio.create_task(self._heartbeat())
+        self._thread = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._thread.start()
+        print(f"Event loop watchdog started (threshold: {self.threshold * 1000:.0f}ms)")
+
+    def stop(self):
+        self._stop.set()
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        self._thread = None
+
+    async def _heartbeat(self):
+        while True:
+            self._beat = time.monotonic()
+            await asyncio.sleep(self.interval)
+
+    def _watch(self):
+        reported = None
+        while not self._stop.wait(self.interval):
+            beat = self._beat
+            # The heartbeat itself sleeps `interval` between stamps
+            stalled = time.monotonic() - beat - self.interval
+            if stalled > self.threshold and reported != beat:
+                reported = beat
+                self.blocks += 1
+                frame = sys._current_frames().get(self._loop_thread)
+                stack = "".join(traceback.format_stack(frame)) if frame else "  (no stack)\n"
+                print(f"Event loop blocked for {stalled * 1000:.0f}ms so far, in:\n{stack}", end="")
+            elif reported is not None and reported != beat:
+                # The loop got to run again - report how long the stall lasted
+                total_ms = (beat - reported - self.interval) * 1000
+                self.longest_ms = max(self.longest_ms, total_ms)
+                print(f"Event loop unblocked after {total_ms:.0f}ms")
+                reported = None
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self._task is not None,
+            "threshold_ms": self.threshold * 1000,
+            "blocks": self.blocks,
+            "longest_ms": round(self.longest_ms, 1),
+        }
+
+
+loop_watchdog = LoopWatchdog()
+
+
+def start_loop_watchdog():
+    """Start the block detector when LOOP_BLOCK_DEBUG is set"""
+    if LOOP_BLOCK_DEBUG:
+        loop_watchdog.start()
@@ -0,0 +1,285 @@
+"""
+Built-in performance instrumentation
+
+Meant to stay on in production: a measurement is one bucket increment in a
+fixed-size histogram under a lock, with nothing allocated per request.
+
+- PerfMiddleware records a latency histogram per route (method + path
+  template, so /api/channels/{channel_name} is one series)
+- the lag sampler measures how late a periodic sleep on the event loop
+  wakes up - the time callbacks spent holding the loop
+- counters track config.json reads/writes and stats file bytes read
+- executor queue depths and loop-block counts come from app.core.executors
+
+perf_snapshot() backs /api/system/perf (p50/p95/p99 per route);
+prometheus_metrics() renders the same data for /api/system/metrics.
+"""
+
+import asyncio
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, List, Optional, Tuple
+
+from .executors import executor_stats, loop_watchdog
+
+PERF_ENABLED = os.getenv("PERF_ENABLED", "1").lower() in ("1", "true", "yes")
+# Event loop lag sampling period (seconds)
+PERF_LAG_INTERVAL = float(os.getenv("PERF_LAG_INTERVAL", "0.5"))
+
+# Histogram bucket upper bounds in milliseconds (+Inf is implied)
+BUCKETS_MS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+METRIC_PREFIX = "srt_manager"
+
+
+class Histogram:
+    """Fixed-bucket latency histogram with quantile estimates"""
+    __slots__ = ("counts", "count", "total_ms", "max_ms")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, value_ms: float):
+        self.counts[bisect_left(BUCKETS_MS, value_ms)] += 1
+        self.count += 1
+        self.total_ms += value_ms
+        if value_ms > self.max_ms:
+            self.max_ms = value_ms
+
+    def quantile(self, q: float) -> float:
+        """Estimate by linear interpolation inside the bucket holding the q-th value"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, bucket_count in enumerate(self.counts):
+            if not bucket_count or seen + bucket_count < rank:
+                seen += bucket_count
+                continue
+            lower = BUCKETS_MS[i - 1] if i > 0 else 0.0
+            upper = BUCKETS_MS[i] if i < len(BUCKETS_MS) else self.max_ms
+            estimate = lower + (upper - lower) * (rank - seen) / bucket_count
+            return round(min(estimate, self.max_ms), 2)
+        return round(self.max_ms, 2)
+
+    def summary(self) -> dict:
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total_ms / self.count, 2) if self.count else 0.0,
+            "p50_ms": self.quantile(0.50),
+            "p95_ms": self.quantile(0.95),
+            "p99_ms": self.quantile(0.99),
+            "max_ms": round(self.max_ms, 2),
+        }
+
+
+class PerfRegistry:
+    """Route histograms, loop lag and counters, safe to update from any thread"""
+
+    def __init__(self):
+        self.started_at = time.time()
+        self._lock = threading.Lock()
+        self.routes: Dict[Tuple[str, str], Histogram] = {}
+        self.errors: Dict[Tuple[str, str], int] = {}
+        self.loop_lag = Histogram()
+        self.last_lag_ms = 0.0
+        self.counters: Dict[str, int] = {
+            "config_reads": 0,
+            "config_writes": 0,
+            "stats_bytes_read": 0,
+        }
+
+    def record_request(self, method: str, route: str, status: int, seconds: float):
+        key = (method, route)
+        with self._lock:
+            histogram = self.routes.get(key)
+            if histogram is None:
+                histogram = self.routes[key] = Histogram()
+            histogram.observe(seconds * 1000)
+            if status >= 500:
+                self.errors[key] = self.errors.get(key, 0) + 1
+
+    def record_lag(self, lag_ms: float):
+        with self._lock:
+            self.loop_lag.observe(lag_ms)
+            self.last_lag_ms = lag_ms
+
+    def count(self, name: str, amount: int = 1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            routes = {
+                f"{method} {route}": {**h.summary(), "errors": self.errors.get((method, route), 0)}
+                for (method, route), h in sorted(self.routes.items(), key=lambda item: item[0][1])
+            }
+            loop_lag = {**self.loop_lag.summary(), "last_ms": round(self.last_lag_ms, 2),
+                        "interval_s": PERF_LAG_INTERVAL}
+            counters = dict(self.counters)
+        return {
+            "enabled": PERF_ENABLED,
+            "uptime_s": round(time.time() - self.started_at, 1),
+            "routes": routes,
+            "loop_lag": loop_lag,
+            "loop_blocks": loop_watchdog.stats(),
+            "executors": executor_stats(),
+            "counters": counters,
+        }
+
+    def histograms(self) -> Tuple[List[Tuple[Tuple[str, str], Histogram, int]], Histogram, Dict[str, int]]:
+        """Copies of the raw histograms for the Prometheus exposition"""
+        with self._lock:
+            routes = [(key, _copy(h), self.errors.get(key, 0)) for key, h in self.routes.items()]
+            return routes, _copy(self.loop_lag), dict(self.counters)
+
+
+def _copy(histogram: Histogram) -> Histogram:
+    clone = Histogram()
+    clone.counts = list(histogram.counts)
+    clone.count = histogram.count
+    clone.total_ms = histogram.total_ms
+    clone.max_ms = histogram.max_ms
+    return clone
+
+
+perf = PerfRegistry()
+
+
+def count(name: str, amount: int = 1):
+    """Add to a perf counter (config_reads, config_writes, stats_bytes_read)"""
+    if PERF_ENABLED:
+        perf.count(name, amount)
+
+
+class PerfMiddleware:
+    """ASGI middleware timing every HTTP request by route template"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # The router stores the matched route in the scope
+            route = scope.get("route")
+            path = getattr(route, "path", None) or "unmatched"
+            perf.record_request(scope["method"], path, status, time.perf_counter() - started)
+
+
+_lag_task: Optional[asyncio.Task] = None
+
+
+async def _sample_loop_lag():
+    while True:
+        expected = time.perf_counter() + PERF_LAG_INTERVAL
+        await asyncio.sleep(PERF_LAG_INTERVAL)
+        perf.record_lag(max(time.perf_counter() - expected, 0.0) * 1000)
+
+
+def start_lag_sampler():
+    """Start sampling event loop lag (call from the loop)"""
+    global _lag_task
+    if PERF_ENABLED and _lag_task is None:
+        _lag_task = asyncio.create_task(_sample_loop_lag())
+
+
+def stop_lag_sampler():
+    global _lag_task
+    if _lag_task:
+        _lag_task.cancel()
+        _lag_task = None
+
+
+def perf_snapshot() -> dict:
+    return perf.snapshot()
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _histogram_lines(name: str, labels: str, histogram: Histogram) -> List[str]:
+    lines = []
+    cumulative = 0
+    for bound, bucket_count in zip(BUCKETS_MS, histogram.counts):
+        cumulative += bucket_count
+        lines.append(f'{name}_bucket{{{labels}{"," if labels else ""}le="{bound / 1000:g}"}} {cumulative}')
+    lines.append(f'{name}_bucket{{{labels}{"," if labels else ""}le="+Inf"}} {histogram.count}')
+    suffix = f"{{{labels}}}" if labels else ""
+    lines.append(f"{name}_sum{suffix} {histogram.total_ms / 1000:.6f}")
+    lines.append(f"{name}_count{suffix} {histogram.count}")
+    return lines
+
+
+def prometheus_metrics() -> str:
+    """Perf data in the Prometheus text exposition format"""
+    routes, loop_lag, counters = perf.histograms()
+    p = METRIC_PREFIX
+    lines = [
+        f"# HELP {p}_http_request_duration_seconds HTTP request latency by route",
+        f"# TYPE {p}_http_request_duration_seconds histogram",
+    ]
+    for (method, route), histogram, _ in sorted(routes, key=lambda item: item[0][1]):
+        labels = f'method="{_label(method)}",route="{_label(route)}"'
+        lines += _histogram_lines(f"{p}_http_request_duration_seconds", labels, histogram)
+
+    lines += [
+        f"# HELP {p}_http_request_errors_total HTTP responses with a 5xx status by route",
+        f"# TYPE {p}_http_request_errors_total counter",
+    ]
+    for (method, route), _, errors in routes:
+        lines.append(f'{p}_http_request_errors_total{{method="{_label(method)}",route="{_label(route)}"}} {errors}')
+
+    lines += [
+        f"# HELP {p}_event_loop_lag_seconds Delay of periodic event loop wakeups",
+        f"# TYPE {p}_event_loop_lag_seconds histogram",
+    ]
+    lines += _histogram_lines(f"{p}_event_loop_lag_seconds", "", loop_lag)
+
+    blocks = loop_watchdog.stats()
+    lines += [
+        f"# HELP {p}_event_loop_blocks_total Loop stalls reported by the block detector (LOOP_BLOCK_DEBUG)",
+        f"# TYPE {p}_event_loop_blocks_total counter",
+        f"{p}_event_loop_blocks_total {blocks['blocks']}",
+    ]
+
+    executors = executor_stats()
+    for field, kind, help_text in (
+        ("queued", "gauge", "Calls waiting for an executor worker"),
+        ("active", "gauge", "Executor workers running a call"),
+        ("completed", "counter", "Calls finished by an executor"),
+    ):
+        name = f"{p}_executor_{field}" + ("_total" if kind == "counter" else "")
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+        for executor, stats in executors.items():
+            lines.append(f'{name}{{executor="{executor}"}} {stats[field]}')
+
+    for counter, help_text in (
+        ("config_reads", "config.json reads"),
+        ("config_writes", "config.json writes"),
+        ("stats_bytes_read", "Bytes read from SRT stats files"),
+    ):
+        name = f"{p}_{counter}_total"
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter", f"{name} {counters.get(counter, 0)}"]
+
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,207 @@
+"""
+On-demand in-process profiling (stdlib only)
+
+CPU: a sampler thread reads every thread's current Python stack
+(sys._current_frames) every PROFILE_INTERVAL_MS for the requested duration
+and counts identical stacks. The result is in the collapsed-stack format
+("root;caller;leaf count" per line) read by flamegraph.pl, speedscope and
+inferno. Sampling from a thread rather than a signal handler also covers
+the executor worker threads, and needs no cooperation from the code being
+profiled. Threads parked in a wait (idle pool workers, the selector) are
+left out unless asked for.
+
+Memory: tracemalloc snapshots taken before and after the window are
+compared, giving the allocation sites whose retained size grew the most.
+Tracing is started for the window (and stopped afterwards) unless it was
+already running - start the backend with PYTHONTRACEMALLOC=<frames> to
+also see what was retained before the request.
+
+Only one profile runs at a time.
+"""
+
+import json
+import os
+import sys
+import sysconfig
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from typing import Dict, Optional
+
+# Sampling period of the CPU profiler (milliseconds)
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "5"))
+# Longest profile a request can ask for (seconds)
+PROFILE_MAX_SECONDS = float(os.getenv("PROFILE_MAX_SECONDS", "60"))
+# Frames kept per allocation when tracing is started for a memory profile
+TRACEMALLOC_FRAMES = 10
+
+# Leaf functions of a thread that is waiting rather than running
+IDLE_FUNCTIONS = frozenset({
+    "wait", "select", "poll", "_wait_for_tstate_lock", "_worker",
+    "accept", "recv", "recv_into", "recvfrom", "readinto",
+})
+
+
+class ProfilerBusy(Exception):
+    """Raised when a profile is requested while another one is running"""
+
+
+_profile_lock = threading.Lock()
+_STDLIB = sysconfig.get_paths()["stdlib"] + os.sep
+# The backend directory (parent of the app package)
+_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))) + os.sep
+
+
+def _short_path(filename: str) -> str:
+    idx = filename.rfind("site-packages" + os.sep)
+    if idx >= 0:
+        return filename[idx + len("site-packages") + 1:]
+    for prefix in (_STDLIB, _ROOT):
+        if filename.startswith(prefix):
+            return filename[len(prefix):]
+    return filename
+
+
+def _frame_label(code, cache: Dict) -> str:
+    label = cache.get(code)
+    if label is None:
+        # Aggregate per function, not per line, so stacks collapse well
+        label = cache[code] = f"{code.co_name} ({_short_path(code.co_filename)}:{code.co_firstlineno})"
+    return label
+
+
+def sample_cpu(seconds: float, interval_ms: float = PROFILE_INTERVAL_MS,
+               include_idle: bool = False) -> dict:
+    """Sample all thread stacks for `seconds`; blocks the calling thread"""
+    if not _profile_lock.acquire(blocking=False):
+        raise ProfilerBusy("A profile is already running")
+    try:
+        me = threading.get_ident()
+        interval = interval_ms / 1000
+        stacks: Counter = Counter()
+        labels: Dict = {}
+        samples = 0
+        idle = 0
+        started = time.perf_counter()
+        deadline = started + seconds
+
+        while True:
+            now = time.perf_counter()
+            if now >= deadline:
+                break
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == me:
+                    continue
+                if not include_idle and frame.f_code.co_name in IDLE_FUNCTIONS:
+                    idle += 1
+                    continue
+                path = []
+                while frame is not None:
+                    path.append(_frame_label(frame.f_code, labels))
+                    frame = frame.f_back
+                path.append(names.get(ident, f"thread-{ident}"))
+                stacks[";".join(reversed(path))] += 1
+            samples += 1
+            time.sleep(max(interval - (time.perf_counter() - now), 0))
+
+        return {
+            "duration_s": round(time.perf_counter() - started, 3),
+            "interval_ms": interval_ms,
+            "samples": samples,
+            "stacks": dict(stacks),
+            "idle_skipped": idle,
+        }
+    finally:
+        _profile_lock.release()
+
+
+def collapsed(profile: dict) -> str:
+    """Render a CPU profile as collapsed stacks, heaviest first"""
+    stacks = sorted(profile["stacks"].items(), key=lambda item: item[1], reverse=True)
+    return "".join(f"{stack} {count}\n" for stack, count in stacks)
+
+
+def top_functions(profile: dict, limit: int = 25) -> list:
+    """Functions by self samples (leaf of the stack) and total samples"""
+    own: Counter = Counter()
+    total: Counter = Counter()
+    for stack, count in profile["stacks"].items():
+        frames = stack.split(";")[1:]
+        if not frames:
+            continue
+        own[frames[-1]] += count
+        for frame in set(frames):
+            total[frame] += count
+    return [
+        {"function": name, "self": count, "total": total[name]}
+        for name, count in own.most_common(limit)
+    ]
+
+
+def _snapshot() -> tracemalloc.Snapshot:
+    return tracemalloc.take_snapshot().filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, __file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        tracemalloc.Filter(False, "<unknown>"),
+    ))
+
+
+def _stat(stat) -> dict:
+    frame = stat.traceback[0]
+    entry = {
+        "location": f"{_short_path(frame.filename)}:{frame.lineno}",
+        "size_kb": round(stat.size / 1024, 1),
+        "count": stat.count,
+    }
+    if hasattr(stat, "size_diff"):
+        entry["size_diff_kb"] = round(stat.size_diff / 1024, 1)
+        entry["count_diff"] = stat.count_diff
+    return entry
+
+
+def sample_memory(seconds: float, limit: int = 25, key_type: str = "lineno") -> dict:
+    """Compare tracemalloc snapshots taken `seconds` apart; blocks the calling thread"""
+    if not _profile_lock.acquire(blocking=False):
+        raise ProfilerBusy("A profile is already running")
+    started_tracing = False
+    try:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+            started_tracing = True
+        before = _snapshot()
+        time.sleep(seconds)
+        after = _snapshot()
+
+        growth = [s for s in after.compare_to(before, key_type) if s.size_diff > 0][:limit]
+        current, peak = tracemalloc.get_traced_memory()
+        return {
+            "duration_s": seconds,
+            "traced_since_request": started_tracing,
+            "traced_kb": round(current / 1024, 1),
+            "traced_peak_kb": round(peak / 1024, 1),
+            "growth": [_stat(s) for s in growth],
+            "top": [_stat(s) for s in after.statistics(key_type)[:limit]],
+        }
+    finally:
+        if started_tracing:
+            tracemalloc.stop()
+        _profile_lock.release()
+
+
+def describe_objects(objects: Dict[str, object]) -> Dict[str, dict]:
+    """Entry count and serialized size of named containers (caches)"""
+    described = {}
+    for name, obj in objects.items():
+        try:
+            entries: Optional[int] = len(obj)
+        except TypeError:
+            entries = None
+        try:
+            size = len(json.dumps(obj, default=str))
+        except (TypeError, ValueError, RuntimeError):
+            size = None
+        described[name] = {"entries": entries, "json_bytes": size}
+    return described
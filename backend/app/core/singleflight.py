@@ -0,0 +1,134 @@
+"""
+Single-flight request coalescing for expensive operations
+
+Calls are keyed by (operation, target). While a call for a key is running,
+other callers with the same key wait for it and share its result instead of
+starting their own; successful results are then reused for a short window.
+Failures are shared with the callers already waiting but never cached.
+"""
+
+import asyncio
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+# Default reuse window for coalesced results (seconds)
+SINGLE_FLIGHT_TTL = float(os.getenv("SINGLE_FLIGHT_TTL", "2"))
+
+# Purge expired results once this many keys are stored
+_MAX_RESULTS = 1024
+
+
+@dataclass
+class _SyncCall:
+    done: threading.Event = field(default_factory=threading.Event)
+    value: Any = None
+    error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key"""
+
+    def __init__(self, ttl: float = SINGLE_FLIGHT_TTL):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._results: Dict[Hashable, Tuple[float, Any]] = {}
+        self._tasks: Dict[Hashable, asyncio.Task] = {}
+        self._calls: Dict[Hashable, _SyncCall] = {}
+        self._counters = {"calls": 0, "executed": 0, "coalesced": 0, "reused": 0}
+
+    def _reuse(self, key: Hashable, ttl: float) -> Tuple[bool, Any]:
+        with self._lock:
+            self._counters["calls"] += 1
+            entry = self._results.get(key)
+            if entry is not None and time.monotonic() - entry[0] <= ttl:
+                self._counters["reused"] += 1
+                return True, entry[1]
+        return False, None
+
+    def _store(self, key: Hashable, value: Any):
+        now = time.monotonic()
+        with self._lock:
+            if len(self._results) >= _MAX_RESULTS:
+                oldest = now - max(self.ttl, 60)
+                self._results = {k: v for k, v in self._results.items() if v[0] >= oldest}
+            self._results[key] = (now, value)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]], ttl: Optional[float] = None) -> Any:
+        """Run `fn()` once for all concurrent awaiters of `key`"""
+        ttl = self.ttl if ttl is None else ttl
+        hit, value = self._reuse(key, ttl)
+        if hit:
+            return value
+
+        task = self._tasks.get(key)
+        if task is None:
+            self._counters["executed"] += 1
+            task = asyncio.ensure_future(fn())
+            self._tasks[key] = task
+
+            def _finished(t: asyncio.Task, key=key):
+                self._tasks.pop(key, None)
+                if not t.cancelled() and t.exception() is None:
+                    self._store(key, t.result())
+
+            task.add_done_callback(_finished)
+        else:
+            self._counters["coalesced"] += 1
+
+        # A cancelled caller must not cancel the work the others wait for
+        return await asyncio.shield(task)
+
+    def do_sync(self, key: Hashable, fn: Callable[[], Any], ttl: Optional[float] = None) -> Any:
+        """Thread-safe variant of `do` for blocking callables"""
+        ttl = self.ttl if ttl is None else ttl
+        hit, value = self._reuse(key, ttl)
+        if hit:
+            return value
+
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _SyncCall()
+                self._calls[key] = call
+                self._counters["executed"] += 1
+            else:
+                self._counters["coalesced"] += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+
+        try:
+            call.value = fn()
+            self._store(key, call.value)
+            return call.value
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+    def invalidate(self, key: Hashable):
+        """Drop a reusable result (e.g. after the underlying state changed)"""
+        with self._lock:
+            self._results.pop(key, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                **self._counters,
+                "in_flight": len(self._tasks) + len(self._calls),
+                "ttl_s": self.ttl,
+            }
+
+
+# Shared instance for per-channel operations
+single_flight = SingleFlight()
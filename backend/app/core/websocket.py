@@ -1,51 +1,345 @@
-"""WebSocket connection manager for real-time updates"""
+"""
+WebSocket connection manager for real-time updates
 
-from typing import List
+Every connection has a bounded outbound queue drained by its own writer task,
+so a slow client only delays itself. Messages are serialized once per
+broadcast and the same text is queued for every recipient. Telemetry is
+droppable: a newer message with the same coalesce key replaces the queued
+one (coalesce-latest), and a full queue drops its oldest telemetry entry
+(drop-oldest). A client whose queue is full of control messages, or whose
+socket stops accepting writes, is disconnected.
+
+With WS_BATCH_INTERVAL_MS > 0 telemetry is buffered per topic and flushed
+on that interval. Each flush encodes a topic's messages once per wire
+variant - one message per frame, a JSON batch frame or a binary batch frame
+(see ws_codec) - and every subscriber of the topic gets the same frame.
+"""
+
+import asyncio
+import os
+from collections import deque
+from typing import Deque, Dict, Hashable, Iterable, List, Optional, Set, Union
 from fastapi import WebSocket
 
+from .ws_codec import encode_message, encode_json_batch, encode_binary_batch, binary_schemas
+
+# Outbound messages buffered per connection
+WS_QUEUE_SIZE = int(os.getenv("WS_QUEUE_SIZE", "256"))
+# A send blocked longer than this disconnects the client (seconds)
+WS_SEND_TIMEOUT = float(os.getenv("WS_SEND_TIMEOUT", "10"))
+# Telemetry flush interval (0 sends every message immediately)
+WS_BATCH_INTERVAL_MS = float(os.getenv("WS_BATCH_INTERVAL_MS", "100"))
+# Messages buffered per topic between flushes
+WS_TOPIC_BUFFER = 1024
+ENCODINGS = ("json", "binary")
+
+# Topics a client can subscribe to ("channel:<name>", "logs:<name>" per channel)
+TOPIC_PREFIXES = ("channel:", "logs:")
+TOPICS = ("fleet", "system")
+
+
+def is_valid_topic(topic: str) -> bool:
+    """Check a topic name sent by a client"""
+    if not isinstance(topic, str):
+        return False
+    if topic in TOPICS:
+        return True
+    return any(topic.startswith(prefix) and len(topic) > len(prefix) for prefix in TOPIC_PREFIXES)
+
+
+class _Entry:
+    """A queued frame (text or binary); coalescing swaps `text` in place"""
+    __slots__ = ("text", "key", "droppable")
+
+    def __init__(self, text: Union[str, bytes], key: Optional[Hashable], droppable: bool):
+        self.text = text
+        self.key = key
+        self.droppable = droppable
+
+
+class ClientConnection:
+    """One WebSocket with its subscriptions, outbound queue and writer task"""
+
+    def __init__(self, websocket: WebSocket, manager: "ConnectionManager"):
+        self.websocket = websocket
+        self.topics: Set[str] = set()
+        # Wire format chosen by the client with a "configure" message
+        self.batch = False
+        self.encoding = "json"
+        self.queue: Deque[_Entry] = deque()
+        self.pending: Dict[Hashable, _Entry] = {}
+        self.sent = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self._manager = manager
+        self._ready = asyncio.Event()
+        self._writer: Optional[asyncio.Task] = None
+
+    def start(self):
+        self._writer = asyncio.create_task(self._write_loop())
+
+    def stop(self):
+        if self._writer and self._writer is not asyncio.current_task():
+            self._writer.cancel()
+        self._writer = None
+        self.queue.clear()
+        self.pending.clear()
+
+    def enqueue(self, text: Union[str, bytes], key: Optional[Hashable] = None, droppable: bool = False) -> bool:
+        """Queue a message; False when the client is too slow to keep"""
+        if key is not None:
+            entry = self.pending.get(key)
+            if entry is not None:
+                entry.text = text
+                self.coalesced += 1
+                return True
+
+        if len(self.queue) >= WS_QUEUE_SIZE and not self._drop_oldest():
+            return False
+
+        entry = _Entry(text, key, droppable)
+        self.queue.append(entry)
+        if key is not None:
+            self.pending[key] = entry
+        self._ready.set()
+        return True
+
+    def _drop_oldest(self) -> bool:
+        for entry in self.queue:
+            if entry.droppable:
+                self.queue.remove(entry)
+                if entry.key is not None:
+                    self.pending.pop(entry.key, None)
+                self.dropped += 1
+                return True
+        return False
+
+    async def _write_loop(self):
+        while True:
+            await self._ready.wait()
+            self._ready.clear()
+            while self.queue:
+                entry = self.queue.popleft()
+                if entry.key is not None:
+                    self.pending.pop(entry.key, None)
+                try:
+                    if isinstance(entry.text, bytes):
+                        send = self.websocket.send_bytes(entry.text)
+                    else:
+                        send = self.websocket.send_text(entry.text)
+                    await asyncio.wait_for(send, timeout=WS_SEND_TIMEOUT)
+                except Exception as e:
+                    print(f"WebSocket send error: {type(e).__name__}: {e}")
+                    self._manager.disconnect(self.websocket)
+                    return
+                self.sent += 1
+
+    @property
+    def variant(self) -> str:
+        if self.encoding == "binary":
+            return "binary"
+        return "batch" if self.batch else "single"
+
+
+class _TopicBuffer:
+    """Telemetry of one topic waiting for the next flush"""
+    __slots__ = ("messages", "index")
+
+    def __init__(self):
+        self.messages: List[dict] = []
+        self.index: Dict[Hashable, int] = {}
+
+    def add(self, message: dict, key: Optional[Hashable]) -> bool:
+        """Buffer a message; True when it replaced an older one"""
+        if key is not None and key in self.index:
+            self.messages[self.index[key]] = message
+            return True
+        if len(self.messages) >= WS_TOPIC_BUFFER:
+            # Drop the oldest message; positions of keyed ones shift by one
+            self.messages.pop(0)
+            self.index = {k: i - 1 for k, i in self.index.items() if i > 0}
+        if key is not None:
+            self.index[key] = len(self.messages)
+        self.messages.append(message)
+        return False
+
 
 class ConnectionManager:
     """Manages WebSocket connections for broadcasting messages"""
 
     def __init__(self):
-        self.active_connections: List[WebSocket] = []
+        self.clients: Dict[WebSocket, ClientConnection] = {}
+        self.slow_disconnects = 0
+        self.batch_interval = WS_BATCH_INTERVAL_MS / 1000
+        self._buffers: Dict[str, _TopicBuffer] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+        self._frames = {"single": 0, "batch": 0, "binary": 0}
+        self._encoded_size = {"single": 0, "batch": 0, "binary": 0}
+
+    @property
+    def active_connections(self) -> List[WebSocket]:
+        return list(self.clients.keys())
+
+    @property
+    def subscriptions(self) -> Dict[WebSocket, Set[str]]:
+        return {ws: client.topics for ws, client in self.clients.items()}
 
     async def connect(self, websocket: WebSocket):
         """Accept and store a new WebSocket connection"""
         await websocket.accept()
-        self.active_connections.append(websocket)
+        client = ClientConnection(websocket, self)
+        self.clients[websocket] = client
+        client.start()
 
     def disconnect(self, websocket: WebSocket):
         """Remove a WebSocket connection from the active list"""
-        if websocket in self.active_connections:
-            self.active_connections.remove(websocket)
+        client = self.clients.pop(websocket, None)
+        if client:
+            client.stop()
+
+    def subscribe(self, websocket: WebSocket, topics: Iterable[str]) -> Set[str]:
+        """Add topics to a connection's subscriptions, returning the valid new ones"""
+        client = self.clients.get(websocket)
+        if client is None:
+            return set()
+        added = {t for t in topics if is_valid_topic(t)} - client.topics
+        client.topics |= added
+        return added
+
+    def unsubscribe(self, websocket: WebSocket, topics: Iterable[str]):
+        """Remove topics from a connection's subscriptions"""
+        client = self.clients.get(websocket)
+        if client is not None:
+            client.topics.difference_update(topics)
+
+    def configure(self, websocket: WebSocket, batch: Optional[bool] = None,
+                  encoding: Optional[str] = None) -> dict:
+        """Set a connection's telemetry wire format; binary implies batching"""
+        client = self.clients.get(websocket)
+        if client is None:
+            return {}
+        if batch is not None:
+            client.batch = bool(batch)
+        if encoding in ENCODINGS:
+            client.encoding = encoding
+        reply = {
+            "type": "configured",
+            "batch": client.batch or client.encoding == "binary",
+            "encoding": client.encoding,
+            "batch_interval_ms": WS_BATCH_INTERVAL_MS,
+        }
+        if client.encoding == "binary":
+            reply["schemas"] = binary_schemas()
+        return reply
+
+    def topics_of(self, websocket: WebSocket) -> Set[str]:
+        client = self.clients.get(websocket)
+        return set(client.topics) if client else set()
+
+    def subscribed_topics(self) -> Set[str]:
+        """All topics with at least one subscriber"""
+        topics = set()
+        for client in self.clients.values():
+            topics |= client.topics
+        return topics
 
     async def send_personal_message(self, message: dict, websocket: WebSocket):
         """Send a message to a specific WebSocket connection"""
-        try:
-            await websocket.send_json(message)
-        except Exception as e:
-            print(f"Error sending personal message: {e}")
-            self.disconnect(websocket)
+        client = self.clients.get(websocket)
+        if client is None:
+            return
+        self._enqueue(client, encode_message(message))
 
     async def broadcast(self, message: dict):
         """Broadcast a message to all active WebSocket connections"""
-        disconnected = []
-        for connection in self.active_connections:
-            try:
-                await connection.send_json(message)
-            except Exception as e:
-                print(f"WebSocket broadcast error: {e}")
-                disconnected.append(connection)
-
-        # Clean up disconnected connections
-        for conn in disconnected:
-            self.disconnect(conn)
+        text = encode_message(message)
+        for client in list(self.clients.values()):
+            self._enqueue(client, text)
+
+    async def publish(self, topic: str, message: dict, coalesce: bool = True):
+        """
+        Send telemetry to the subscribers of a topic. With `coalesce` a pending
+        message of the same kind is replaced instead of sent twice.
+        """
+        if not any(topic in c.topics for c in self.clients.values()):
+            return
+        key = (topic, message.get("type"), message.get("channel_name")) if coalesce else None
+        buffer = self._buffers.get(topic)
+        if buffer is None:
+            buffer = self._buffers[topic] = _TopicBuffer()
+        buffer.add(message, key)
+        if self.batch_interval <= 0:
+            self.flush()
+        elif self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def _flush_loop(self):
+        while self._buffers or self.clients:
+            await asyncio.sleep(self.batch_interval)
+            self.flush()
+
+    def flush(self):
+        """Encode buffered telemetry once per topic and wire variant and queue it"""
+        buffers, self._buffers = self._buffers, {}
+        for topic, buffer in buffers.items():
+            subscribers = [c for c in self.clients.values() if topic in c.topics]
+            if not subscribers or not buffer.messages:
+                continue
+            keys = {i: k for k, i in buffer.index.items()}
+            frames: Dict[str, list] = {}
+            for client in subscribers:
+                variant = client.variant
+                if variant not in frames:
+                    frames[variant] = self._encode(variant, topic, buffer.messages, keys)
+                for text, key in frames[variant]:
+                    self._enqueue(client, text, key, droppable=True)
+
+    def _encode(self, variant: str, topic: str, messages: List[dict],
+                keys: Dict[int, Hashable]) -> list:
+        if variant == "single":
+            frames = [(encode_message({**m, "topic": topic}), keys.get(i)) for i, m in enumerate(messages)]
+        elif variant == "batch":
+            frames = [(encode_json_batch(topic, messages), None)]
+        else:
+            frames = [(encode_binary_batch(topic, messages), None)]
+        self._frames[variant] += len(frames)
+        self._encoded_size[variant] += sum(len(text) for text, _ in frames)
+        return frames
+
+    def _enqueue(self, client: ClientConnection, text: Union[str, bytes], key: Optional[Hashable] = None,
+                 droppable: bool = False):
+        if not client.enqueue(text, key, droppable):
+            print("WebSocket client too slow - outbound queue full, disconnecting")
+            self.slow_disconnects += 1
+            self.disconnect(client.websocket)
+            asyncio.ensure_future(self._close(client.websocket))
+
+    @staticmethod
+    async def _close(websocket: WebSocket):
+        try:
+            await websocket.close(code=1013, reason="Client too slow")
+        except Exception:
+            pass
 
     @property
     def connection_count(self) -> int:
         """Return the number of active connections"""
-        return len(self.active_connections)
+        return len(self.clients)
+
+    def stats(self) -> dict:
+        clients = list(self.clients.values())
+        return {
+            "connections": len(clients),
+            "queued": sum(len(c.queue) for c in clients),
+            "sent": sum(c.sent for c in clients),
+            "dropped": sum(c.dropped for c in clients),
+            "coalesced": sum(c.coalesced for c in clients),
+            "slow_disconnects": self.slow_disconnects,
+            "queue_size": WS_QUEUE_SIZE,
+            "batch_interval_ms": WS_BATCH_INTERVAL_MS,
+            "frames": dict(self._frames),
+            "encoded_size": dict(self._encoded_size),
+        }
 
 
 # Global WebSocket manager instance
@@ -0,0 +1,122 @@
+"""
+WebSocket telemetry encodings
+
+Batched telemetry is sent either as one JSON frame
+    {"type": "batch", "topic": ..., "messages": [...]}
+or, for clients that asked for it, as one compact binary frame. Binary
+frames pack the numeric fields of known message types (BINARY_SCHEMAS)
+and carry everything else as embedded JSON, so nothing is lost:
+
+    frame   = u8 version | u16 topic length | topic | u16 count | record*
+    record  = u8 schema id (0 = plain JSON message)
+    JSON    = u32 length | JSON message
+    schema  = u16 channel name length | channel name | packed fields
+              | u32 length | JSON of the remaining fields ({} omitted: length 0)
+
+All integers are little-endian. Clients receive the schemas (field names and
+struct format) when they configure binary encoding.
+"""
+
+import json
+import struct
+from typing import Dict, List, Tuple
+
+BINARY_VERSION = 1
+
+# message type -> (schema id, container key, ((field, struct code), ...))
+BINARY_SCHEMAS: Dict[str, Tuple[int, str, Tuple[Tuple[str, str], ...]]] = {
+    "stats_sample": (1, "stats", (
+        ("rtt_ms", "f"),
+        ("bandwidth_mbps", "f"),
+        ("max_bandwidth_mbps", "f"),
+        ("send_rate_mbps", "f"),
+        ("recv_rate_mbps", "f"),
+        ("socket_id", "I"),
+        ("packets_sent", "I"),
+        ("packets_received", "I"),
+        ("packets_lost_send", "I"),
+        ("packets_lost_recv", "I"),
+        ("packets_dropped_send", "I"),
+        ("packets_dropped_recv", "I"),
+        ("packets_retransmitted", "I"),
+        ("bytes_sent", "Q"),
+        ("bytes_received", "Q"),
+        ("flight_size", "I"),
+        ("congestion_window", "I"),
+    )),
+    "server_stats": (2, "stats", (
+        ("cpu_percent", "f"),
+        ("memory_percent", "f"),
+        ("memory_used_gb", "f"),
+        ("memory_total_gb", "f"),
+        ("network_bytes_sent", "Q"),
+        ("network_bytes_recv", "Q"),
+        ("network_rate_sent_mbps", "f"),
+        ("network_rate_recv_mbps", "f"),
+    )),
+}
+
+_STRUCTS = {
+    name: struct.Struct("<" + "".join(code for _, code in fields))
+    for name, (_, _, fields) in BINARY_SCHEMAS.items()
+}
+
+
+def encode_message(message: dict) -> str:
+    """Serialize a message the way send_json does"""
+    return json.dumps(message, separators=(",", ":"), ensure_ascii=False)
+
+
+def encode_json_batch(topic: str, messages: List[dict]) -> str:
+    return encode_message({"type": "batch", "topic": topic, "messages": messages})
+
+
+def binary_schemas() -> dict:
+    """Schema description sent to clients that use binary encoding"""
+    return {
+        str(schema_id): {
+            "type": message_type,
+            "container": container,
+            "fields": [name for name, _ in fields],
+            "format": _STRUCTS[message_type].format,
+        }
+        for message_type, (schema_id, container, fields) in BINARY_SCHEMAS.items()
+    }
+
+
+def _json_record(message: dict) -> bytes:
+    data = encode_message(message).encode()
+    return struct.pack("<BI", 0, len(data)) + data
+
+
+def _schema_record(message: dict) -> bytes:
+    schema_id, container, fields = BINARY_SCHEMAS[message["type"]]
+    values = message.get(container) or {}
+    packed = _STRUCTS[message["type"]].pack(*(values.get(name) or 0 for name, _ in fields))
+
+    numeric = {name for name, _ in fields}
+    rest = {k: v for k, v in message.items() if k not in ("type", "topic", "channel_name", container)}
+    leftover = {k: v for k, v in values.items() if k not in numeric}
+    if leftover:
+        rest[container] = leftover
+    extra = encode_message(rest).encode() if rest else b""
+
+    name = (message.get("channel_name") or "").encode()
+    return (struct.pack("<BH", schema_id, len(name)) + name + packed
+            + struct.pack("<I", len(extra)) + extra)
+
+
+def encode_binary_batch(topic: str, messages: List[dict]) -> bytes:
+    """Pack a topic's batch into one binary frame"""
+    topic_bytes = topic.encode()
+    parts = [struct.pack("<BH", BINARY_VERSION, len(topic_bytes)), topic_bytes,
+             struct.pack("<H", len(messages))]
+    for message in messages:
+        record = None
+        if message.get("type") in BINARY_SCHEMAS:
+            try:
+                record = _schema_record(message)
+            except (struct.error, TypeError, AttributeError):
+                record = None
+        parts.append(record if record is not None else _json_record(message))
+    return b"".join(parts)
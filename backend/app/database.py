@@ -4,19 +4,21 @@ import json
 from pathlib import Path
 from typing import Optional, List, Dict, Any
 from datetime import datetime
-from filelock import FileLock
 
 from .core.security import hash_password, verify_password
+from .core import perf
 from .models.user import UserRole
+# Users share config.json with channels - save it the same (atomic) way
+from .services.channel_service import config_lock, _save_config
 
 CONFIG_FILE = Path("config.json")
-CONFIG_LOCK = Path("config.json.lock")
 
 
 def _load_config() -> Dict[str, Any]:
     """Load full config from JSON file"""
     if not CONFIG_FILE.exists():
         return {"channels": [], "users": []}
+    perf.count("config_reads")
     try:
         with open(CONFIG_FILE, 'r') as f:
             data = json.load(f)
@@ -28,13 +30,6 @@ def _load_config() -> Dict[str, Any]:
         return {"channels": [], "users": []}
 
 
-def _save_config(config: Dict[str, Any]):
-    """Save full config to JSON file"""
-    with FileLock(CONFIG_LOCK):
-        with open(CONFIG_FILE, 'w') as f:
-            json.dump(config, f, indent=2, default=str)
-
-
 def _get_users() -> List[Dict[str, Any]]:
     """Get users list from config"""
     config = _load_config()
@@ -43,9 +38,10 @@ def _get_users() -> List[Dict[str, Any]]:
 
 def _save_users(users: List[Dict[str, Any]]):
     """Save users list to config"""
-    config = _load_config()
-    config["users"] = users
-    _save_config(config)
+    with config_lock:
+        config = _load_config()
+        config["users"] = users
+        _save_config(config)
 
 
 def _get_next_id(users: List[Dict[str, Any]]) -> int:
@@ -76,42 +72,43 @@ def _hash_plain_passwords(users: List[Dict[str, Any]]) -> bool:
 
 def init_database():
     """Initialize config with default admin user if no users exist"""
-    config = _load_config()
-    users = config.get("users", [])
-    changed = False
-
-    # Hash any plain text passwords
-    if _hash_plain_passwords(users):
-        changed = True
+    with config_lock:
+        config = _load_config()
+        users = config.get("users", [])
+        changed = False
 
-    # Ensure all users have a role field (migration)
-    for user in users:
-        if 'role' not in user:
-            # Default existing admin user to admin role, others to readonly
-            if user.get('username') == 'admin':
-                user['role'] = UserRole.admin.value
-            else:
-                user['role'] = UserRole.readonly.value
+        # Hash any plain text passwords
+        if _hash_plain_passwords(users):
             changed = True
 
-    # Create default admin user if no users exist
-    admin_exists = any(u.get('username') == 'admin' for u in users)
-    if not admin_exists:
-        users.append({
-            'id': _get_next_id(users),
-            'username': 'admin',
-            'hashed_password': hash_password('admin'),
-            'email': 'admin@localhost',
-            'is_active': True,
-            'role': UserRole.admin.value,
-            'created_at': datetime.now().isoformat()
-        })
-        changed = True
-        print("Default admin user created (admin/admin)")
+        # Ensure all users have a role field (migration)
+        for user in users:
+            if 'role' not in user:
+                # Default existing admin user to admin role, others to readonly
+                if user.get('username') == 'admin':
+                    user['role'] = UserRole.admin.value
+                else:
+                    user['role'] = UserRole.readonly.value
+                changed = True
+
+        # Create default admin user if no users exist
+        admin_exists = any(u.get('username') == 'admin' for u in users)
+        if not admin_exists:
+            users.append({
+                'id': _get_next_id(users),
+                'username': 'admin',
+                'hashed_password': hash_password('admin'),
+                'email': 'admin@localhost',
+                'is_active': True,
+                'role': UserRole.admin.value,
+                'created_at': datetime.now().isoformat()
+            })
+            changed = True
+            print("Default admin user created (admin/admin)")
 
-    if changed:
-        config["users"] = users
-        _save_config(config)
+        if changed:
+            config["users"] = users
+            _save_config(config)
 
 
 def get_user_by_username(username: str) -> Optional[Dict[str, Any]]:
@@ -125,39 +122,41 @@ def get_user_by_username(username: str) -> Optional[Dict[str, Any]]:
 
 def create_user(username: str, password: str, email: str = None, role: str = None) -> bool:
     """Create a new user"""
-    users = _get_users()
+    with config_lock:
+        users = _get_users()
 
-    # Check if username already exists
-    if any(u.get('username') == username for u in users):
-        return False
+        # Check if username already exists
+        if any(u.get('username') == username for u in users):
+            return False
 
-    # Default to readonly role if not specified
-    if role is None:
-        role = UserRole.readonly.value
+        # Default to readonly role if not specified
+        if role is None:
+            role = UserRole.readonly.value
 
-    users.append({
-        'id': _get_next_id(users),
-        'username': username,
-        'hashed_password': hash_password(password),
-        'email': email,
-        'is_active': True,
-        'role': role,
-        'created_at': datetime.now().isoformat()
-    })
-    _save_users(users)
-    return True
+        users.append({
+            'id': _get_next_id(users),
+            'username': username,
+            'hashed_password': hash_password(password),
+            'email': email,
+            'is_active': True,
+            'role': role,
+            'created_at': datetime.now().isoformat()
+        })
+        _save_users(users)
+        return True
 
 
 def update_user_password(username: str, new_password: str) -> bool:
     """Update user password"""
-    users = _get_users()
-
-    for user in users:
-        if user.get('username') == username:
-            user['hashed_password'] = hash_password(new_password)
-            _save_users(users)
-            return True
-    return False
+    with config_lock:
+        users = _get_users()
+
+        for user in users:
+            if user.get('username') == username:
+                user['hashed_password'] = hash_password(new_password)
+                _save_users(users)
+                return True
+        return False
 
 
 def delete_user(username: str) -> bool:
@@ -165,14 +164,15 @@ def delete_user(username: str) -> bool:
     if username == 'admin':
         return False
 
-    users = _get_users()
-    original_count = len(users)
-    users = [u for u in users if u.get('username') != username]
+    with config_lock:
+        users = _get_users()
+        original_count = len(users)
+        users = [u for u in users if u.get('username') != username]
 
-    if len(users) < original_count:
-        _save_users(users)
-        return True
-    return False
+        if len(users) < original_count:
+            _save_users(users)
+            return True
+        return False
 
 
 def list_users() -> List[Dict[str, Any]]:
@@ -193,14 +193,15 @@ def list_users() -> List[Dict[str, Any]]:
 
 def update_user_role(username: str, role: str) -> bool:
     """Update user role"""
-    users = _get_users()
-
-    for user in users:
-        if user.get('username') == username:
-            user['role'] = role
-            _save_users(users)
-            return True
-    return False
+    with config_lock:
+        users = _get_users()
+
+        for user in users:
+            if user.get('username') == username:
+                user['role'] = role
+                _save_users(users)
+                return True
+        return False
 
 
 def authenticate_user(username: str, password: str) -> Optional[Dict[str, Any]]:
@@ -81,6 +81,13 @@ class ChannelBase(BaseModel):
     sources: Optional[List[Dict[str, Any]]] = Field(default=None, description="Multiple input sources")
     destinations: Optional[List[Dict[str, Any]]] = Field(default=None, description="Multiple output destinations")
 
+    # Passive stream analysis
+    tap_port: Optional[int] = Field(default=None, description="Loopback UDP port the passive analyzer reads. An external tee must "
+                                                "send a copy of the stream there; the channel does not feed it")
+
+    # Labels for filtering the channel list
+    tags: Optional[List[str]] = Field(default=None, description="Channel tags")
+
     @field_validator('channel_name')
     @classmethod
     def validate_channel_name(cls, v: str) -> str:
@@ -101,6 +108,29 @@ class ChannelBase(BaseModel):
             raise ValueError(f'Port must be between 1 and 65535, got {v}')
         return v
 
+    @field_validator('tap_port')
+    @classmethod
+    def validate_tap_port(cls, v: Optional[int]) -> Optional[int]:
+        if v is None:
+            return v
+        if v < 1 or v > 65535:
+            raise ValueError(f'Tap port must be between 1 and 65535, got {v}')
+        return v
+
+    @field_validator('tags')
+    @classmethod
+    def validate_tags(cls, v: Optional[List[str]]) -> Optional[List[str]]:
+        if v is None:
+            return v
+        tags = []
+        for tag in v:
+            tag = tag.strip()
+            if not re.match(r'^[a-zA-Z0-9_.:-]{1,50}$', tag):
+                raise ValueError(f'Invalid tag "{tag}": use up to 50 letters, numbers, "_", "-", "." or ":"')
+            if tag not in tags:
+                tags.append(tag)
+        return tags
+
     @field_validator('input_ip')
     @classmethod
     def validate_input_ip(cls, v: str) -> str:
@@ -225,3 +255,5 @@ class ChannelUpdate(BaseModel):
     auto_reconnect: Optional[bool] = None
     sources: Optional[List[Dict[str, Any]]] = None
     destinations: Optional[List[Dict[str, Any]]] = None
+    tap_port: Optional[int] = None
+    tags: Optional[List[str]] = None
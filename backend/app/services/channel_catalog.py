@@ -0,0 +1,240 @@
+"""
+Channel catalog - secondary indexes over the saved channel list
+
+Every saved channel list is diffed against the previous one and only the
+channels that changed are re-indexed: by status, protocol, mode, tag, port
+and name (sorted names for prefixes, trigrams for substrings). List queries
+intersect the matching index entries instead of loading and scanning
+config.json, then sort and cut a page after an opaque cursor.
+"""
+
+import base64
+import json
+import threading
+from bisect import bisect_left, bisect_right, insort
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# Sortable fields of the channel list ("-" prefix for descending)
+SORT_FIELDS = {
+    "channel_name", "status", "input_protocol", "output_protocol", "mode",
+    "input_port", "output_port", "start_date", "uptime",
+}
+
+
+def _protocols(ch: dict) -> Set[str]:
+    values = {ch.get("input_protocol"), ch.get("output_protocol")}
+    values.update(item.get("protocol") for item in (ch.get("sources") or []) + (ch.get("destinations") or []))
+    values.discard(None)
+    return values
+
+
+def _modes(ch: dict) -> Set[str]:
+    values = {ch.get("input_mode"), ch.get("mode")}
+    values.update(item.get("mode") for item in (ch.get("sources") or []) + (ch.get("destinations") or []))
+    values.discard(None)
+    return values
+
+
+def _ports(ch: dict) -> Set[int]:
+    values = {ch.get("input_port"), ch.get("output_port"), ch.get("tap_port")}
+    values.update(item.get("port") for item in (ch.get("sources") or []) + (ch.get("destinations") or []))
+    return {int(port) for port in values if isinstance(port, int) or (isinstance(port, str) and port.isdigit())}
+
+
+def _trigrams(text: str) -> Set[str]:
+    text = text.lower()
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _encode_cursor(sort: str, key: tuple) -> str:
+    raw = json.dumps([sort, list(key)], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str, sort: str) -> tuple:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        cursor_sort, key = json.loads(raw)
+        key = tuple(key)
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+    if cursor_sort != sort or len(key) != 3:
+        raise ValueError("Cursor belongs to a different sort order")
+    return key
+
+
+class ChannelCatalog:
+    """Saved channels with secondary indexes for filtered, paginated listing"""
+
+    def __init__(self):
+        self._channels: Dict[str, dict] = {}
+        # Order of first appearance - the order of config.json
+        self._seq: Dict[str, int] = {}
+        self._next_seq = 0
+        self._by_status: Dict[str, Set[str]] = {}
+        self._by_protocol: Dict[str, Set[str]] = {}
+        self._by_mode: Dict[str, Set[str]] = {}
+        self._by_tag: Dict[str, Set[str]] = {}
+        self._by_trigram: Dict[str, Set[str]] = {}
+        self._ports: List[Tuple[int, str]] = []
+        self._names: List[str] = []
+        self._pids: Dict[str, int] = {}
+        # Identity of the config.json the indexes were built from
+        self.signature: Optional[tuple] = None
+        self._lock = threading.Lock()
+
+    def record(self, channels: List[dict], signature: Optional[tuple] = None):
+        """Re-index the channels of a saved list (model_dump()s) that changed"""
+        with self._lock:
+            current = {ch["channel_name"]: ch for ch in channels}
+            for name in [name for name in self._channels if name not in current]:
+                self._unindex(name)
+                del self._seq[name]
+            for name, ch in current.items():
+                previous = self._channels.get(name)
+                if previous == ch:
+                    continue
+                if previous is not None:
+                    self._unindex(name)
+                self._index(name, ch)
+            self.signature = signature
+
+    def _index(self, name: str, ch: dict):
+        self._channels[name] = ch
+        if name not in self._seq:
+            self._seq[name] = self._next_seq
+            self._next_seq += 1
+        self._by_status.setdefault(ch.get("status"), set()).add(name)
+        for index, values in ((self._by_protocol, _protocols(ch)), (self._by_mode, _modes(ch)),
+                              (self._by_tag, set(ch.get("tags") or [])), (self._by_trigram, _trigrams(name))):
+            for value in values:
+                index.setdefault(value, set()).add(name)
+        for port in _ports(ch):
+            insort(self._ports, (port, name))
+        i = bisect_left(self._names, name)
+        if i == len(self._names) or self._names[i] != name:
+            self._names.insert(i, name)
+        if ch.get("pid"):
+            self._pids[name] = ch["pid"]
+
+    def _unindex(self, name: str):
+        ch = self._channels.pop(name)
+        for index, values in ((self._by_status, {ch.get("status")}), (self._by_protocol, _protocols(ch)),
+                              (self._by_mode, _modes(ch)), (self._by_tag, set(ch.get("tags") or [])),
+                              (self._by_trigram, _trigrams(name))):
+            for value in values:
+                names = index.get(value)
+                if names is not None:
+                    names.discard(name)
+                    if not names:
+                        del index[value]
+        for port in _ports(ch):
+            i = bisect_left(self._ports, (port, name))
+            if i < len(self._ports) and self._ports[i] == (port, name):
+                del self._ports[i]
+        i = bisect_left(self._names, name)
+        if i < len(self._names) and self._names[i] == name:
+            del self._names[i]
+        self._pids.pop(name, None)
+
+    def pids(self) -> Dict[str, int]:
+        """Channels that have a process, with its pid"""
+        with self._lock:
+            return dict(self._pids)
+
+    def _union(self, index: Dict[str, Set[str]], values: Iterable[str]) -> Set[str]:
+        result: Set[str] = set()
+        for value in values:
+            result |= index.get(value, set())
+        return result
+
+    def _with_prefix(self, prefix: str) -> Set[str]:
+        start = bisect_left(self._names, prefix)
+        end = bisect_left(self._names, prefix + "\U0010ffff")
+        return set(self._names[start:end])
+
+    def _containing(self, text: str) -> Set[str]:
+        text = text.lower()
+        grams = _trigrams(text)
+        if grams:
+            postings = sorted((self._by_trigram.get(gram, set()) for gram in grams), key=len)
+            candidates = set.intersection(*postings)
+        else:
+            # Shorter than a trigram - only the names themselves can tell
+            candidates = self._channels.keys()
+        return {name for name in candidates if text in name.lower()}
+
+    def _in_port_range(self, low: Optional[int], high: Optional[int]) -> Set[str]:
+        start = bisect_left(self._ports, (low if low is not None else 0, ""))
+        end = bisect_right(self._ports, (high if high is not None else 65535, "\U0010ffff"))
+        return {name for _, name in self._ports[start:end]}
+
+    def query(self, status: Optional[List[str]] = None, protocol: Optional[List[str]] = None,
+              mode: Optional[List[str]] = None, tags: Optional[List[str]] = None,
+              name_prefix: Optional[str] = None, name_contains: Optional[str] = None,
+              port_min: Optional[int] = None, port_max: Optional[int] = None,
+              sort: Optional[str] = None, cursor: Optional[str] = None,
+              limit: Optional[int] = None) -> Tuple[List[dict], int, Optional[str]]:
+        """
+        Channels matching every given filter, sorted (config order when no
+        sort is given), as (page, total matches, cursor of the next page)
+
+        Lists of values match any of them, except tags: a channel must carry
+        all of those.
+        """
+        sort = sort or ""
+        field = sort.lstrip("-")
+        if field and field not in SORT_FIELDS:
+            raise ValueError(f"Cannot sort by '{field}'. Sortable fields: {', '.join(sorted(SORT_FIELDS))}")
+        after = _decode_cursor(cursor, sort) if cursor else None
+
+        with self._lock:
+            sets = []
+            if status:
+                sets.append(self._union(self._by_status, status))
+            if protocol:
+                sets.append(self._union(self._by_protocol, protocol))
+            if mode:
+                sets.append(self._union(self._by_mode, mode))
+            for tag in tags or []:
+                sets.append(self._by_tag.get(tag, set()))
+            if name_prefix:
+                sets.append(self._with_prefix(name_prefix))
+            if name_contains:
+                sets.append(self._containing(name_contains))
+            if port_min is not None or port_max is not None:
+                sets.append(self._in_port_range(port_min, port_max))
+
+            if sets:
+                sets.sort(key=len)
+                names = set.intersection(*sets)
+            else:
+                names = self._channels.keys()
+
+            def sort_key(name: str) -> tuple:
+                if not field:
+                    return False, self._seq[name], name
+                value = self._channels[name].get(field)
+                # None sorts after every value
+                return value is None, value if value is not None else 0, name
+
+            keyed = sorted((sort_key(name), name) for name in names)
+            keys = [key for key, _ in keyed]
+            if sort.startswith("-"):
+                end = bisect_left(keys, after) if after else len(keyed)
+                start = max(end - limit, 0) if limit else 0
+                page = keyed[start:end][::-1]
+                more = start > 0
+            else:
+                start = bisect_right(keys, after) if after else 0
+                end = start + limit if limit else len(keyed)
+                page = keyed[start:end]
+                more = end < len(keyed)
+            channels = [self._channels[name] for _, name in page]
+
+        next_cursor = _encode_cursor(sort, page[-1][0]) if more and page else None
+        return channels, len(keyed), next_cursor
+
+
+# Global catalog instance
+channel_catalog = ChannelCatalog()
@@ -0,0 +1,100 @@
+"""
+Channel journal - versioned channel snapshots for delta sync
+
+Every saved channel list is diffed against the previous one; each added,
+changed or deleted channel bumps a global version and is appended to a
+bounded journal. WebSocket clients send the version (and epoch) they last
+saw with get_channels and receive only what changed since, or a full
+snapshot when the journal no longer reaches back that far or the server
+restarted (new epoch).
+"""
+
+import os
+import threading
+import uuid
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+CHANNEL_JOURNAL_SIZE = int(os.getenv("CHANNEL_JOURNAL_SIZE", "1000"))
+
+
+class ChannelJournal:
+    """Global channel version and bounded change journal"""
+
+    def __init__(self, size: int = CHANNEL_JOURNAL_SIZE):
+        # Versions are only comparable within one server process
+        self.epoch = uuid.uuid4().hex[:12]
+        self.version = 0
+        self._entries: Deque[Tuple[int, str]] = deque(maxlen=size)
+        self._snapshot: Dict[str, dict] = {}
+        self._order: List[str] = []
+        # Oldest version a delta can be computed from
+        self._floor = 0
+        self._primed = False
+        self._lock = threading.Lock()
+
+    @property
+    def primed(self) -> bool:
+        return self._primed
+
+    def record(self, channels: List[dict]) -> int:
+        """Diff a saved channel list (model_dump()s) against the previous one"""
+        with self._lock:
+            current = {ch["channel_name"]: ch for ch in channels}
+            self._order = list(current)
+            if not self._primed:
+                # First snapshot of this process - nothing to diff against
+                self._snapshot = current
+                self._primed = True
+                self.version += 1
+                self._floor = self.version
+                return self.version
+
+            changed = [name for name, ch in current.items() if self._snapshot.get(name) != ch]
+            deleted = [name for name in self._snapshot if name not in current]
+            for name in changed + deleted:
+                self.version += 1
+                if len(self._entries) == self._entries.maxlen:
+                    self._floor = self._entries[0][0]
+                self._entries.append((self.version, name))
+            self._snapshot = current
+            return self.version
+
+    def snapshot(self) -> Tuple[int, List[dict]]:
+        """Current version and all channels in saved order"""
+        with self._lock:
+            return self.version, [self._snapshot[name] for name in self._order]
+
+    def changes_since(self, since: int, epoch: Optional[str] = None) -> Optional[Tuple[int, List[dict], List[str]]]:
+        """
+        (version, changed channels, deleted names) since `since`, or None when
+        a full snapshot is needed
+        """
+        with self._lock:
+            if not self._primed or epoch != self.epoch or since < self._floor or since > self.version:
+                return None
+            names = []
+            seen = set()
+            for version, name in reversed(self._entries):
+                if version <= since:
+                    break
+                if name not in seen:
+                    seen.add(name)
+                    names.append(name)
+            names.reverse()
+            changed = [self._snapshot[name] for name in names if name in self._snapshot]
+            deleted = [name for name in names if name not in self._snapshot]
+            return self.version, changed, deleted
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "epoch": self.epoch,
+                "version": self.version,
+                "journal_entries": len(self._entries),
+                "oldest_delta_version": self._floor,
+            }
+
+
+# Global journal instance
+channel_journal = ChannelJournal()
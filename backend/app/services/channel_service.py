@@ -4,11 +4,17 @@ import json
 import os
 import signal
 import subprocess
+import tempfile
+import threading
 from datetime import datetime
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from filelock import FileLock
 from ..models.channel import Channel, ChannelBase, ChannelUpdate
+from ..core import perf
+from .channel_catalog import channel_catalog
+from .channel_journal import channel_journal
+from .port_registry import port_registry
 
 
 # Configuration paths
@@ -17,6 +23,11 @@ CONFIG_LOCK = Path("config.json.lock")
 STATS_FOLDER = Path("static/stats")
 LOGS_FOLDER = Path("static/logs")
 
+# Held around every load-modify-save of config.json (channels here, users in
+# app.database). Handlers run those sequences on executor threads, so without
+# it two concurrent edits could each save a config missing the other's change.
+config_lock = threading.RLock()
+
 
 def ensure_directories():
     """Ensure required directories exist"""
@@ -28,6 +39,7 @@ def _load_config() -> Dict[str, Any]:
     """Load full config from JSON file"""
     if not CONFIG_FILE.exists():
         return {"channels": [], "users": []}
+    perf.count("config_reads")
     try:
         with open(CONFIG_FILE, 'r') as f:
             data = json.load(f)
@@ -40,10 +52,38 @@ def _load_config() -> Dict[str, Any]:
 
 
 def _save_config(config: Dict[str, Any]):
-    """Save full config to JSON file"""
+    """
+    Save full config to JSON file
+
+    Written to a temp file and renamed over config.json, so readers (which
+    take no lock) never see a half-written file.
+    """
+    perf.count("config_writes")
+    data = json.dumps(config, indent=2, default=str)
     with FileLock(CONFIG_LOCK):
-        with open(CONFIG_FILE, 'w') as f:
-            json.dump(config, f, indent=2, default=str)
+        tmp_path = None
+        try:
+            with tempfile.NamedTemporaryFile('w', dir=CONFIG_FILE.resolve().parent, prefix=f".{CONFIG_FILE.name}.",
+                                             suffix=".tmp", delete=False) as f:
+                tmp_path = f.name
+                f.write(data)
+            os.replace(tmp_path, CONFIG_FILE)
+        except BaseException:
+            if tmp_path:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+            raise
+
+
+def _config_signature() -> Optional[tuple]:
+    """Identity of the current config.json (every save replaces the file)"""
+    try:
+        st = os.stat(CONFIG_FILE)
+    except OSError:
+        return None
+    return st.st_ino, st.st_mtime_ns, st.st_size
 
 
 def load_channels() -> List[Channel]:
@@ -59,9 +99,13 @@ def load_channels() -> List[Channel]:
 
 def save_channels(channels: List[Channel]):
     """Save channels to config.json (preserving users)"""
-    config = _load_config()
-    config["channels"] = [ch.model_dump() for ch in channels]
-    _save_config(config)
+    with config_lock:
+        config = _load_config()
+        config["channels"] = [ch.model_dump() for ch in channels]
+        _save_config(config)
+        channel_catalog.record(config["channels"], _config_signature())
+        port_registry.record(config["channels"])
+        channel_journal.record(config["channels"])
 
 
 def get_channel_by_name(channel_name: str) -> Optional[Channel]:
@@ -75,56 +119,65 @@ def get_channel_by_name(channel_name: str) -> Optional[Channel]:
 
 def create_channel(channel_data: ChannelBase) -> Channel:
     """Create a new channel"""
-    channels = load_channels()
+    with config_lock:
+        channels = load_channels()
 
-    # Check if channel with this name already exists
-    if any(ch.channel_name == channel_data.channel_name for ch in channels):
-        raise ValueError("Channel with this name already exists")
+        # Check if channel with this name already exists
+        if any(ch.channel_name == channel_data.channel_name for ch in channels):
+            raise ValueError("Channel with this name already exists")
 
-    new_channel = Channel(**channel_data.model_dump())
-    channels.append(new_channel)
-    save_channels(channels)
-    return new_channel
+        new_channel = Channel(**channel_data.model_dump())
+        ensure_indexes()
+        port_registry.check(new_channel.model_dump())
+        channels.append(new_channel)
+        save_channels(channels)
+        return new_channel
 
 
 def update_channel(channel_name: str, update: ChannelUpdate) -> Optional[Channel]:
     """Update an existing channel"""
-    channels = load_channels()
+    with config_lock:
+        channels = load_channels()
 
-    for i, channel in enumerate(channels):
-        if channel.channel_name == channel_name:
-            # Cannot update running channel
-            if channel.status == "running":
-                raise ValueError("Cannot update running channel. Stop it first.")
+        for i, channel in enumerate(channels):
+            if channel.channel_name == channel_name:
+                # Cannot update running channel
+                if channel.status == "running":
+                    raise ValueError("Cannot update running channel. Stop it first.")
 
-            # Update only provided fields
-            update_data = update.model_dump(exclude_unset=True)
-            for key, value in update_data.items():
-                setattr(channel, key, value)
+                # Update only provided fields
+                previous = channel.model_dump()
+                update_data = update.model_dump(exclude_unset=True)
+                for key, value in update_data.items():
+                    setattr(channel, key, value)
 
-            channels[i] = channel
-            save_channels(channels)
-            return channel
+                ensure_indexes()
+                port_registry.check(channel.model_dump(), previous=previous)
+
+                channels[i] = channel
+                save_channels(channels)
+                return channel
 
     return None
 
 
 def delete_channel(channel_name: str) -> bool:
     """Delete a channel"""
-    channels = load_channels()
-
-    for i, channel in enumerate(channels):
-        if channel.channel_name == channel_name:
-            # Stop channel if it's running
-            if channel.status == "running" and channel.pid:
-                try:
-                    os.kill(channel.pid, signal.SIGTERM)
-                except:
-                    pass
-
-            channels.pop(i)
-            save_channels(channels)
-            return True
+    with config_lock:
+        channels = load_channels()
+
+        for i, channel in enumerate(channels):
+            if channel.channel_name == channel_name:
+                # Stop channel if it's running
+                if channel.status == "running" and channel.pid:
+                    try:
+                        os.kill(channel.pid, signal.SIGTERM)
+                    except:
+                        pass
+
+                channels.pop(i)
+                save_channels(channels)
+                return True
 
     return False
 
@@ -143,10 +196,53 @@ def check_channel_status(channel: Channel) -> Channel:
 
 def sync_channel_statuses():
     """Sync all channel statuses with actual process states"""
-    channels = load_channels()
-    for channel in channels:
-        check_channel_status(channel)
-    save_channels(channels)
+    with config_lock:
+        channels = load_channels()
+        for channel in channels:
+            check_channel_status(channel)
+        save_channels(channels)
+
+
+def refresh_channel_statuses() -> List[Channel]:
+    """
+    Load channels with their status checked against the process table,
+    writing the config back only when a process went away
+    """
+    with config_lock:
+        channels = load_channels()
+        previous = [(ch.status, ch.pid) for ch in channels]
+        for channel in channels:
+            check_channel_status(channel)
+        if previous != [(ch.status, ch.pid) for ch in channels]:
+            save_channels(channels)
+        return channels
+
+
+def ensure_indexes():
+    """Build the channel catalog and port registry if config.json changed since they were"""
+    with config_lock:
+        signature = _config_signature()
+        if channel_catalog.signature is None or channel_catalog.signature != signature:
+            # Not built yet, or config.json was written elsewhere (users, a manual edit)
+            channels = [ch.model_dump() for ch in load_channels()]
+            channel_catalog.record(channels, signature)
+            port_registry.record(channels)
+            channel_journal.record(channels)
+
+
+def query_channels(**filters) -> Tuple[List[dict], int, Optional[str]]:
+    """
+    Filtered, sorted page of channels from the catalog indexes (see
+    ChannelCatalog.query), with statuses checked against the process table
+    """
+    ensure_indexes()
+    for pid in channel_catalog.pids().values():
+        try:
+            os.kill(pid, 0)
+        except OSError:
+            refresh_channel_statuses()
+            break
+    return channel_catalog.query(**filters)
 
 
 def stop_channel_process(channel: Channel) -> bool:
@@ -192,6 +288,48 @@ def get_channel_log_file(channel_name: str) -> Path:
     return LOGS_FOLDER / f"{sanitized_name}.log"
 
 
+def get_channel_log_files(channel: Channel, process_idx: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Get existing log files of a channel as [{"file": Path, "process_idx": int}]
+
+    Channels with destinations write one log per destination process.
+    """
+    sanitized_name = channel.channel_name.replace(' ', '_')
+    log_files = []
+
+    if channel.destinations:
+        indexes = [process_idx] if process_idx is not None else range(len(channel.destinations))
+        for idx in indexes:
+            log_file = LOGS_FOLDER / f"{sanitized_name}_dest{idx}.log"
+            if log_file.exists():
+                log_files.append({"file": log_file, "process_idx": idx})
+    else:
+        log_file = LOGS_FOLDER / f"{sanitized_name}.log"
+        if log_file.exists():
+            log_files.append({"file": log_file, "process_idx": 0})
+
+    return log_files
+
+
+def get_channel_stats_files(channel: Channel, process_idx: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Get existing stats CSVs of a channel as [{"file": Path, "process_idx": int}]"""
+    sanitized_name = channel.channel_name.replace(' ', '_')
+    stats_files = []
+
+    if channel.destinations:
+        indexes = [process_idx] if process_idx is not None else range(len(channel.destinations))
+        for idx in indexes:
+            stats_file = STATS_FOLDER / f"{sanitized_name}_dest{idx}.csv"
+            if stats_file.exists():
+                stats_files.append({"file": stats_file, "process_idx": idx})
+    else:
+        stats_file = STATS_FOLDER / f"{sanitized_name}.csv"
+        if stats_file.exists():
+            stats_files.append({"file": stats_file, "process_idx": 0})
+
+    return stats_files
+
+
 def get_stream_info(channel: Channel) -> dict:
     """Get stream information using ffprobe"""
     import json as json_module
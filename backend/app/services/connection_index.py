@@ -0,0 +1,200 @@
+"""
+Connection event index - incremental client session tracking from SRT logs
+
+Each channel log is tailed with FileTail, so every refresh only parses the
+bytes appended since the previous one. The index keeps the set of currently
+connected clients plus a bounded history of finished sessions.
+"""
+
+import re
+import threading
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Deque, Dict, List, Optional
+
+from .log_tail import FileTail, LineClock, session_seconds
+
+# Precompiled connection patterns shared with parse_srt_log_connections
+ADDRESS_RE = re.compile(r'(\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}):(\d+)')
+REQUEST_FROM_RE = re.compile(r'request from: (\d+\.\d+\.\d+\.\d+):(\d+)')
+SOCKET_ID_RE = re.compile(r'@(\d+)')
+DISCONNECT_RE = re.compile(r'closed|disconnected', re.IGNORECASE)
+PEER_DISCONNECT_MARKERS = ("SRT target disconnected", "SRT source disconnected")
+
+HISTORY_SIZE = 1000
+
+
+@dataclass(slots=True)
+class ClientSession:
+    """One client connection observed in the log"""
+    ip: str
+    port: int
+    connected_at: Optional[datetime]
+    disconnected_at: Optional[datetime] = None
+    socket_id: Optional[int] = None
+
+    @property
+    def key(self) -> str:
+        return f"{self.ip}:{self.port}"
+
+    def duration_seconds(self, now: Optional[datetime] = None) -> Optional[float]:
+        if not self.connected_at:
+            return None
+        end = self.disconnected_at or now or datetime.now()
+        return round(session_seconds(self.connected_at, end), 3)
+
+    def to_dict(self) -> dict:
+        return {
+            "ip": self.ip,
+            "port": self.port,
+            "socket_id": self.socket_id,
+            "connected_at": self.connected_at.isoformat() if self.connected_at else None,
+            "disconnected_at": self.disconnected_at.isoformat() if self.disconnected_at else None,
+            "duration_seconds": self.duration_seconds(),
+            "active": self.disconnected_at is None,
+        }
+
+
+def classify_connection_line(line: str) -> Optional[str]:
+    """Return "connected", "disconnected" or None for a log line"""
+    # Cheap substring guard first - most log lines are not connection events
+    lowered = line.lower()
+    if 'connect' not in lowered and 'accepted' not in lowered and 'closed' not in lowered and 'request from' not in lowered:
+        return None
+    if REQUEST_FROM_RE.search(line) or ('accepted' in lowered or ('connected' in lowered and 'disconnected' not in lowered)):
+        return "connected"
+    if DISCONNECT_RE.search(line):
+        return "disconnected"
+    return None
+
+
+class ConnectionIndex:
+    """Incrementally maintained client sessions for one log file"""
+
+    def __init__(self, log_file: Path, history_size: int = HISTORY_SIZE):
+        self.log_file = Path(log_file)
+        self._tail = FileTail(self.log_file)
+        self._clock = LineClock(path=self.log_file)
+        self._generation = 0
+        self._active: Dict[str, ClientSession] = {}
+        self._history: Deque[ClientSession] = deque(maxlen=history_size)
+        self._total_sessions = 0
+        self._lock = threading.Lock()
+
+    def refresh(self):
+        """Parse lines appended to the log since the previous refresh"""
+        with self._lock:
+            while True:
+                lines = self._tail.read_lines()
+                if self._tail.generation != self._generation:
+                    # Log was truncated/replaced - the process restarted
+                    self._generation = self._tail.generation
+                    self._close_all(datetime.now())
+                    self._clock = LineClock(path=self.log_file)
+                if not lines:
+                    break
+
+                for _, line in lines:
+                    self._ingest(line)
+
+    def _ingest(self, line: str):
+        # Every line moves the clock, so midnights between events are counted
+        self._clock.observe(line)
+        event = classify_connection_line(line)
+        if event is None:
+            return
+
+        ts = self._clock.stamp(line) or datetime.now()
+        socket_match = SOCKET_ID_RE.search(line)
+        socket_id = int(socket_match.group(1)) if socket_match else None
+
+        if event == "connected":
+            match = REQUEST_FROM_RE.search(line) or ADDRESS_RE.search(line)
+            if not match:
+                # "Accepted SRT target connection" - attach socket id to the latest session
+                if socket_id is not None and self._active:
+                    latest = next(reversed(self._active.values()))
+                    if latest.socket_id is None:
+                        latest.socket_id = socket_id
+                return
+            ip, port = match.group(1), int(match.group(2))
+            key = f"{ip}:{port}"
+            if key in self._active:
+                return
+            self._active[key] = ClientSession(ip=ip, port=port, connected_at=ts, socket_id=socket_id)
+            self._total_sessions += 1
+            return
+
+        match = ADDRESS_RE.search(line)
+        if match:
+            session = self._active.pop(f"{match.group(1)}:{int(match.group(2))}", None)
+            if session:
+                session.disconnected_at = ts
+                self._history.append(session)
+        elif any(marker in line for marker in PEER_DISCONNECT_MARKERS):
+            # srt-live-transmit does not name the peer here - close everything
+            self._close_all(ts)
+
+    def _close_all(self, ts: datetime):
+        for session in self._active.values():
+            session.disconnected_at = ts
+            self._history.append(session)
+        self._active.clear()
+
+    def active_clients(self) -> List[dict]:
+        """Currently connected clients"""
+        with self._lock:
+            return [s.to_dict() for s in self._active.values()]
+
+    def active_count(self) -> int:
+        with self._lock:
+            return len(self._active)
+
+    def history(self, limit: int = 100, since: Optional[datetime] = None, ip: Optional[str] = None) -> List[dict]:
+        """Most recent finished sessions, newest first"""
+        result = []
+        with self._lock:
+            for session in reversed(self._history):
+                if since and session.disconnected_at and session.disconnected_at < since:
+                    break
+                if ip and session.ip != ip:
+                    continue
+                result.append(session.to_dict())
+                if len(result) >= limit:
+                    break
+        return result
+
+    @property
+    def total_sessions(self) -> int:
+        return self._total_sessions
+
+    def version(self) -> tuple:
+        """Changes whenever a client connects or disconnects"""
+        with self._lock:
+            return self._generation, self._total_sessions, len(self._active)
+
+
+# Global index registry keyed by log file path
+_indexes: Dict[str, ConnectionIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_connection_index(log_file: Path, refresh: bool = True) -> ConnectionIndex:
+    """Get (and by default refresh) the connection index for a log file"""
+    key = str(log_file)
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = ConnectionIndex(log_file)
+            _indexes[key] = index
+    if refresh:
+        index.refresh()
+    return index
+
+
+def drop_connection_index(log_file: Path):
+    """Forget the index of a log file (e.g. when its channel is deleted)"""
+    with _indexes_lock:
+        _indexes.pop(str(log_file), None)
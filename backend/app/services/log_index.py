@@ -0,0 +1,267 @@
+"""
+Log index - sparse time/level index over channel log files
+
+Lines are classified once when they are appended and grouped into blocks
+of consecutive lines. Each block remembers its byte range, time span (from
+the real timestamps of its first and last line) and a bitmap of the levels
+it contains, so searches only seek into blocks that can match.
+"""
+
+import bisect
+import re
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .log_tail import FileTail, LineClock
+
+# Level bits (match the LogsTab filter levels)
+LEVEL_ERROR = 1
+LEVEL_WARNING = 2
+LEVEL_INFO = 4
+LEVEL_CONNECTION = 8
+LEVEL_ALL = LEVEL_ERROR | LEVEL_WARNING | LEVEL_INFO | LEVEL_CONNECTION
+
+LEVEL_BITS = {
+    "error": LEVEL_ERROR,
+    "warning": LEVEL_WARNING,
+    "info": LEVEL_INFO,
+    "connection": LEVEL_CONNECTION,
+}
+LEVEL_NAMES = {bit: name for name, bit in LEVEL_BITS.items()}
+
+# libsrt prefixes messages with "*<level>:" (D/N/W/E/F)
+_SRT_LEVEL_RE = re.compile(r'\*([DNWEF]):')
+
+BLOCK_MAX_LINES = 256
+BLOCK_MAX_BYTES = 64 * 1024
+
+
+def classify_log_level(line: str) -> int:
+    """Return the level bit of a log line"""
+    srt_level = _SRT_LEVEL_RE.search(line)
+    if srt_level and srt_level.group(1) in "EF":
+        return LEVEL_ERROR
+    lowered = line.lower()
+    if 'error' in lowered or 'fail' in lowered or 'fatal' in lowered:
+        return LEVEL_ERROR
+    if (srt_level and srt_level.group(1) == "W") or 'warn' in lowered or 'deprecated' in lowered:
+        return LEVEL_WARNING
+    if 'connect' in lowered or 'closed' in lowered:
+        return LEVEL_CONNECTION
+    return LEVEL_INFO
+
+
+def parse_levels(levels: Optional[str]) -> int:
+    """Parse a comma-separated level list ("error,warning") into a bitmap"""
+    if not levels or levels == "all":
+        return LEVEL_ALL
+    mask = 0
+    for name in levels.split(','):
+        bit = LEVEL_BITS.get(name.strip().lower())
+        if bit is None:
+            raise ValueError(f"Unknown log level: {name}")
+        mask |= bit
+    return mask
+
+
+@dataclass(slots=True)
+class LogBlock:
+    """A run of consecutive lines in the log file"""
+    start: int
+    end: int
+    first_ts: Optional[datetime]
+    last_ts: Optional[datetime]
+    levels: int = 0
+    lines: int = 0
+
+
+class LogIndex:
+    """Incrementally maintained sparse index over one log file"""
+
+    def __init__(self, log_file: Path):
+        self.log_file = Path(log_file)
+        self._tail = FileTail(self.log_file)
+        self._clock = LineClock(path=self.log_file)
+        self._generation = 0
+        self._blocks: List[LogBlock] = []
+        self._block_ends: List[datetime] = []  # last_ts of every block, kept sorted for bisect
+        self._last_ts: Optional[datetime] = None
+        self._pending_line: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def refresh(self):
+        """Index lines appended since the previous refresh"""
+        with self._lock:
+            while True:
+                lines = self._tail.read_lines()
+                if self._tail.generation != self._generation:
+                    self._generation = self._tail.generation
+                    self._blocks = []
+                    self._block_ends = []
+                    self._clock = LineClock(path=self.log_file)
+                    self._last_ts = None
+                    self._pending_line = None
+                if not lines:
+                    break
+
+                for i, (offset, line) in enumerate(lines):
+                    end = lines[i + 1][0] if i + 1 < len(lines) else self._tail.offset
+                    self._ingest(offset, end, line)
+                self._stamp_pending()
+
+    def _stamp_pending(self):
+        """Timestamp the latest line of the open block (only block edges are parsed)"""
+        if self._pending_line is None:
+            return
+        ts = self._clock.stamp(self._pending_line)
+        self._pending_line = None
+        if ts is not None:
+            self._last_ts = ts
+            block = self._blocks[-1]
+            block.last_ts = ts
+            if block.first_ts is None:
+                block.first_ts = ts
+            self._block_ends[-1] = self._sorted_end(ts, len(self._blocks) - 1)
+
+    def _sorted_end(self, ts: Optional[datetime], index: int) -> datetime:
+        """
+        Bisect key of block `index`: its last timestamp, but never before the
+        previous block's (no timestamp yet, or the clock stepped back), so
+        _block_ends stays sorted
+        """
+        previous = self._block_ends[index - 1] if index > 0 else datetime.min
+        return max(ts, previous) if ts is not None else previous
+
+    def _ingest(self, offset: int, end: int, line: str):
+        block = self._blocks[-1] if self._blocks else None
+        if block is None or block.lines >= BLOCK_MAX_LINES or block.end - block.start >= BLOCK_MAX_BYTES:
+            self._stamp_pending()
+            ts = self._clock.stamp(line) or self._last_ts
+            self._last_ts = ts
+            block = LogBlock(start=offset, end=offset, first_ts=ts, last_ts=ts)
+            self._block_ends.append(self._sorted_end(ts, len(self._blocks)))
+            self._blocks.append(block)
+        else:
+            # Only block edges get a datetime, but the clock sees every line -
+            # a quiet log can cross midnight (or several) inside one block
+            self._clock.observe(line)
+            self._pending_line = line
+
+        block.end = end
+        block.levels |= classify_log_level(line)
+        block.lines += 1
+
+    def _candidate_blocks(self, start: Optional[datetime], end: Optional[datetime], level_mask: int) -> List[LogBlock]:
+        blocks = self._blocks
+        lo = 0
+        if start is not None:
+            # Blocks are appended in time order - skip everything that ended before `start`
+            lo = bisect.bisect_left(self._block_ends, start)
+        result = []
+        for block in blocks[lo:]:
+            if end is not None and block.first_ts is not None and block.first_ts > end:
+                break
+            if block.levels & level_mask:
+                result.append(block)
+        return result
+
+    def _read_block(self, f, block: LogBlock) -> List[Tuple[Optional[datetime], int, str]]:
+        f.seek(block.start)
+        data = f.read(block.end - block.start)
+        anchor = block.first_ts.date() if block.first_ts else None
+        clock = LineClock(anchor)
+        if block.first_ts:
+            clock.resume(block.first_ts)
+        last_ts = block.first_ts
+        entries = []
+        for raw in data.split(b'\n'):
+            if not raw.strip():
+                continue
+            line = raw.rstrip(b'\r').decode('utf-8', errors='replace')
+            ts = clock.stamp(line) or last_ts
+            last_ts = ts
+            entries.append((ts, classify_log_level(line), line))
+        return entries
+
+    def search(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        level_mask: int = LEVEL_ALL,
+        query: Optional[str] = None,
+        limit: int = 500,
+    ) -> Tuple[List[dict], int]:
+        """
+        Return up to `limit` most recent matching lines (oldest first) and the
+        number of blocks that had to be read.
+        """
+        needle = query.lower() if query else None
+
+        with self._lock:
+            blocks = self._candidate_blocks(start, end, level_mask)
+
+        if not blocks:
+            return [], 0
+
+        chunks: List[List[dict]] = []
+        found = 0
+        scanned = 0
+        with open(self.log_file, 'rb') as f:
+            for block in reversed(blocks):
+                scanned += 1
+                block_matches = []
+                for ts, level, line in self._read_block(f, block):
+                    if not level & level_mask:
+                        continue
+                    if start is not None and ts is not None and ts < start:
+                        continue
+                    if end is not None and ts is not None and ts > end:
+                        continue
+                    if needle and needle not in line.lower():
+                        continue
+                    block_matches.append({
+                        "text": line.strip(),
+                        "timestamp": ts.isoformat() if ts else None,
+                        "level": LEVEL_NAMES[level],
+                    })
+                chunks.append(block_matches)
+                found += len(block_matches)
+                if found >= limit:
+                    break
+
+        matches = [entry for chunk in reversed(chunks) for entry in chunk]
+        return matches[-limit:], scanned
+
+    def tail(self, lines: int = 100) -> List[dict]:
+        """Last `lines` lines of the log with their parsed timestamps"""
+        return self.search(limit=lines)[0]
+
+    @property
+    def block_count(self) -> int:
+        return len(self._blocks)
+
+
+# Global index registry keyed by log file path
+_indexes: Dict[str, LogIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_log_index(log_file: Path) -> LogIndex:
+    """Get the log index for a log file, indexing newly appended lines"""
+    key = str(log_file)
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = LogIndex(log_file)
+            _indexes[key] = index
+    index.refresh()
+    return index
+
+
+def drop_log_index(log_file: Path):
+    """Forget the index of a log file (e.g. when its channel is deleted)"""
+    with _indexes_lock:
+        _indexes.pop(str(log_file), None)
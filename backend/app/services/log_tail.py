@@ -0,0 +1,225 @@
+"""Incremental readers for files written by srt-live-transmit (logs, stats CSV)"""
+
+import os
+import re
+from datetime import datetime, date, timedelta
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+# Upper bound for a single read so a huge backlog never blocks for long
+DEFAULT_MAX_READ = 4 * 1024 * 1024
+
+# Timestamp formats seen in SRT logs and stats files
+_FULL_TS_RE = re.compile(r'(\d{4}-\d{2}-\d{2})[T ](\d{2}):(\d{2}):(\d{2})(?:\.(\d{1,6}))?')
+_TIME_TS_RE = re.compile(r'(?<![\d.])(\d{2}):(\d{2}):(\d{2})\.(\d{1,6})')
+
+
+class FileTail:
+    """
+    Reads only the complete lines appended to a file since the previous call.
+
+    The byte offset of every returned line is reported so callers can build
+    seekable indexes. Truncation or replacement of the file (log rotation,
+    channel restart with a fresh file) restarts reading from the beginning
+    and bumps `generation` so callers can drop derived state.
+    """
+
+    def __init__(self, path: Path, max_read: int = DEFAULT_MAX_READ):
+        self.path = Path(path)
+        self.max_read = max_read
+        self.offset = 0
+        self.generation = 0
+        # Total bytes read from the file, for I/O accounting
+        self.bytes_read = 0
+        self._inode: Optional[int] = None
+
+    def seek_end(self):
+        """Skip the existing content - only lines appended from now on are read"""
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return
+        self.offset = st.st_size
+        self._inode = st.st_ino
+
+    def read_lines(self) -> List[Tuple[int, str]]:
+        """Return (byte_offset, line) pairs for complete lines appended since the last call"""
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return []
+
+        if self._inode is not None and (st.st_ino != self._inode or st.st_size < self.offset):
+            self.offset = 0
+            self.generation += 1
+        self._inode = st.st_ino
+
+        if st.st_size <= self.offset:
+            return []
+
+        with open(self.path, 'rb') as f:
+            f.seek(self.offset)
+            data = f.read(min(st.st_size - self.offset, self.max_read))
+        self.bytes_read += len(data)
+
+        end = data.rfind(b'\n')
+        if end < 0:
+            if len(data) < self.max_read:
+                # Last line is still being written
+                return []
+            # Pathological line longer than max_read - skip it
+            self.offset += len(data)
+            return []
+
+        lines = []
+        pos = 0
+        base = self.offset
+        chunk = data[:end + 1]
+        while pos <= end:
+            nl = chunk.index(b'\n', pos)
+            lines.append((base + pos, chunk[pos:nl].rstrip(b'\r').decode('utf-8', errors='replace')))
+            pos = nl + 1
+
+        self.offset = base + end + 1
+        return lines
+
+
+def parse_line_time(line: str, reference: Optional[date] = None) -> Optional[datetime]:
+    """
+    Parse the timestamp of a log line into a datetime.
+
+    srt-live-transmit log lines only carry the time of day (HH:MM:SS.ffffff),
+    so those are anchored to `reference` (defaults to today).
+    """
+    match = _FULL_TS_RE.search(line)
+    if match:
+        day, hh, mm, ss, frac = match.groups()
+        try:
+            base = datetime.strptime(day, '%Y-%m-%d')
+        except ValueError:
+            return None
+        micro = int((frac or '0').ljust(6, '0'))
+        return base.replace(hour=int(hh), minute=int(mm), second=int(ss), microsecond=micro)
+
+    match = _TIME_TS_RE.search(line)
+    if match:
+        hh, mm, ss, frac = match.groups()
+        if int(hh) > 23 or int(mm) > 59 or int(ss) > 59:
+            return None
+        anchor = reference or date.today()
+        return datetime(anchor.year, anchor.month, anchor.day,
+                        int(hh), int(mm), int(ss), int(frac.ljust(6, '0')))
+
+    return None
+
+
+def _time_of_day(line: str) -> Optional[str]:
+    """'HH:MM:SS' of the time stamp of a line, None when it has no valid one"""
+    if line[2:3] == ":" and line[5:6] == ":":
+        # srt-live-transmit starts every line with it
+        tod = line[:8]
+    else:
+        match = _TIME_TS_RE.search(line)
+        if not match:
+            return None
+        tod = match.group(0)[:8]
+    if not ("00:00:00" <= tod <= "23:59:59") or tod[3] > "5" or tod[6] > "5":
+        return None
+    return tod
+
+
+def _seconds(tod: str) -> int:
+    return int(tod[:2]) * 3600 + int(tod[3:5]) * 60 + int(tod[6:8])
+
+
+def _crossed_midnight(previous: Optional[str], tod: str) -> bool:
+    # A backwards jump of more than an hour; "HH:MM:SS" strings order like
+    # times, so the arithmetic only runs when the clock went back at all
+    return previous is not None and tod < previous and _seconds(tod) < _seconds(previous) - 3600
+
+
+def file_anchor(path: Path) -> date:
+    """
+    Day of the first line of a log, counted back from its mtime.
+
+    The last stamped line was written on the day of the mtime (the day
+    before when its time of day is later than the mtime), and every midnight
+    the log crossed before it moves the first line back one more day. Logs
+    are appended to across restarts, so "today" is only right for a file
+    started today.
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return date.today()
+    mtime = datetime.fromtimestamp(st.st_mtime)
+
+    wraps = 0
+    previous: Optional[str] = None
+    read = 0
+    try:
+        with open(path, 'rb') as f:
+            for raw in f:
+                read += len(raw)
+                if read > st.st_size:
+                    break
+                # Decoding only the stamp is enough for srt-live-transmit lines
+                text = raw[:8] if raw[2:3] == b":" and raw[5:6] == b":" else raw
+                tod = _time_of_day(text.decode('utf-8', errors='replace'))
+                if tod is None:
+                    continue
+                if _crossed_midnight(previous, tod):
+                    wraps += 1
+                previous = tod
+    except OSError:
+        return date.today()
+
+    if previous is not None and previous > mtime.strftime('%H:%M:%S'):
+        wraps += 1
+    return mtime.date() - timedelta(days=wraps)
+
+
+class LineClock:
+    """
+    Assigns datetimes to consecutive log lines of one file.
+
+    Time-only stamps are anchored to `anchor`, or for a `path` to the day
+    file_anchor() finds once the first line is seen. Every line has to be
+    passed to observe() (or stamp()): when the time of day jumps backwards
+    by more than an hour the log has crossed midnight and the anchor
+    advances.
+    """
+
+    def __init__(self, anchor: Optional[date] = None, path: Optional[Path] = None):
+        self.anchor = anchor
+        self.path = path
+        self.tod: Optional[str] = None
+
+    def resume(self, ts: datetime):
+        """Continue from a line already stamped as `ts`"""
+        self.anchor = ts.date()
+        self.tod = ts.strftime('%H:%M:%S')
+
+    def observe(self, line: str):
+        """Track midnight crossings from the time of day of `line` (cheaper than stamp())"""
+        if self.anchor is None:
+            self.anchor = file_anchor(self.path) if self.path else date.today()
+        tod = _time_of_day(line)
+        if tod is None:
+            return
+        if _crossed_midnight(self.tod, tod):
+            self.anchor += timedelta(days=1)
+        self.tod = tod
+
+    def stamp(self, line: str) -> Optional[datetime]:
+        """Return the datetime of `line`, or None when it carries no timestamp"""
+        self.observe(line)
+        return parse_line_time(line, self.anchor)
+
+
+def session_seconds(start: datetime, end: datetime) -> float:
+    """Seconds between two log times, tolerating a midnight wrap of time-only stamps"""
+    delta = (end - start).total_seconds()
+    if delta < 0 and start.date() == end.date():
+        delta += timedelta(days=1).total_seconds()
+    return max(delta, 0.0)
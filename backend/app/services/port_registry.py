@@ -0,0 +1,237 @@
+"""
+Port registry - which channel uses which (protocol, address, port)
+
+Every saved channel list is diffed against the previous one and the ports
+of changed channels are re-registered. A port is claimed either as a bind
+(SRT listener/rendezvous, UDP input, tap port) or as a send target (UDP
+output). SRT runs over UDP, so binds of both protocols share one port
+space: two binds on the same port conflict when their addresses overlap
+(0.0.0.0 overlaps every address; multicast groups are shared). Two channels
+sending UDP to the same address and port conflict too. SRT callers connect
+out from ephemeral ports and claim nothing. Claims are bucketed by port, so
+checking a channel costs a dict lookup per port it uses, independent of the
+fleet size.
+"""
+
+import os
+import threading
+from ipaddress import ip_address
+from typing import Dict, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+WILDCARD = "0.0.0.0"
+
+
+def _parse_pool(value: str) -> List[Tuple[int, int]]:
+    """'9000-9099,9500' -> [(9000, 9099), (9500, 9500)]"""
+    ranges = []
+    for part in value.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        low, _, high = part.partition("-")
+        ranges.append((int(low), int(high or low)))
+    return ranges
+
+
+# Port pools free ports are proposed from ("start-end[,start-end...]")
+PORT_POOLS = {
+    "input": _parse_pool(os.getenv("PORT_POOL_INPUT", "9000-9099")),
+    "output": _parse_pool(os.getenv("PORT_POOL_OUTPUT", "9100-9999")),
+    "tap": _parse_pool(os.getenv("PORT_POOL_TAP", "40000-40999")),
+}
+
+
+class Claim(NamedTuple):
+    kind: str  # "bind" or "send"
+    protocol: str
+    address: str
+    port: int
+    role: str  # input, output, destination N, tap
+
+
+class PortConflictError(ValueError):
+    """A channel claims ports another channel already uses"""
+
+    def __init__(self, conflicts: List[dict]):
+        self.conflicts = conflicts
+        described = ", ".join(f"{c['protocol']} {c['address']}:{c['port']} ({c['role']}) is used by "
+                              f"{c['channel']} ({c['other_role']})" for c in conflicts)
+        super().__init__(f"Port conflict: {described}")
+
+
+def _port(value) -> Optional[int]:
+    try:
+        port = int(value)
+    except (TypeError, ValueError):
+        return None
+    return port if 0 < port <= 65535 else None
+
+
+def _is_multicast(address: str) -> bool:
+    try:
+        return ip_address(address).is_multicast
+    except ValueError:
+        return False
+
+
+def _endpoint(protocol: str, mode: str, host: str, port, role: str, multicast: str = "") -> Optional[Claim]:
+    """Claim of one output/destination, as srt-live-transmit would open it"""
+    port = _port(port)
+    if port is None:
+        return None
+    if protocol == "udp":
+        if multicast or host:
+            return Claim("send", "udp", multicast or host, port, role)
+        return Claim("bind", "udp", WILDCARD, port, role)
+    if mode == "caller":
+        # Connects out from an ephemeral port
+        return None
+    # listener binds the port; rendezvous binds it locally too
+    return Claim("bind", "srt", WILDCARD, port, role)
+
+
+def channel_claims(ch: dict) -> List[Claim]:
+    """Ports a channel (model_dump()) binds or sends to"""
+    claims = []
+    input_port = _port(ch.get("input_port"))
+    if input_port is not None and (ch.get("input_protocol") == "udp" or ch.get("input_mode") != "caller"):
+        claims.append(Claim("bind", ch.get("input_protocol") or "srt", ch.get("input_ip") or WILDCARD,
+                            input_port, "input"))
+    if ch.get("destinations"):
+        # Every destination process opens the channel input plus its own output
+        for idx, dest in enumerate(ch["destinations"]):
+            claims.append(_endpoint(dest.get("protocol", "srt"), dest.get("mode", "caller"), dest.get("host", ""),
+                                    dest.get("port"), f"destination {idx}", dest.get("multicast_ip", "")))
+    else:
+        claims.append(_endpoint(ch.get("output_protocol") or "srt", ch.get("mode") or "listener",
+                                ch.get("destination_host") or "", ch.get("output_port"), "output",
+                                ch.get("output_multicast_ip") or ""))
+    tap_port = _port(ch.get("tap_port"))
+    if tap_port is not None:
+        claims.append(Claim("bind", "udp", "127.0.0.1", tap_port, "tap"))
+    return [claim for claim in claims if claim is not None]
+
+
+def _overlaps(a: Claim, b: Claim) -> bool:
+    if a.kind == "send":
+        return a.address == b.address
+    if _is_multicast(a.address) and _is_multicast(b.address):
+        # Receivers of a multicast group share the port
+        return False
+    return a.address == b.address or WILDCARD in (a.address, b.address)
+
+
+class PortRegistry:
+    """Claims of every channel, bucketed by (kind, port)"""
+
+    def __init__(self, pools: Dict[str, List[Tuple[int, int]]] = PORT_POOLS):
+        self.pools = pools
+        self._channels: Dict[str, dict] = {}
+        self._claims: Dict[str, List[Claim]] = {}
+        self._by_port: Dict[Tuple[str, int], Dict[str, List[Claim]]] = {}
+        self._running: Set[str] = set()
+        self._lock = threading.Lock()
+
+    def record(self, channels: List[dict]):
+        """Re-register the ports of the channels of a saved list that changed"""
+        with self._lock:
+            current = {ch["channel_name"]: ch for ch in channels}
+            for name in [name for name in self._channels if name not in current]:
+                self._unregister(name)
+            for name, ch in current.items():
+                if self._channels.get(name) == ch:
+                    continue
+                if name in self._channels:
+                    self._unregister(name)
+                self._register(name, ch)
+
+    def _register(self, name: str, ch: dict):
+        self._channels[name] = ch
+        claims = list(dict.fromkeys(channel_claims(ch)))
+        self._claims[name] = claims
+        for claim in claims:
+            self._by_port.setdefault((claim.kind, claim.port), {}).setdefault(name, []).append(claim)
+        if ch.get("status") == "running":
+            self._running.add(name)
+
+    def _unregister(self, name: str):
+        del self._channels[name]
+        for claim in self._claims.pop(name):
+            owners = self._by_port.get((claim.kind, claim.port))
+            if owners is not None and owners.pop(name, None) is not None and not owners:
+                del self._by_port[(claim.kind, claim.port)]
+        self._running.discard(name)
+
+    def _conflicts(self, name: str, claims: List[Claim], running_only: bool) -> Iterator[dict]:
+        for claim in claims:
+            for owner, theirs in self._by_port.get((claim.kind, claim.port), {}).items():
+                if owner == name or (running_only and owner not in self._running):
+                    continue
+                for other in theirs:
+                    if _overlaps(claim, other):
+                        yield {
+                            "protocol": claim.protocol, "address": claim.address, "port": claim.port,
+                            "role": claim.role, "channel": owner, "other_role": other.role,
+                            "other_address": other.address, "running": owner in self._running,
+                        }
+
+    def check(self, ch: dict, running_only: bool = False, previous: Optional[dict] = None):
+        """
+        Raise PortConflictError when a channel (model_dump()) claims a port
+        another channel uses (only running ones with `running_only`).
+        Claims `previous` already had are not checked again, so editing
+        other settings of a channel with an existing conflict still works.
+        """
+        claims = channel_claims(ch)
+        if previous is not None:
+            kept = set(channel_claims(previous))
+            claims = [claim for claim in claims if claim not in kept]
+        with self._lock:
+            conflicts = list(self._conflicts(ch["channel_name"], claims, running_only))
+        if conflicts:
+            raise PortConflictError(conflicts)
+
+    def conflicts(self) -> List[dict]:
+        """Every port more than one channel claims with overlapping addresses"""
+        report = []
+        with self._lock:
+            for (kind, port), owners in sorted(self._by_port.items(), key=lambda item: (item[0][1], item[0][0])):
+                if len(owners) < 2:
+                    continue
+                claims = [(owner, claim) for owner, theirs in owners.items() for claim in theirs]
+                involved = {}
+                for i, (owner, claim) in enumerate(claims):
+                    for other_owner, other in claims[i + 1:]:
+                        if other_owner != owner and _overlaps(claim, other):
+                            involved[(owner, claim)] = None
+                            involved[(other_owner, other)] = None
+                if involved:
+                    report.append({
+                        "kind": kind,
+                        "port": port,
+                        "running": sum(1 for owner in {o for o, _ in involved} if owner in self._running),
+                        "claims": [{"channel": owner, "role": claim.role, "protocol": claim.protocol,
+                                    "address": claim.address, "running": owner in self._running}
+                                   for owner, claim in involved],
+                    })
+        return report
+
+    def free_ports(self, pool: str, count: int = 1, exclude: Optional[Set[int]] = None) -> List[int]:
+        """The first `count` ports of a pool no channel binds or sends to"""
+        if pool not in self.pools:
+            raise ValueError(f"Unknown port pool '{pool}' (pools: {', '.join(self.pools)})")
+        exclude = exclude or set()
+        found = []
+        with self._lock:
+            for low, high in self.pools[pool]:
+                for port in range(low, high + 1):
+                    if (("bind", port) not in self._by_port and ("send", port) not in self._by_port
+                            and port not in exclude):
+                        found.append(port)
+                        if len(found) == count:
+                            return found
+        return found
+
+
+# Global registry instance
+port_registry = PortRegistry()
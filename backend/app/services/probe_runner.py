@@ -0,0 +1,159 @@
+"""
+Async ffprobe runner - native asyncio subprocess execution
+
+Probes run as their own process group so a timeout or cancellation can kill
+ffprobe together with anything it spawned, without occupying a thread of the
+default executor while waiting.
+"""
+
+import asyncio
+import json
+import os
+import signal
+import time
+from dataclasses import dataclass
+from typing import List, Optional
+
+import psutil
+
+# ffprobe JSON for a handful of streams is a few KB - anything larger is a runaway
+PROBE_MAX_OUTPUT = 4 * 1024 * 1024
+_READ_CHUNK = 64 * 1024
+# How often a running probe's CPU/RSS is sampled
+_USAGE_SAMPLE_INTERVAL = 0.25
+
+
+@dataclass(slots=True)
+class ProbeResult:
+    """Outcome and resource usage of one probe process"""
+    returncode: Optional[int] = None
+    data: Optional[dict] = None
+    timed_out: bool = False
+    error: Optional[str] = None
+    wall_s: float = 0.0
+    cpu_user_s: Optional[float] = None
+    cpu_system_s: Optional[float] = None
+    max_rss_kb: Optional[int] = None
+    stdout_bytes: int = 0
+
+    @property
+    def ok(self) -> bool:
+        return self.returncode == 0 and self.data is not None
+
+    def resources(self) -> dict:
+        cpu = None
+        if self.cpu_user_s is not None and self.cpu_system_s is not None:
+            cpu = round(self.cpu_user_s + self.cpu_system_s, 3)
+        return {
+            "wall_s": round(self.wall_s, 3),
+            "cpu_s": cpu,
+            "max_rss_kb": self.max_rss_kb,
+            "stdout_bytes": self.stdout_bytes,
+        }
+
+
+def _sample_usage(pid: int, result: ProbeResult):
+    """Record CPU time and peak RSS of a running (or zombie) process"""
+    try:
+        times = psutil.Process(pid).cpu_times()
+        result.cpu_user_s = times.user
+        result.cpu_system_s = times.system
+    except (psutil.Error, OSError):
+        pass
+    try:
+        with open(f"/proc/{pid}/status", "r") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    result.max_rss_kb = int(line.split()[1])
+                    break
+    except (OSError, ValueError, IndexError):
+        pass
+
+
+async def _monitor_usage(pid: int, result: ProbeResult):
+    # The process is reaped by asyncio as soon as it exits, so keep the
+    # latest sample taken while it was still alive
+    while True:
+        await asyncio.sleep(_USAGE_SAMPLE_INTERVAL)
+        _sample_usage(pid, result)
+
+
+def _kill_group(proc: asyncio.subprocess.Process):
+    """Kill the probe's whole process group"""
+    try:
+        os.killpg(proc.pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        try:
+            proc.kill()
+        except ProcessLookupError:
+            pass
+
+
+async def _read_stdout(proc: asyncio.subprocess.Process, result: ProbeResult) -> bytes:
+    chunks = []
+    while True:
+        chunk = await proc.stdout.read(_READ_CHUNK)
+        if not chunk:
+            break
+        result.stdout_bytes += len(chunk)
+        if result.stdout_bytes > PROBE_MAX_OUTPUT:
+            raise ValueError("Probe output too large")
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+async def run_probe(cmd: List[str], timeout: float) -> ProbeResult:
+    """
+    Run a probe command and parse its JSON stdout.
+
+    Never raises for probe failures - they are reported in the result.
+    Cancellation kills the process group and is re-raised.
+    """
+    result = ProbeResult()
+    started = time.monotonic()
+
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+            start_new_session=True
+        )
+    except OSError as e:
+        result.error = str(e)
+        result.wall_s = time.monotonic() - started
+        return result
+
+    monitor = asyncio.create_task(_monitor_usage(proc.pid, result))
+    try:
+        output = await asyncio.wait_for(_read_stdout(proc, result), timeout=timeout)
+        # stdout is closed - ffprobe is exiting; sample usage before it is reaped
+        _sample_usage(proc.pid, result)
+        remaining = max(timeout - (time.monotonic() - started), 0.1)
+        result.returncode = await asyncio.wait_for(proc.wait(), timeout=remaining)
+        if result.returncode == 0:
+            result.data = json.loads(output) if output.strip() else None
+            if result.data is None:
+                result.error = "Empty probe output"
+        else:
+            result.error = "Probe failed"
+    except asyncio.TimeoutError:
+        result.timed_out = True
+        result.error = "Analysis timeout"
+        _sample_usage(proc.pid, result)
+        _kill_group(proc)
+        await proc.wait()
+    except asyncio.CancelledError:
+        _kill_group(proc)
+        await asyncio.shield(proc.wait())
+        raise
+    except (ValueError, json.JSONDecodeError) as e:
+        result.error = str(e)
+        _kill_group(proc)
+        await proc.wait()
+    finally:
+        monitor.cancel()
+        result.wall_s = time.monotonic() - started
+
+    return result
@@ -0,0 +1,135 @@
+"""
+Adaptive probe scheduling for the stream analyzer
+
+Each channel gets its own probe interval. While the media fingerprint
+(codecs, resolution, frame rate, audio layout) and the SRT receive rate stay
+stable the interval grows up to a ceiling; a rate jump or a channel restart
+makes the channel due immediately, and failing probes back off exponentially.
+"""
+
+import os
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+# Longest interval between probes of a stable channel
+PROBE_INTERVAL_MAX = float(os.getenv("PROBE_INTERVAL_MAX", "300"))
+# Longest interval between probes of a failing channel
+PROBE_BACKOFF_MAX = float(os.getenv("PROBE_BACKOFF_MAX", "600"))
+# Relative mbpsRecvRate change that triggers an immediate probe
+PROBE_RATE_CHANGE = float(os.getenv("PROBE_RATE_CHANGE", "0.25"))
+# Rate changes below this (Mbps) are noise
+PROBE_RATE_MIN_DELTA = 0.5
+# Interval multiplier per unchanged probe
+PROBE_INTERVAL_GROWTH = 2.0
+
+
+def media_fingerprint(info: dict) -> Optional[Tuple]:
+    """Identity of a stream layout - bitrates are deliberately left out"""
+    if not info.get("success"):
+        return None
+    video = tuple(
+        (v.get("codec"), v.get("width"), v.get("height"), round(v.get("fps") or 0))
+        for v in info.get("video_streams", [])
+    )
+    audio = tuple(
+        (a.get("codec"), a.get("sample_rate"), a.get("channels"))
+        for a in info.get("audio_streams", [])
+    )
+    return video, audio
+
+
+@dataclass(slots=True)
+class ChannelSchedule:
+    """Probe schedule state of one channel"""
+    interval: float
+    next_due: float = 0.0
+    fingerprint: Optional[Tuple] = None
+    reference_rate: Optional[float] = None
+    run_key: Optional[Tuple] = None
+    failures: int = 0
+    probes: int = 0
+    last_reason: str = "new"
+
+    def to_dict(self, now: float) -> dict:
+        return {
+            "interval_s": round(self.interval, 1),
+            "next_probe_in_s": round(max(self.next_due - now, 0), 1),
+            "failures": self.failures,
+            "probes": self.probes,
+            "reference_rate_mbps": self.reference_rate,
+            "last_reason": self.last_reason,
+        }
+
+
+class ProbeScheduler:
+    """Decides which channels need an ffprobe run in the current cycle"""
+
+    def __init__(self, base_interval: float = 10):
+        self.base_interval = base_interval
+        self._schedules: Dict[str, ChannelSchedule] = {}
+
+    def _rate_changed(self, schedule: ChannelSchedule, rate: Optional[float]) -> bool:
+        if rate is None or schedule.reference_rate is None:
+            return False
+        delta = abs(rate - schedule.reference_rate)
+        return delta >= PROBE_RATE_MIN_DELTA and delta >= schedule.reference_rate * PROBE_RATE_CHANGE
+
+    def due(self, channel: dict, rate: Optional[float] = None, now: Optional[float] = None) -> Optional[str]:
+        """Return why the channel should be probed now, or None to skip it"""
+        now = time.monotonic() if now is None else now
+        name = channel["channel_name"]
+        run_key = (channel.get("pid"), channel.get("start_date"))
+        schedule = self._schedules.get(name)
+
+        if schedule is None:
+            schedule = ChannelSchedule(interval=self.base_interval, run_key=run_key)
+            self._schedules[name] = schedule
+            return "new"
+        if schedule.run_key != run_key:
+            # Process restarted - whatever we knew about the stream is stale
+            schedule.run_key = run_key
+            schedule.interval = self.base_interval
+            schedule.failures = 0
+            schedule.fingerprint = None
+            return "restart"
+        if now >= schedule.next_due:
+            return "scheduled"
+        # A failing channel waits out its backoff whatever its receive rate does
+        if schedule.failures == 0 and self._rate_changed(schedule, rate):
+            return "rate_change"
+        return None
+
+    def record(self, channel_name: str, info: dict, rate: Optional[float] = None,
+               reason: str = "scheduled", now: Optional[float] = None):
+        """Update a channel's schedule with the outcome of a probe"""
+        now = time.monotonic() if now is None else now
+        schedule = self._schedules.setdefault(channel_name, ChannelSchedule(interval=self.base_interval))
+        schedule.probes += 1
+        schedule.last_reason = reason
+        if rate is not None:
+            schedule.reference_rate = rate
+
+        fingerprint = media_fingerprint(info)
+        if fingerprint is None:
+            schedule.failures += 1
+            schedule.fingerprint = None
+            schedule.interval = min(self.base_interval * 2 ** schedule.failures, PROBE_BACKOFF_MAX)
+        elif fingerprint == schedule.fingerprint and reason == "scheduled":
+            schedule.failures = 0
+            schedule.interval = min(schedule.interval * PROBE_INTERVAL_GROWTH, PROBE_INTERVAL_MAX)
+        else:
+            schedule.failures = 0
+            schedule.fingerprint = fingerprint
+            schedule.interval = self.base_interval
+        schedule.next_due = now + schedule.interval
+
+    def forget(self, keep: set):
+        """Drop schedules of channels that are no longer running"""
+        for name in list(self._schedules.keys()):
+            if name not in keep:
+                del self._schedules[name]
+
+    def snapshot(self) -> Dict[str, dict]:
+        now = time.monotonic()
+        return {name: s.to_dict(now) for name, s in self._schedules.items()}
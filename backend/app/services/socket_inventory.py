@@ -0,0 +1,148 @@
+"""
+Socket inventory - UDP sockets of srt-live-transmit processes from /proc
+
+Replaces forking ss/lsof: /proc/net/udp and /proc/net/udp6 list every UDP
+socket with its inode, and /proc/<pid>/fd links those inodes to processes.
+One snapshot covers all channels and is shared by every request for
+SOCKET_INVENTORY_INTERVAL seconds.
+"""
+
+import os
+import socket
+import struct
+from typing import Dict, List, Optional, Set
+
+from ..core.singleflight import single_flight
+
+SOCKET_INVENTORY_INTERVAL = float(os.getenv("SOCKET_INVENTORY_INTERVAL", "5"))
+
+PROC = "/proc"
+# /proc/<pid>/comm is truncated to 15 characters
+SRT_PROCESS_NAME = "srt-live-transmit"[:15]
+
+# Kernel socket states used by UDP
+_STATES = {"01": "ESTAB", "07": "UNCONN"}
+
+
+def _decode_address(hex_address: str) -> str:
+    """Decode a /proc/net/udp{,6} "ADDR:PORT" field"""
+    addr, port = hex_address.split(":")
+    port = int(port, 16)
+    if len(addr) == 8:
+        ip = socket.inet_ntop(socket.AF_INET, struct.pack("<I", int(addr, 16)))
+        return f"{ip}:{port}"
+    # IPv6: four 32-bit words, each in host (little-endian) order
+    raw = b"".join(struct.pack("<I", int(addr[i:i + 8], 16)) for i in range(0, 32, 8))
+    ip = socket.inet_ntop(socket.AF_INET6, raw)
+    if ip.startswith("::ffff:") and "." in ip:
+        ip = ip[7:]
+    return f"[{ip}]:{port}"
+
+
+def read_udp_table(path: str) -> List[dict]:
+    """Parse one /proc/net/udp-style table"""
+    sockets = []
+    try:
+        with open(path, "r") as f:
+            next(f, None)  # header
+            for line in f:
+                fields = line.split()
+                if len(fields) < 10:
+                    continue
+                tx_queue, rx_queue = fields[4].split(":")
+                remote = _decode_address(fields[2])
+                unconnected = remote.endswith(":0") and fields[3] == "07"
+                sockets.append({
+                    "inode": int(fields[9]),
+                    "local_address": _decode_address(fields[1]),
+                    "remote_address": "*:*" if unconnected else remote,
+                    "state": _STATES.get(fields[3], fields[3]),
+                    "tx_queue": int(tx_queue, 16),
+                    "rx_queue": int(rx_queue, 16),
+                    "drops": int(fields[12]) if len(fields) > 12 else 0,
+                    "family": "ipv6" if path.endswith("6") else "ipv4",
+                })
+    except (OSError, ValueError):
+        pass
+    return sockets
+
+
+def find_srt_pids() -> Set[int]:
+    """PIDs of running srt-live-transmit processes"""
+    pids = set()
+    try:
+        entries = os.listdir(PROC)
+    except OSError:
+        return pids
+    for entry in entries:
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"{PROC}/{entry}/comm", "r") as f:
+                if f.read().strip() == SRT_PROCESS_NAME:
+                    pids.add(int(entry))
+        except OSError:
+            continue
+    return pids
+
+
+def socket_inodes(pid: int) -> Set[int]:
+    """Inodes of the sockets a process has open"""
+    inodes = set()
+    fd_dir = f"{PROC}/{pid}/fd"
+    try:
+        fds = os.listdir(fd_dir)
+    except OSError:
+        return inodes
+    for fd in fds:
+        try:
+            target = os.readlink(f"{fd_dir}/{fd}")
+        except OSError:
+            continue
+        if target.startswith("socket:["):
+            inodes.add(int(target[8:-1]))
+    return inodes
+
+
+def _build_snapshot(extra_pids: frozenset = frozenset()) -> List[dict]:
+    owners: Dict[int, int] = {}
+    for pid in find_srt_pids() | extra_pids:
+        for inode in socket_inodes(pid):
+            owners[inode] = pid
+
+    sockets = []
+    if not owners:
+        return sockets
+    for table in (f"{PROC}/net/udp", f"{PROC}/net/udp6"):
+        for entry in read_udp_table(table):
+            pid = owners.get(entry["inode"])
+            if pid is not None:
+                entry["pid"] = pid
+                sockets.append(entry)
+    return sockets
+
+
+def get_socket_snapshot() -> List[dict]:
+    """UDP sockets of all srt-live-transmit processes (shared, refreshed every interval)"""
+    return single_flight.do_sync(("sockets", "*"), _build_snapshot, ttl=SOCKET_INVENTORY_INTERVAL)
+
+
+def get_pid_sockets(pid: int) -> List[dict]:
+    """UDP sockets of one process"""
+    sockets = [s for s in get_socket_snapshot() if s["pid"] == pid]
+    if sockets:
+        return sockets
+    # Not an srt-live-transmit process (or it started after the snapshot)
+    snapshot = single_flight.do_sync(("sockets", pid), lambda: _build_snapshot(frozenset({pid})),
+                                     ttl=SOCKET_INVENTORY_INTERVAL)
+    return [s for s in snapshot if s["pid"] == pid]
+
+
+def get_sockets_for_pids(pids: List[Optional[int]]) -> List[dict]:
+    """UDP sockets of a channel's processes"""
+    wanted = {pid for pid in pids if pid}
+    sockets = [s for s in get_socket_snapshot() if s["pid"] in wanted]
+    # Processes missing from the shared snapshot get their own lookup
+    for pid in sorted(wanted - {s["pid"] for s in sockets}):
+        sockets.extend(get_pid_sockets(pid))
+    return sockets
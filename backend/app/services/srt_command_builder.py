@@ -1,11 +1,26 @@
 """
 SRT Command Builder - Secure command construction without shell injection
 """
+import os
 import re
+import sys
 from pathlib import Path
 from typing import List, Optional
 from urllib.parse import quote
 
+# srt-live-transmit binary (name on PATH or full path)
+SRT_LIVE_TRANSMIT = os.getenv("SRT_LIVE_TRANSMIT", "srt-live-transmit")
+# Run channels with the simulator (srt_simulator.py) instead of the real binary
+SRT_SIMULATE = os.getenv("SRT_SIMULATE", "0").lower() in ("1", "true", "yes")
+SIMULATOR_SCRIPT = Path(__file__).resolve().parent / "srt_simulator.py"
+
+
+def srt_executable() -> List[str]:
+    """Command prefix that starts srt-live-transmit (or its simulator)"""
+    if SRT_SIMULATE:
+        return [sys.executable, str(SIMULATOR_SCRIPT)]
+    return [SRT_LIVE_TRANSMIT]
+
 
 def is_valid_srt_url(url: str) -> bool:
     """
@@ -69,7 +84,7 @@ def build_srt_command(
 
     # Build command as list (NO shell=True!)
     command = [
-        "srt-live-transmit",
+        *srt_executable(),
         input_url,
         output_url,
         "-s", "5000",
@@ -472,7 +487,7 @@ def build_secure_srt_command_from_channel(channel, stats_file: Path, log_file: P
 
     # Build command as argument list (NO shell=True needed!)
     command = [
-        "srt-live-transmit",
+        *srt_executable(),
         input_url,
         output_url,
         "-s", "5000",
@@ -0,0 +1,286 @@
+"""
+Stand-in for srt-live-transmit, for running the backend without real streams
+
+Started instead of the real binary when SRT_SIMULATE is set (see
+srt_command_builder.srt_executable). It accepts the same command line
+(input URL, output URL, -s / -stats-report-frequency, -statspf, -statsout,
+-a, -loglevel) and every report interval writes what the real process
+would: one stats row per connected socket to the -statsout file and
+libsrt-style log lines to stdout, which the backend redirects to the
+channel log. Output clients connect and disconnect at random, and loss
+bursts show up both as lost/dropped packets and as RCV-DROPPED warnings.
+
+Listener ports are bound like the real process binds them, so port
+conflicts fail the same way, and the process names itself
+srt-live-transmit so the socket inventory picks it up. Between reports it
+only sleeps, so a thousand of them cost next to no CPU.
+
+Stdlib only - it runs as a script, outside the app package:
+
+    python srt_simulator.py "srt://:9000?mode=listener" "srt://:9100?mode=listener" \\
+        -s 1000 -statspf:csv -statsout:/tmp/stats.csv
+"""
+
+import json
+import os
+import random
+import signal
+import socket
+import sys
+import time
+from datetime import datetime
+from typing import List, Optional
+from urllib.parse import parse_qs, urlsplit
+
+STATS_HEADER = (
+    "Timepoint,Time,SocketID,Time,pktFlowWindow,pktCongestionWindow,pktFlightSize,msRTT,"
+    "mbpsBandwidth,mbpsMaxBW,pktSent,pktSentUnique,pktSndLoss,pktSndDrop,pktRetrans,"
+    "pktSndFilterExtra,byteSent,byteSentUnique,byteSndDrop,byteAvailSndBuf,msSndBuf,"
+    "mbpsSendRate,usPktSndPeriod,pktRecv,pktRecvUnique,pktRcvLoss,pktRcvDrop,pktRcvRetrans,"
+    "pktRcvBelated,pktRcvFilterExtra,pktRcvFilterSupply,pktRcvFilterLoss,byteRecv,"
+    "byteRecvUnique,byteRcvLoss,byteRcvDrop,byteAvailRcvBuf,msRcvBuf,mbpsRecvRate,"
+    "msRcvTsbPdDelay"
+)
+
+# Stream bitrate the packet counters follow (Mbit/s)
+SIM_BITRATE_MBPS = float(os.getenv("SRT_SIM_BITRATE_MBPS", "8"))
+# Average length of an output client session (seconds)
+SIM_SESSION_S = float(os.getenv("SRT_SIM_SESSION_S", "300"))
+# Chance per report interval that an idle output gets a client / a loss burst starts
+SIM_CONNECT_CHANCE = float(os.getenv("SRT_SIM_CONNECT_CHANCE", "0.2"))
+SIM_LOSS_CHANCE = float(os.getenv("SRT_SIM_LOSS_CHANCE", "0.02"))
+# Output clients per channel at most
+SIM_MAX_CLIENTS = int(os.getenv("SRT_SIM_MAX_CLIENTS", "3"))
+
+PAYLOAD_BYTES = 1316
+
+_INFO_MESSAGES = (
+    "SRT.cn: @{sid}: buffer size {n} packets",
+    "SRT.sm: @{sid}: stats report: rtt={rtt}ms",
+    "SRT.br: @{sid}: TSBPD: delivering packet seq {n}",
+    "SRT.qr: @{sid}: rcv buffer level {n} bytes",
+)
+_WARNING_MESSAGES = (
+    "SRT.br: @{sid}: RCV-DROPPED {n} packet(s), seqno range %{n}",
+    "SRT.cn: @{sid}: packet loss detected, requesting retransmission",
+)
+_ERROR_MESSAGES = (
+    "SRT.cn: @{sid}: connection error: timeout waiting for peer",
+    "SRT.sm: @{sid}: failed to send: socket not connected",
+)
+
+
+def stats_row(rng: random.Random, timepoint: datetime, elapsed_ms: int, socket_id: int,
+              sent: int, received: int, loss: int = 40) -> str:
+    """One -statspf:csv row for a socket; `loss` caps the lost packets of the interval"""
+    rtt = round(rng.uniform(5, 80), 3)
+    send_rate = round(rng.uniform(2, 12), 5)
+    recv_rate = round(rng.uniform(2, 12), 5)
+    lost_send = rng.randint(0, min(loss, sent))
+    lost_recv = rng.randint(0, min(loss, received))
+    values = [
+        # Naive timepoints are local time - write their real UTC offset
+        timepoint.astimezone().strftime('%Y-%m-%dT%H:%M:%S.%f%z'), elapsed_ms, socket_id, elapsed_ms,
+        8192, 8192, rng.randint(10, 200), rtt,
+        round(rng.uniform(100, 900), 3), 1000, sent, sent - lost_send, lost_send, 0,
+        rng.randint(0, 60), 0, sent * PAYLOAD_BYTES, (sent - lost_send) * PAYLOAD_BYTES, 0, 5000000,
+        rng.randint(20, 120), send_rate, 9, received, received - lost_recv, lost_recv, 0,
+        rng.randint(0, 60), 0, 0, 0, 0, received * PAYLOAD_BYTES, (received - lost_recv) * PAYLOAD_BYTES,
+        lost_recv * PAYLOAD_BYTES, 0, 12286500, rng.randint(100, 130), recv_rate, 120,
+    ]
+    return ",".join(str(v) for v in values)
+
+
+def log_line(rng: random.Random, ts: datetime, socket_id: int, level: Optional[str] = None) -> str:
+    """One srt-live-transmit log line (mostly info, some warnings and errors)"""
+    if level is None:
+        roll = rng.random()
+        level = "E" if roll < 0.02 else "W" if roll < 0.08 else "N"
+    templates = {"E": _ERROR_MESSAGES, "W": _WARNING_MESSAGES}.get(level, _INFO_MESSAGES)
+    message = rng.choice(templates).format(sid=socket_id, n=rng.randint(1, 99999), rtt=rng.randint(5, 80))
+    return f"{ts.strftime('%H:%M:%S.%f')}/srt-live-transmit*{level}:{message}"
+
+
+def connection_lines(ts: datetime, socket_id: int, ip: str, port: int, connect: bool) -> List[str]:
+    """Log lines of a client connecting or disconnecting"""
+    stamp = ts.strftime('%H:%M:%S.%f')
+    if connect:
+        return [
+            f"{stamp}/srt-live-transmit*N:SRT.cn: @{socket_id}: request from: {ip}:{port}",
+            f"{stamp} Accepted SRT target connection",
+        ]
+    return [f"{stamp}/srt-live-transmit*N:SRT.cn: @{socket_id}: connection to {ip}:{port} closed",
+            f"{stamp} SRT target disconnected"]
+
+
+def parse_args(argv: List[str]) -> dict:
+    """srt-live-transmit style arguments: two URLs, -opt:value, -opt value and flags"""
+    options = {"urls": [], "interval_ms": 1000, "statspf": "default", "statsout": None, "loglevel": "info"}
+    takes_value = {"-s", "-loglevel", "-t", "-c", "-b", "-r"}
+    args = iter(argv)
+    for arg in args:
+        if not arg.startswith("-"):
+            options["urls"].append(arg)
+            continue
+        name, _, value = arg.partition(":")
+        if not value and name in takes_value:
+            value = next(args, "")
+        if name in ("-s", "-stats", "-stats-report-frequency") and value:
+            options["interval_ms"] = int(value)
+        elif name in ("-statspf", "-pf"):
+            options["statspf"] = value
+        elif name == "-statsout":
+            options["statsout"] = value
+        elif name == "-loglevel":
+            options["loglevel"] = value
+    return options
+
+
+def bind_listener(url: str) -> Optional[socket.socket]:
+    """Bind the UDP port of a listener URL like the real process; None for callers"""
+    parts = urlsplit(url)
+    query = parse_qs(parts.query)
+    mode = (query.get("mode") or ["caller" if parts.hostname else "listener"])[0]
+    if parts.scheme == "srt" and mode not in ("listener", "server"):
+        return None
+    if parts.scheme == "udp" and parts.hostname and not parts.hostname.startswith(("0.", "239.", "224.")):
+        # UDP output to a host sends, it does not bind
+        return None
+    if not parts.port:
+        return None
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(("0.0.0.0" if not parts.hostname or parts.hostname.startswith(("239.", "224.")) else parts.hostname,
+               parts.port))
+    return sock
+
+
+def name_process(name: str = "srt-live-transmit"):
+    """Set the process name (/proc/<pid>/comm, 15 characters at most)"""
+    try:
+        with open("/proc/self/comm", "w") as f:
+            f.write(name[:15])
+    except OSError:
+        pass
+
+
+class Simulator:
+    """One simulated srt-live-transmit process"""
+
+    def __init__(self, options: dict, seed: Optional[int] = None):
+        self.options = options
+        self.interval = options["interval_ms"] / 1000
+        self.rng = random.Random(seed)
+        self.started = time.monotonic()
+        self.source_id = self._socket_id()
+        self.counters = {self.source_id: [0, 0]}
+        # output socket id -> (ip, port, disconnect at)
+        self.clients = {}
+        self.loss_ticks = 0
+        self.stats = None
+
+    def _socket_id(self) -> int:
+        return self.rng.randint(400000000, 999999999)
+
+    def _log(self, *lines: str):
+        sys.stdout.write("".join(line + "\n" for line in lines))
+        sys.stdout.flush()
+
+    def open_stats(self):
+        path = self.options["statsout"]
+        if not path:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.stats = open(path, "a", buffering=1)
+        if self.options["statspf"] != "json" and self.stats.tell() == 0:
+            self.stats.write(STATS_HEADER + "\n")
+
+    def tick(self):
+        now = datetime.now()
+        elapsed_ms = int((time.monotonic() - self.started) * 1000)
+        per_interval = max(int(SIM_BITRATE_MBPS * 1_000_000 / 8 / PAYLOAD_BYTES * self.interval), 1)
+
+        # Output clients come and go
+        for sid, (ip, port, until) in list(self.clients.items()):
+            if time.monotonic() >= until:
+                del self.clients[sid]
+                self.counters.pop(sid, None)
+                self._log(*connection_lines(now, sid, ip, port, connect=False))
+        if len(self.clients) < SIM_MAX_CLIENTS and self.rng.random() < SIM_CONNECT_CHANCE:
+            sid = self._socket_id()
+            ip = f"10.{self.rng.randint(0, 255)}.{self.rng.randint(0, 255)}.{self.rng.randint(1, 254)}"
+            port = self.rng.randint(1024, 65535)
+            self.clients[sid] = (ip, port, time.monotonic() + self.rng.expovariate(1 / SIM_SESSION_S))
+            self.counters[sid] = [0, 0]
+            self._log(*connection_lines(now, sid, ip, port, connect=True))
+
+        # Loss bursts last a few intervals
+        if self.loss_ticks == 0 and self.rng.random() < SIM_LOSS_CHANCE:
+            self.loss_ticks = self.rng.randint(2, 6)
+        loss = 40
+        if self.loss_ticks:
+            self.loss_ticks -= 1
+            loss = per_interval // 20
+            self._log(log_line(self.rng, now, self.source_id, level="W"))
+        elif self.rng.random() < 0.1:
+            self._log(log_line(self.rng, now, self.source_id, level="N"))
+
+        for sid, counter in self.counters.items():
+            counter[0] += per_interval if sid != self.source_id else 0
+            counter[1] += per_interval if sid == self.source_id else 0
+            self._write_stats(now, elapsed_ms, sid, counter[0], counter[1], loss)
+
+    def _write_stats(self, now: datetime, elapsed_ms: int, sid: int, sent: int, received: int, loss: int):
+        if not self.stats:
+            return
+        row = stats_row(self.rng, now, elapsed_ms, sid, sent, received, loss)
+        if self.options["statspf"] == "json":
+            values = dict(zip(STATS_HEADER.split(","), row.split(",")))
+            row = json.dumps({"sid": sid, "timepoint": elapsed_ms, **values})
+        self.stats.write(row + "\n")
+
+    def run(self):
+        input_url, output_url = (self.options["urls"] + ["", ""])[:2]
+        self.open_stats()
+        stamp = datetime.now().strftime('%H:%M:%S.%f')
+        self._log(f"Media path: '{input_url}' --> '{output_url}'")
+        self._log(f"{stamp}/srt-live-transmit*N:SRT.sm: @{self.source_id}: simulated source started")
+
+        next_tick = time.monotonic() + self.interval
+        while True:
+            time.sleep(max(next_tick - time.monotonic(), 0))
+            next_tick += self.interval
+            self.tick()
+
+
+def main(argv: List[str]) -> int:
+    options = parse_args(argv)
+    if len(options["urls"]) < 2:
+        print("Usage: srt-live-transmit <input-uri> <output-uri> [options]", file=sys.stderr)
+        return 1
+
+    name_process()
+    # Exit quietly on stop like the real process
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+
+    sockets = []
+    for url in options["urls"][:2]:
+        try:
+            sock = bind_listener(url)
+        except OSError as e:
+            print(f"ERROR: Failed to bind {url}: {e.strerror}", flush=True)
+            return 1
+        if sock:
+            sockets.append(sock)
+
+    try:
+        Simulator(options).run()
+    except (KeyboardInterrupt, SystemExit):
+        pass
+    finally:
+        for sock in sockets:
+            sock.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
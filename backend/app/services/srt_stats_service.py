@@ -5,18 +5,188 @@ import csv
 import json
 import os
 import re
-import subprocess
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 import threading
 
+from ..core import perf
+from ..core.singleflight import single_flight
+from .connection_index import ADDRESS_RE, classify_connection_line, get_connection_index
+from .socket_inventory import get_pid_sockets, get_socket_snapshot
+
+# Common timestamp formats in SRT logs
+_TIMESTAMP_PATTERNS = [
+    re.compile(r'(\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2})'),
+    re.compile(r'(\d{2}:\d{2}:\d{2}\.\d+)'),
+]
+
 # Cache for SRT stats
 _srt_stats_cache: Dict[str, dict] = {}
 _stats_lock = threading.Lock()
 
 
+def update_ts_health(channel_name: str, health: dict):
+    """Store the latest transport stream health of a channel"""
+    with _stats_lock:
+        _srt_stats_cache.setdefault(channel_name, {})["ts_health"] = health
+
+
+def get_ts_health(channel_name: str) -> Optional[dict]:
+    """Latest transport stream health of a channel, if it has a tap"""
+    with _stats_lock:
+        return _srt_stats_cache.get(channel_name, {}).get("ts_health")
+
+
+def prune_srt_stats(keep: set):
+    """Drop stored stats of channels that are no longer running"""
+    with _stats_lock:
+        for name in list(_srt_stats_cache.keys()):
+            if name not in keep:
+                del _srt_stats_cache[name]
+
+
+# Enough for several stats rows - the last complete one is always inside
+_CSV_TAIL_BYTES = 8192
+
+
+def read_csv_edges(stats_file: Path) -> Optional[Tuple[str, str]]:
+    """Return the header and last complete data row of a stats CSV without reading it all"""
+    try:
+        with open(stats_file, 'rb') as f:
+            header = f.readline()
+            size = os.fstat(f.fileno()).st_size
+            f.seek(max(size - _CSV_TAIL_BYTES, len(header)))
+            tail = f.read()
+    except OSError:
+        return None
+    perf.count("stats_bytes_read", len(header) + len(tail))
+
+    rows = [line for line in tail.split(b'\n')[:-1] if line.strip()]
+    if not header.endswith(b'\n') or not rows:
+        return None
+    # The first row may be cut by the seek - the last complete one never is
+    return header.decode('utf-8', errors='replace').strip(), rows[-1].decode('utf-8', errors='replace').strip()
+
+
+# Read size when scanning a stats CSV backwards for its last rows
+_CSV_BLOCK_BYTES = 64 * 1024
+
+
+def _csv_value(value: str) -> Any:
+    if not value:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        pass
+    try:
+        return float(value)
+    except ValueError:
+        return value
+
+
+def _column_type(value: str) -> Any:
+    """int, float or str, guessed from a column's first non-empty value"""
+    for kind in (int, float):
+        try:
+            kind(value)
+            return kind
+        except ValueError:
+            pass
+    return str
+
+
+def _column_names(header: List[str]) -> List[str]:
+    """Header with repeated names numbered (srt-live-transmit writes Time twice: Time, Time.1)"""
+    seen: Dict[str, int] = {}
+    names = []
+    for name in header:
+        if name in seen:
+            seen[name] += 1
+            names.append(f"{name}.{seen[name]}")
+        else:
+            seen[name] = 0
+            names.append(name)
+    return names
+
+
+def read_stats_rows(stats_file: Path, limit: Optional[int] = None) -> List[dict]:
+    """
+    Rows of a stats CSV as dicts with numeric values converted; only the last
+    `limit` rows when given, reading just the end of the file that holds them
+    """
+    with open(stats_file, 'rb') as f:
+        header = f.readline()
+        if not header.endswith(b'\n'):
+            return []
+        size = os.fstat(f.fileno()).st_size
+        if limit is None:
+            body = f.read()
+        else:
+            chunks = []
+            newlines = 0
+            pos = size
+            while pos > len(header) and newlines <= limit:
+                step = min(_CSV_BLOCK_BYTES, pos - len(header))
+                pos -= step
+                f.seek(pos)
+                chunk = f.read(step)
+                chunks.append(chunk)
+                newlines += chunk.count(b'\n')
+            body = b''.join(reversed(chunks))
+            if pos > len(header):
+                # Started mid-row
+                body = body[body.index(b'\n') + 1:]
+    perf.count("stats_bytes_read", len(header) + len(body))
+
+    # A row still being written has no newline yet
+    lines = [line for line in body.split(b'\n')[:-1] if line.strip()]
+    if limit is not None:
+        lines = lines[-limit:] if limit > 0 else []
+    names = _column_names(header.decode('utf-8', errors='replace').strip().split(','))
+    rows = []
+    # Type of each column, guessed from its first non-empty value
+    kinds: List[Any] = [None] * len(names)
+    untyped = len(names)
+    for line in lines:
+        values = line.decode('utf-8', errors='replace').strip().split(',')
+        if len(values) != len(names):
+            continue
+        if untyped:
+            for i, v in enumerate(values):
+                if kinds[i] is None and v:
+                    kinds[i] = _column_type(v)
+                    untyped -= 1
+        try:
+            # Columns keep their type from row to row - convert without guessing
+            converted = [kind(v) if v else None for kind, v in zip(kinds, values)]
+        except ValueError:
+            converted = [_csv_value(v) for v in values]
+        rows.append(dict(zip(names, converted)))
+    return rows
+
+
+def read_recv_rate(stats_file: Path) -> Optional[float]:
+    """Latest mbpsRecvRate of a stats CSV"""
+    edges = read_csv_edges(stats_file)
+    if edges is None:
+        return None
+    header, row = edges[0].split(','), edges[1].split(',')
+    if len(header) != len(row) or "mbpsRecvRate" not in header:
+        return None
+    try:
+        return float(row[header.index("mbpsRecvRate")])
+    except ValueError:
+        return None
+
+
 def parse_srt_stats_csv(stats_file: Path) -> Optional[dict]:
+    """Parse the latest SRT stats row, shared by concurrent callers of the same file"""
+    return single_flight.do_sync(("stats", str(stats_file)), lambda: _parse_srt_stats_csv(stats_file))
+
+
+def _parse_srt_stats_csv(stats_file: Path) -> Optional[dict]:
     """
     Parse SRT statistics from CSV file generated by srt-live-transmit
 
@@ -32,15 +202,13 @@ def parse_srt_stats_csv(stats_file: Path) -> Optional[dict]:
         return None
 
     try:
-        with open(stats_file, 'r') as f:
-            lines = f.readlines()
-
-        if len(lines) < 2:
+        edges = read_csv_edges(stats_file)
+        if edges is None:
             return None
 
         # Get header and last data line
-        header = lines[0].strip().split(',')
-        last_line = lines[-1].strip().split(',')
+        header = edges[0].split(',')
+        last_line = edges[1].split(',')
 
         if len(header) != len(last_line):
             return None
@@ -100,116 +268,24 @@ def parse_srt_stats_json(stats_file: Path) -> Optional[dict]:
 
 def get_srt_connections() -> List[dict]:
     """
-    Get active SRT connections using ss command
-    Returns list of connections with remote addresses
+    Get active SRT connections from the shared /proc socket inventory
+    Returns list of UDP sockets of srt-live-transmit processes with remote addresses
     """
-    connections = []
-
-    try:
-        # Use ss to find SRT connections (UDP sockets on SRT ports)
-        result = subprocess.run(
-            ["ss", "-unap"],
-            capture_output=True,
-            text=True,
-            timeout=5
-        )
-
-        print(f"[DEBUG] ss -unap output:\n{result.stdout}")
-
-        if result.returncode != 0:
-            return connections
-
-        for line in result.stdout.split('\n'):
-            # Look for srt-live-transmit connections
-            if 'srt-live-transmit' in line:
-                parts = line.split()
-                print(f"[DEBUG] ss line parts: {parts}")
-                if len(parts) >= 5:
-                    local_addr = parts[4] if len(parts) > 4 else ""
-                    peer_addr = parts[5] if len(parts) > 5 else ""
-
-                    # Extract PID
-                    pid_match = re.search(r'pid=(\d+)', line)
-                    pid = int(pid_match.group(1)) if pid_match else None
-
-                    connections.append({
-                        "local_address": local_addr,
-                        "remote_address": peer_addr,
-                        "pid": pid,
-                        "state": "ESTAB" if peer_addr and peer_addr != "*:*" else "LISTEN"
-                    })
-    except Exception as e:
-        print(f"Error getting SRT connections: {e}")
-
-    # Also try lsof as backup method
-    try:
-        result = subprocess.run(
-            ["lsof", "-i", "UDP", "-n", "-P"],
-            capture_output=True,
-            text=True,
-            timeout=5
-        )
-
-        for line in result.stdout.split('\n'):
-            if 'srt-live' in line:
-                print(f"[DEBUG] lsof line: {line}")
-                # Parse lsof output: COMMAND PID USER FD TYPE DEVICE SIZE/OFF NODE NAME
-                parts = line.split()
-                if len(parts) >= 9:
-                    pid = int(parts[1]) if parts[1].isdigit() else None
-                    name = parts[-1]  # Last column is NAME (local->remote or just local)
-
-                    if '->' in name:
-                        # Format: local->remote
-                        local_remote = name.split('->')
-                        local_addr = local_remote[0]
-                        remote_addr = local_remote[1] if len(local_remote) > 1 else ""
-
-                        # Check if this connection is not already in list
-                        existing = [c for c in connections if c.get("pid") == pid and c.get("local_address") == local_addr]
-                        if not existing and remote_addr:
-                            connections.append({
-                                "local_address": local_addr,
-                                "remote_address": remote_addr,
-                                "pid": pid,
-                                "state": "ESTAB"
-                            })
-    except Exception as e:
-        print(f"Error getting connections via lsof: {e}")
-
-    return connections
+    return get_socket_snapshot()
 
 
 def get_process_connections(pid: int) -> List[dict]:
     """Get all connections for a specific process PID"""
-    connections = []
-
-    try:
-        result = subprocess.run(
-            ["ss", "-unap", f"pid={pid}"],
-            capture_output=True,
-            text=True,
-            timeout=5
-        )
-
-        for line in result.stdout.split('\n'):
-            if line.strip() and not line.startswith('State'):
-                parts = line.split()
-                if len(parts) >= 5:
-                    connections.append({
-                        "local_address": parts[4] if len(parts) > 4 else "",
-                        "remote_address": parts[5] if len(parts) > 5 else "",
-                    })
-    except Exception as e:
-        print(f"Error getting process connections: {e}")
-
-    return connections
+    return get_pid_sockets(pid)
 
 
 def parse_srt_log_connections(log_file: Path) -> List[dict]:
     """
     Parse SRT log file for connection events
     Returns list of connection events with timestamps and remote addresses
+
+    Reads the whole file - use connection_index.get_connection_index for
+    repeated queries against a growing log.
     """
     events = []
 
@@ -219,33 +295,19 @@ def parse_srt_log_connections(log_file: Path) -> List[dict]:
     try:
         with open(log_file, 'r') as f:
             for line in f:
-                # Look for connection events
-                # Format varies but typically includes IP:port
-
-                # Connected event
-                if 'accepted' in line.lower() or 'connected' in line.lower():
-                    # Try to extract IP address
-                    ip_match = re.search(r'(\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}):(\d+)', line)
-                    if ip_match:
-                        events.append({
-                            "type": "connected",
-                            "remote_ip": ip_match.group(1),
-                            "remote_port": int(ip_match.group(2)),
-                            "timestamp": extract_timestamp(line),
-                            "raw": line.strip()
-                        })
-
-                # Disconnected event
-                elif 'closed' in line.lower() or 'disconnected' in line.lower():
-                    ip_match = re.search(r'(\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}):(\d+)', line)
-                    if ip_match:
-                        events.append({
-                            "type": "disconnected",
-                            "remote_ip": ip_match.group(1),
-                            "remote_port": int(ip_match.group(2)),
-                            "timestamp": extract_timestamp(line),
-                            "raw": line.strip()
-                        })
+                event_type = classify_connection_line(line)
+                if event_type is None:
+                    continue
+
+                ip_match = ADDRESS_RE.search(line)
+                if ip_match:
+                    events.append({
+                        "type": event_type,
+                        "remote_ip": ip_match.group(1),
+                        "remote_port": int(ip_match.group(2)),
+                        "timestamp": extract_timestamp(line),
+                        "raw": line.strip()
+                    })
     except Exception as e:
         print(f"Error parsing SRT log: {e}")
 
@@ -255,13 +317,8 @@ def parse_srt_log_connections(log_file: Path) -> List[dict]:
 def extract_timestamp(line: str) -> Optional[str]:
     """Extract timestamp from log line"""
     # Common timestamp formats
-    patterns = [
-        r'(\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2})',
-        r'(\d{2}:\d{2}:\d{2}\.\d+)',
-    ]
-
-    for pattern in patterns:
-        match = re.search(pattern, line)
+    for pattern in _TIMESTAMP_PATTERNS:
+        match = pattern.search(line)
         if match:
             return match.group(1)
 
@@ -291,20 +348,13 @@ def get_channel_srt_stats(channel_name: str, stats_file: Path, log_file: Optiona
     elif stats_file.exists():
         result["srt_stats"] = parse_srt_stats_csv(stats_file)
 
-    # Parse log file for connection events
+    # Connection events come from the incremental log index
     if log_file and log_file.exists():
-        result["connection_events"] = parse_srt_log_connections(log_file)
-
-        # Get last connected clients from events
-        connected_clients = {}
-        for event in result["connection_events"]:
-            client_key = f"{event['remote_ip']}:{event['remote_port']}"
-            if event["type"] == "connected":
-                connected_clients[client_key] = event
-            elif event["type"] == "disconnected":
-                connected_clients.pop(client_key, None)
+        index = get_connection_index(log_file)
+        result["connection_events"] = index.history(limit=50)
+        result["active_clients"] = index.active_clients()
 
-        result["active_clients"] = list(connected_clients.values())
+    result["ts_health"] = get_ts_health(channel_name)
 
     # Determine status
     if result["srt_stats"]:
@@ -345,10 +395,10 @@ def get_combined_channel_info(channel: dict) -> dict:
     Get combined channel information:
     - Basic channel config
     - SRT statistics (bitrate, RTT, packet loss)
-    - Media info (resolution, codec, fps) from ffprobe
+    - Media info (resolution, codec, fps) from the stream analyzer cache
     - Connection info (remote clients)
     """
-    from .stream_analyzer import analyze_stream_sync
+    from .stream_analyzer import get_cached_stream_info
 
     channel_name = channel.get("channel_name", "")
 
@@ -389,18 +439,15 @@ def get_combined_channel_info(channel: dict) -> dict:
         if stats_path.exists():
             result["srt_stats"] = parse_srt_stats_csv(stats_path)
 
-    # Get media info via ffprobe
-    try:
-        media_info = analyze_stream_sync(channel)
-        if media_info.get("success"):
-            result["media_info"] = {
-                "format": media_info.get("format"),
-                "total_bitrate_mbps": media_info.get("total_bitrate_mbps"),
-                "video": media_info.get("video_streams", []),
-                "audio": media_info.get("audio_streams", []),
-            }
-    except Exception as e:
-        result["media_info"] = {"error": str(e)}
+    # Media info is kept fresh by the background analyzer - never probe inline
+    media_info = get_cached_stream_info(channel_name)
+    if media_info and media_info.get("success"):
+        result["media_info"] = {
+            "format": media_info.get("format"),
+            "total_bitrate_mbps": media_info.get("total_bitrate_mbps"),
+            "video": media_info.get("video_streams", []),
+            "audio": media_info.get("audio_streams", []),
+        }
 
     # Get active connections for this process
     pids = channel.get("pids", [])
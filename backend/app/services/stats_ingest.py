@@ -0,0 +1,273 @@
+"""
+Stats ingester - per-client SRT statistics from srt-live-transmit CSV files
+
+srt-live-transmit writes one row per reporting interval and connected socket
+into a single CSV. The ingester tails the file with FileTail, splits the rows
+by SocketID into bounded per-client series and correlates them with the
+client sessions of the connection index (remote ip:port).
+"""
+
+import re
+import threading
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Deque, Dict, List, Optional
+
+from ..core import perf
+from .log_tail import FileTail
+
+# Samples kept per client
+SERIES_LENGTH = 120
+# Clients without a row for this long are considered gone
+CLIENT_STALE_SECONDS = 60
+# Socket series kept per file (closed sockets are dropped oldest first)
+MAX_SERIES = 256
+
+# Timepoint is written with a "+0400"-style offset, which Python < 3.11 rejects
+_TZ_OFFSET_RE = re.compile(r'([+-]\d{2})(\d{2})$')
+
+# CSV column -> sample field
+_COLUMNS = {
+    "msRTT": "rtt_ms",
+    "mbpsBandwidth": "bandwidth_mbps",
+    "mbpsSendRate": "send_rate_mbps",
+    "mbpsRecvRate": "recv_rate_mbps",
+    "pktSent": "pkt_sent",
+    "pktSndLoss": "pkt_snd_loss",
+    "pktRetrans": "pkt_retrans",
+    "pktSndDrop": "pkt_snd_drop",
+    "pktRecv": "pkt_recv",
+    "pktRcvLoss": "pkt_rcv_loss",
+    "pktRcvDrop": "pkt_rcv_drop",
+    "byteSent": "byte_sent",
+    "byteRecv": "byte_recv",
+}
+_TOTALS = ("pkt_sent", "pkt_snd_loss", "pkt_retrans", "pkt_snd_drop",
+           "pkt_recv", "pkt_rcv_loss", "pkt_rcv_drop", "byte_sent", "byte_recv")
+
+
+def parse_timepoint(value: str) -> Optional[datetime]:
+    """Parse the Timepoint column into an aware datetime"""
+    try:
+        ts = datetime.fromisoformat(_TZ_OFFSET_RE.sub(r'\1:\2', value))
+    except ValueError:
+        return None
+    return ts if ts.tzinfo else ts.astimezone()
+
+
+def dedupe_header(columns: List[str]) -> List[str]:
+    """Make repeated column names unique (the CSV has two "Time" columns)"""
+    seen: Dict[str, int] = {}
+    result = []
+    for name in columns:
+        count = seen.get(name, 0)
+        seen[name] = count + 1
+        result.append(name if count == 0 else f"{name}_{count + 1}")
+    return result
+
+
+@dataclass(slots=True)
+class StatsSample:
+    """One CSV row of one socket"""
+    timepoint: Optional[datetime]
+    rtt_ms: float = 0.0
+    bandwidth_mbps: float = 0.0
+    send_rate_mbps: float = 0.0
+    recv_rate_mbps: float = 0.0
+    pkt_sent: int = 0
+    pkt_snd_loss: int = 0
+    pkt_retrans: int = 0
+    pkt_snd_drop: int = 0
+    pkt_recv: int = 0
+    pkt_rcv_loss: int = 0
+    pkt_rcv_drop: int = 0
+    byte_sent: int = 0
+    byte_recv: int = 0
+
+
+class ClientSeries:
+    """Recent samples and running totals of one SRT socket"""
+
+    def __init__(self, socket_id: int):
+        self.socket_id = socket_id
+        self.samples: Deque[StatsSample] = deque(maxlen=SERIES_LENGTH)
+        self.totals: Dict[str, int] = {name: 0 for name in _TOTALS}
+        self.first_seen: Optional[datetime] = None
+        self.last_seen: Optional[datetime] = None
+
+    def add(self, sample: StatsSample):
+        self.samples.append(sample)
+        for name in _TOTALS:
+            self.totals[name] += getattr(sample, name)
+        if sample.timepoint:
+            self.first_seen = self.first_seen or sample.timepoint
+            self.last_seen = sample.timepoint
+
+    def is_active(self, now: Optional[datetime] = None) -> bool:
+        if self.last_seen is None:
+            return False
+        now = now or datetime.now(timezone.utc)
+        return (now - self.last_seen).total_seconds() <= CLIENT_STALE_SECONDS
+
+    def summary(self) -> dict:
+        """Latest rates/RTT and loss over the recent samples"""
+        latest = self.samples[-1] if self.samples else StatsSample(timepoint=None)
+        sent = sum(s.pkt_sent for s in self.samples)
+        recv = sum(s.pkt_recv for s in self.samples)
+        snd_loss = sum(s.pkt_snd_loss for s in self.samples)
+        rcv_loss = sum(s.pkt_rcv_loss for s in self.samples)
+        rtts = [s.rtt_ms for s in self.samples if s.rtt_ms]
+        return {
+            "socket_id": self.socket_id,
+            "rtt_ms": latest.rtt_ms,
+            "rtt_avg_ms": round(sum(rtts) / len(rtts), 3) if rtts else None,
+            "bandwidth_mbps": latest.bandwidth_mbps,
+            "send_rate_mbps": latest.send_rate_mbps,
+            "recv_rate_mbps": latest.recv_rate_mbps,
+            "send_loss_pct": round(snd_loss / sent * 100, 3) if sent else 0.0,
+            "recv_loss_pct": round(rcv_loss / recv * 100, 3) if recv else 0.0,
+            "retransmitted": sum(s.pkt_retrans for s in self.samples),
+            "samples": len(self.samples),
+            "totals": dict(self.totals),
+            "first_seen": self.first_seen.isoformat() if self.first_seen else None,
+            "last_seen": self.last_seen.isoformat() if self.last_seen else None,
+            "active": self.is_active(),
+        }
+
+
+class StatsIngester:
+    """Incrementally demultiplexes one stats CSV into per-socket series"""
+
+    def __init__(self, stats_file: Path):
+        self.stats_file = Path(stats_file)
+        self._tail = FileTail(self.stats_file)
+        self._generation = 0
+        self._columns: Optional[Dict[str, int]] = None
+        self._series: Dict[int, ClientSeries] = {}
+        # Rows ingested from the current file - changes whenever a row is appended
+        self.rows = 0
+        self._lock = threading.Lock()
+
+    def refresh(self):
+        """Ingest rows appended since the previous refresh"""
+        with self._lock:
+            read_before = self._tail.bytes_read
+            while True:
+                lines = self._tail.read_lines()
+                if self._tail.generation != self._generation:
+                    # New process, new file - socket ids start over
+                    self._generation = self._tail.generation
+                    self._columns = None
+                    self._series = {}
+                    self.rows = 0
+                if not lines:
+                    break
+                for offset, line in lines:
+                    if offset == 0 or self._columns is None:
+                        if line.startswith("Timepoint") or "SocketID" in line:
+                            self._set_header(line)
+                            continue
+                    self._ingest(line)
+            perf.count("stats_bytes_read", self._tail.bytes_read - read_before)
+
+    def _set_header(self, line: str):
+        columns = dedupe_header([c.strip() for c in line.split(',')])
+        self._columns = {name: i for i, name in enumerate(columns)}
+
+    def _ingest(self, line: str):
+        columns = self._columns
+        if not columns or "SocketID" not in columns:
+            return
+        values = line.split(',')
+        if len(values) < len(columns):
+            return
+        try:
+            socket_id = int(values[columns["SocketID"]])
+            sample = StatsSample(
+                timepoint=parse_timepoint(values[columns["Timepoint"]]) if "Timepoint" in columns else None
+            )
+            for column, field_name in _COLUMNS.items():
+                index = columns.get(column)
+                if index is None:
+                    continue
+                raw = values[index]
+                setattr(sample, field_name, float(raw) if field_name.endswith(("_ms", "_mbps")) else int(raw))
+        except ValueError:
+            return
+
+        self.rows += 1
+        series = self._series.get(socket_id)
+        if series is None:
+            if len(self._series) >= MAX_SERIES:
+                oldest = min(self._series.values(), key=lambda s: s.last_seen or datetime.min.replace(tzinfo=timezone.utc))
+                del self._series[oldest.socket_id]
+            series = ClientSeries(socket_id)
+            self._series[socket_id] = series
+        series.add(sample)
+
+    def version(self) -> tuple:
+        """Changes whenever a row is ingested or the file is replaced"""
+        return self._generation, self.rows
+
+    def clients(self, active_only: bool = False) -> List[dict]:
+        """Per-socket summaries, most recently seen first"""
+        with self._lock:
+            series = list(self._series.values())
+        summaries = [s.summary() for s in series]
+        if active_only:
+            summaries = [s for s in summaries if s["active"]]
+        summaries.sort(key=lambda s: s["last_seen"] or "", reverse=True)
+        return summaries
+
+
+def correlate_clients(sessions: List[dict], series: List[dict]) -> List[dict]:
+    """
+    Attach per-socket stats to active client sessions.
+
+    Sessions whose log line carried the socket id are matched exactly; the
+    rest are paired with the remaining active sockets in connection order.
+    Returns the sockets that could not be attributed to any session.
+    """
+    by_socket = {s["socket_id"]: s for s in series}
+    used = set()
+
+    for session in sessions:
+        stats = by_socket.get(session.get("socket_id"))
+        session["stats"] = stats
+        if stats:
+            used.add(stats["socket_id"])
+
+    remaining = sorted((s for s in series if s["active"] and s["socket_id"] not in used),
+                       key=lambda s: s["first_seen"] or "")
+    unmatched_sessions = sorted((s for s in sessions if s["stats"] is None),
+                                key=lambda s: s.get("connected_at") or "")
+    for session, stats in zip(unmatched_sessions, remaining):
+        session["stats"] = stats
+        used.add(stats["socket_id"])
+
+    return [s for s in series if s["active"] and s["socket_id"] not in used]
+
+
+# Global ingester registry keyed by stats file path
+_ingesters: Dict[str, StatsIngester] = {}
+_ingesters_lock = threading.Lock()
+
+
+def get_stats_ingester(stats_file: Path) -> StatsIngester:
+    """Get the ingester of a stats file, ingesting newly appended rows"""
+    key = str(stats_file)
+    with _ingesters_lock:
+        ingester = _ingesters.get(key)
+        if ingester is None:
+            ingester = StatsIngester(stats_file)
+            _ingesters[key] = ingester
+    ingester.refresh()
+    return ingester
+
+
+def drop_stats_ingester(stats_file: Path):
+    """Forget the ingester of a stats file (e.g. when its channel is deleted)"""
+    with _ingesters_lock:
+        _ingesters.pop(str(stats_file), None)
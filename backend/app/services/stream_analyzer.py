@@ -2,17 +2,60 @@
 
 import asyncio
 import json
+import os
 import subprocess
+import tempfile
+import time
+from collections import deque
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Deque, Dict, List, Optional
 import threading
 
+from ..core.executors import run_io
+from ..core.singleflight import single_flight
+from .probe_runner import run_probe
+from .probe_scheduler import ProbeScheduler
+from .srt_stats_service import prune_srt_stats, read_recv_rate, update_ts_health
+from .ts_tap import all_taps, close_taps, ensure_tap, resolve_tap_source
+
 # Global cache for stream info
 _stream_info_cache: Dict[str, dict] = {}
 _cache_lock = threading.Lock()
+# Channels whose persisted entry is out of date
+_dirty_entries: set = set()
+_cache_evicted = False
+# Serializes cache file writes so an older snapshot never replaces a newer one
+_save_lock = threading.Lock()
 _analyzer_task = None
 
+# Maximum number of ffprobe processes running at once (defaults to CPU count)
+ANALYZER_CONCURRENCY = int(os.getenv("ANALYZER_CONCURRENCY", "0")) or (os.cpu_count() or 4)
+_probe_semaphore: Optional[asyncio.Semaphore] = None
+
+# Concurrent probes of one channel share a single ffprobe; its result is
+# reused by further probe requests for this many seconds
+PROBE_REUSE_TTL = float(os.getenv("PROBE_REUSE_TTL", "5"))
+
+# "ffprobe" probes every channel; "passive" reads stream info from the channel's
+# tap (tap_port or UDP multicast input) and only falls back to ffprobe for
+# channels without a tap source
+STREAM_ANALYZER_MODE = os.getenv("STREAM_ANALYZER_MODE", "ffprobe").lower()
+
+# Watch transport stream health on every channel with a tap source. Each tap
+# joins/binds its source in-process and parses every packet (~1.5% of a core
+# per 10 Mbit/s, up to 2 MB of batch buffer plus a 4 MB socket buffer), so it
+# is on by default only in passive mode, which opens the taps anyway
+TS_HEALTH_ENABLED = os.getenv(
+    "TS_HEALTH_ENABLED", "1" if STREAM_ANALYZER_MODE == "passive" else "0"
+).lower() in ("1", "true", "yes")
+
+# Per-channel adaptive probe intervals (base interval set by start_analyzer)
+_scheduler = ProbeScheduler()
+
+# Per-cycle timing of the background analyzer
+_cycle_history: Deque[dict] = deque(maxlen=60)
+
 CACHE_FILE = Path("static/stream_info_cache.json")
 
 
@@ -28,20 +71,74 @@ def get_all_cached_stream_info() -> Dict[str, dict]:
         return dict(_stream_info_cache)
 
 
-def analyze_stream_sync(channel: dict) -> dict:
-    """Analyze stream using ffprobe - synchronous version"""
-    channel_name = channel.get("channel_name", "unknown")
+# Fields that change on every probe without the stream changing - updating
+# them alone does not make an entry dirty. Measured bitrates differ between
+# any two probes; the stream fingerprint is codec, resolution, fps, PIDs and
+# tracks.
+_VOLATILE_FIELDS = frozenset({
+    "last_update", "probe_duration_s", "probe_wait_s", "probe_resources",
+    "probe_reason", "tap", "pid_bitrates", "total_bitrate", "total_bitrate_mbps",
+})
+_VOLATILE_STREAM_FIELDS = frozenset({"bitrate"})
+_STREAM_LISTS = ("video_streams", "audio_streams")
 
-    # For running channels, probe the input stream
-    if channel.get("status") != "running":
-        return {
-            "channel_name": channel_name,
-            "status": "offline",
-            "error": "Channel not running",
-            "last_update": datetime.now().isoformat()
-        }
 
-    # Build probe URL - always probe INPUT (more reliable than output)
+def _persistent_view(info: Optional[dict]) -> Optional[dict]:
+    if info is None:
+        return None
+    view = {k: v for k, v in info.items() if k not in _VOLATILE_FIELDS}
+    for key in _STREAM_LISTS:
+        if isinstance(view.get(key), list):
+            view[key] = [{k: v for k, v in stream.items() if k not in _VOLATILE_STREAM_FIELDS}
+                         if isinstance(stream, dict) else stream for stream in view[key]]
+    return view
+
+
+def set_cached_stream_info(channel_name: str, info: dict):
+    """Store a cache entry, marking it dirty only if its content changed"""
+    with _cache_lock:
+        previous = _stream_info_cache.get(channel_name)
+        _stream_info_cache[channel_name] = info
+        if _persistent_view(previous) != _persistent_view(info):
+            _dirty_entries.add(channel_name)
+
+
+def drop_stream_info(channel_name: str):
+    """Forget the cache entry of a channel (e.g. when it is deleted)"""
+    global _cache_evicted
+    with _cache_lock:
+        if _stream_info_cache.pop(channel_name, None) is not None:
+            _dirty_entries.discard(channel_name)
+            _cache_evicted = True
+
+
+def evict_stream_info(keep: set) -> int:
+    """Remove cache entries of channels not in `keep` (deleted channels)"""
+    global _cache_evicted
+    with _cache_lock:
+        stale = [name for name in _stream_info_cache if name not in keep]
+        for name in stale:
+            del _stream_info_cache[name]
+            _dirty_entries.discard(name)
+        if stale:
+            _cache_evicted = True
+    return len(stale)
+
+
+PROBE_TIMEOUT = 12
+
+
+def _offline_info(channel_name: str) -> dict:
+    return {
+        "channel_name": channel_name,
+        "status": "offline",
+        "error": "Channel not running",
+        "last_update": datetime.now().isoformat()
+    }
+
+
+def build_probe_url(channel: dict) -> str:
+    """Build the ffprobe URL for a channel - always probe INPUT (more reliable than output)"""
     input_protocol = channel.get("input_protocol", "udp")
     input_ip = channel.get("input_ip", "0.0.0.0")
     input_port = channel.get("input_port", 9000)
@@ -67,24 +164,107 @@ def analyze_stream_sync(channel: dict) -> dict:
     else:
         probe_url = f"{input_protocol}://{input_ip}:{input_port}"
 
-    try:
-        cmd = [
-            "ffprobe",
-            "-v", "quiet",
-            "-print_format", "json",
-            "-show_format",
-            "-show_streams",
-            "-analyzeduration", "3000000",
-            "-probesize", "3000000",
-            "-rw_timeout", "5000000",
-            probe_url
-        ]
+    return probe_url
+
+
+def build_probe_command(probe_url: str) -> List[str]:
+    """ffprobe command line for a probe URL"""
+    return [
+        "ffprobe",
+        "-v", "quiet",
+        "-print_format", "json",
+        "-show_format",
+        "-show_streams",
+        "-analyzeduration", "3000000",
+        "-probesize", "3000000",
+        "-rw_timeout", "5000000",
+        probe_url
+    ]
+
+
+def parse_probe_output(channel_name: str, probe_url: str, data: dict) -> dict:
+    """Transform ffprobe JSON output into a stream info cache entry"""
+    streams = data.get("streams", [])
+    format_info = data.get("format", {})
+
+    video_streams = []
+    audio_streams = []
+
+    for stream in streams:
+        codec_type = stream.get("codec_type", "")
+
+        if codec_type == "video":
+            fps = 0
+            fps_str = stream.get("r_frame_rate", "0/1")
+            if "/" in str(fps_str):
+                try:
+                    num, den = fps_str.split("/")
+                    fps = float(num) / float(den) if float(den) > 0 else 0
+                except:
+                    fps = 0
+            else:
+                try:
+                    fps = float(fps_str)
+                except:
+                    fps = 0
+
+            video_streams.append({
+                "index": stream.get("index", 0),
+                "codec": stream.get("codec_name", "unknown"),
+                "profile": stream.get("profile", ""),
+                "width": stream.get("width", 0),
+                "height": stream.get("height", 0),
+                "resolution": f"{stream.get('width', 0)}x{stream.get('height', 0)}",
+                "fps": round(fps, 2),
+                "bitrate": int(stream.get("bit_rate", 0)) if stream.get("bit_rate") else None,
+                "pix_fmt": stream.get("pix_fmt", ""),
+            })
+
+        elif codec_type == "audio":
+            audio_streams.append({
+                "index": stream.get("index", 0),
+                "codec": stream.get("codec_name", "unknown"),
+                "sample_rate": int(stream.get("sample_rate", 0)) if stream.get("sample_rate") else 0,
+                "channels": stream.get("channels", 0),
+                "channel_layout": stream.get("channel_layout", ""),
+                "bitrate": int(stream.get("bit_rate", 0)) if stream.get("bit_rate") else None,
+                "language": stream.get("tags", {}).get("language", ""),
+            })
+
+    total_bitrate = int(format_info.get("bit_rate", 0)) if format_info.get("bit_rate") else None
+
+    return {
+        "channel_name": channel_name,
+        "status": "online",
+        "success": True,
+        "probe_url": probe_url,
+        "format": format_info.get("format_name", "unknown"),
+        "total_bitrate": total_bitrate,
+        "total_bitrate_mbps": round(total_bitrate / 1000000, 2) if total_bitrate else None,
+        "video_streams": video_streams,
+        "audio_streams": audio_streams,
+        "video_count": len(video_streams),
+        "audio_count": len(audio_streams),
+        "last_update": datetime.now().isoformat()
+    }
+
 
+def analyze_stream_sync(channel: dict) -> dict:
+    """Analyze stream using ffprobe - synchronous version"""
+    channel_name = channel.get("channel_name", "unknown")
+
+    # For running channels, probe the input stream
+    if channel.get("status") != "running":
+        return _offline_info(channel_name)
+
+    probe_url = build_probe_url(channel)
+
+    try:
         result = subprocess.run(
-            cmd,
+            build_probe_command(probe_url),
             capture_output=True,
             text=True,
-            timeout=12
+            timeout=PROBE_TIMEOUT
         )
 
         if result.returncode != 0:
@@ -96,70 +276,7 @@ def analyze_stream_sync(channel: dict) -> dict:
                 "last_update": datetime.now().isoformat()
             }
 
-        data = json.loads(result.stdout)
-        streams = data.get("streams", [])
-        format_info = data.get("format", {})
-
-        video_streams = []
-        audio_streams = []
-
-        for stream in streams:
-            codec_type = stream.get("codec_type", "")
-
-            if codec_type == "video":
-                fps = 0
-                fps_str = stream.get("r_frame_rate", "0/1")
-                if "/" in str(fps_str):
-                    try:
-                        num, den = fps_str.split("/")
-                        fps = float(num) / float(den) if float(den) > 0 else 0
-                    except:
-                        fps = 0
-                else:
-                    try:
-                        fps = float(fps_str)
-                    except:
-                        fps = 0
-
-                video_streams.append({
-                    "index": stream.get("index", 0),
-                    "codec": stream.get("codec_name", "unknown"),
-                    "profile": stream.get("profile", ""),
-                    "width": stream.get("width", 0),
-                    "height": stream.get("height", 0),
-                    "resolution": f"{stream.get('width', 0)}x{stream.get('height', 0)}",
-                    "fps": round(fps, 2),
-                    "bitrate": int(stream.get("bit_rate", 0)) if stream.get("bit_rate") else None,
-                    "pix_fmt": stream.get("pix_fmt", ""),
-                })
-
-            elif codec_type == "audio":
-                audio_streams.append({
-                    "index": stream.get("index", 0),
-                    "codec": stream.get("codec_name", "unknown"),
-                    "sample_rate": int(stream.get("sample_rate", 0)) if stream.get("sample_rate") else 0,
-                    "channels": stream.get("channels", 0),
-                    "channel_layout": stream.get("channel_layout", ""),
-                    "bitrate": int(stream.get("bit_rate", 0)) if stream.get("bit_rate") else None,
-                    "language": stream.get("tags", {}).get("language", ""),
-                })
-
-        total_bitrate = int(format_info.get("bit_rate", 0)) if format_info.get("bit_rate") else None
-
-        return {
-            "channel_name": channel_name,
-            "status": "online",
-            "success": True,
-            "probe_url": probe_url,
-            "format": format_info.get("format_name", "unknown"),
-            "total_bitrate": total_bitrate,
-            "total_bitrate_mbps": round(total_bitrate / 1000000, 2) if total_bitrate else None,
-            "video_streams": video_streams,
-            "audio_streams": audio_streams,
-            "video_count": len(video_streams),
-            "audio_count": len(audio_streams),
-            "last_update": datetime.now().isoformat()
-        }
+        return parse_probe_output(channel_name, probe_url, json.loads(result.stdout))
 
     except subprocess.TimeoutExpired:
         return {
@@ -178,15 +295,81 @@ def analyze_stream_sync(channel: dict) -> dict:
         }
 
 
-def save_cache():
-    """Save cache to file"""
-    try:
-        CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
-        with open(CACHE_FILE, 'w') as f:
+async def analyze_stream(channel: dict) -> dict:
+    """Analyze stream using ffprobe as a native asyncio subprocess"""
+    channel_name = channel.get("channel_name", "unknown")
+
+    if channel.get("status") != "running":
+        return _offline_info(channel_name)
+
+    probe_url = build_probe_url(channel)
+    result = await run_probe(build_probe_command(probe_url), timeout=PROBE_TIMEOUT)
+
+    if result.ok:
+        try:
+            info = parse_probe_output(channel_name, probe_url, result.data)
+        except Exception as e:
+            info = {
+                "channel_name": channel_name,
+                "status": "error",
+                "error": str(e),
+                "last_update": datetime.now().isoformat()
+            }
+    else:
+        info = {
+            "channel_name": channel_name,
+            "status": "timeout" if result.timed_out else "error",
+            "error": result.error or "Probe failed",
+            "probe_url": probe_url,
+            "last_update": datetime.now().isoformat()
+        }
+
+    info["probe_resources"] = result.resources()
+    return info
+
+
+def save_cache(force: bool = False) -> bool:
+    """
+    Save cache to file if any entry changed.
+
+    Only a snapshot is taken under the cache lock; the file is written
+    compactly to a temp file and atomically renamed over the old one, so a
+    crash never leaves a truncated cache behind.
+    """
+    global _cache_evicted
+    with _save_lock:
+        with _cache_lock:
+            if not force and not _dirty_entries and not _cache_evicted:
+                return False
+            snapshot = dict(_stream_info_cache)
+            dirty = set(_dirty_entries)
+            _dirty_entries.clear()
+            evicted, _cache_evicted = _cache_evicted, False
+
+        tmp_path = None
+        try:
+            data = json.dumps(snapshot, separators=(",", ":"))
+            CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile('w', dir=CACHE_FILE.parent, prefix=f".{CACHE_FILE.name}.",
+                                             suffix=".tmp", delete=False) as f:
+                tmp_path = f.name
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, CACHE_FILE)
+            return True
+        except Exception as e:
+            print(f"Error saving stream info cache: {e}")
+            if tmp_path:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+            # Retry on the next cycle
             with _cache_lock:
-                json.dump(_stream_info_cache, f, indent=2)
-    except Exception as e:
-        print(f"Error saving stream info cache: {e}")
+                _dirty_entries.update(name for name in dirty if name in _stream_info_cache)
+                _cache_evicted = _cache_evicted or evicted
+            return False
 
 
 def load_cache():
@@ -195,58 +378,194 @@ def load_cache():
     try:
         if CACHE_FILE.exists():
             with open(CACHE_FILE, 'r') as f:
-                with _cache_lock:
-                    _stream_info_cache = json.load(f)
+                data = json.load(f)
+            with _cache_lock:
+                _stream_info_cache = data
+                _dirty_entries.clear()
     except Exception as e:
         print(f"Error loading stream info cache: {e}")
 
 
-async def analyze_all_channels():
-    """Analyze all running channels"""
-    from .channel_service import load_channels
+def _get_probe_semaphore() -> asyncio.Semaphore:
+    global _probe_semaphore
+    if _probe_semaphore is None:
+        _probe_semaphore = asyncio.Semaphore(ANALYZER_CONCURRENCY)
+    return _probe_semaphore
 
-    channels = load_channels()
 
-    for channel in channels:
-        if channel.status == "running":
-            # Run ffprobe in thread pool to not block
-            loop = asyncio.get_event_loop()
-            info = await loop.run_in_executor(
-                None,
-                analyze_stream_sync,
-                channel.model_dump()
-            )
-
-            with _cache_lock:
-                _stream_info_cache[channel.channel_name] = info
-
-    # Clean up stopped channels from cache
-    running_names = {ch.channel_name for ch in channels if ch.status == "running"}
-    with _cache_lock:
-        for name in list(_stream_info_cache.keys()):
-            if name not in running_names:
-                _stream_info_cache[name]["status"] = "offline"
+async def passive_info(channel: dict) -> Optional[dict]:
+    """Stream info from the channel's tap, or None when it has no tap source"""
+    channel_name = channel["channel_name"]
+    if channel.get("status") != "running":
+        return None
+
+    tap = await ensure_tap(channel)
+    if tap is None:
+        return None
+
+    info = tap.analyzer.snapshot()
+    if not tap.datagrams:
+        info["error"] = "No stream data on tap"
+    elif not tap.analyzer.is_live():
+        info["error"] = "Tap stream stalled"
+    elif not info["success"]:
+        info["error"] = "Waiting for PAT/PMT"
+    info["tap"] = tap.stats()
+    info["probe_duration_s"] = 0.0
+    info["probe_wait_s"] = 0.0
+    set_cached_stream_info(channel_name, info)
+    return info
+
+
+def _channel_recv_rate(channel: dict) -> Optional[float]:
+    stats_file = channel.get("stats_file")
+    return read_recv_rate(Path(stats_file)) if stats_file else None
+
+
+def _recv_rates(channels: List[dict]) -> Dict[str, Optional[float]]:
+    return {ch["channel_name"]: _channel_recv_rate(ch) for ch in channels}
+
+
+async def probe_channel(channel: dict, delay: float = 0, reason: str = "forced") -> dict:
+    """Probe one channel through the shared concurrency limit and cache the result"""
+    if STREAM_ANALYZER_MODE == "passive":
+        info = await passive_info(channel)
+        if info is not None:
+            return info
+
+    if delay > 0:
+        await asyncio.sleep(delay)
+
+    return await single_flight.do(
+        ("probe", channel["channel_name"]),
+        lambda: _probe_now(channel, reason),
+        ttl=PROBE_REUSE_TTL
+    )
+
+
+async def _probe_now(channel: dict, reason: str) -> dict:
+    queued = time.monotonic()
+    async with _get_probe_semaphore():
+        started = time.monotonic()
+        info = await analyze_stream(channel)
+
+    info["probe_duration_s"] = round(time.monotonic() - started, 3)
+    info["probe_wait_s"] = round(started - queued, 3)
+    info["probe_reason"] = reason
+    rate = await run_io(_channel_recv_rate, channel)
+    _scheduler.record(channel["channel_name"], info, rate, reason)
+    set_cached_stream_info(channel["channel_name"], info)
+    return info
+
+
+async def analyze_all_channels(interval: float = 0):
+    """
+    Analyze the running channels that are due for a probe, concurrently.
+
+    Probe start times are spread evenly across `interval` seconds so a large
+    fleet does not launch every ffprobe at the same moment.
+    """
+    from .channel_service import load_channels
 
-    save_cache()
+    cycle_started = time.monotonic()
+    channels = await run_io(load_channels)
+    running = [ch.model_dump() for ch in channels if ch.status == "running"]
+    rates = await run_io(_recv_rates, running)
+
+    due = []
+    for ch in running:
+        if TS_HEALTH_ENABLED and resolve_tap_source(ch):
+            await ensure_tap(ch)
+        if STREAM_ANALYZER_MODE == "passive" and resolve_tap_source(ch):
+            # Reading a tap is cheap - refresh every cycle
+            due.append((ch, "passive"))
+            continue
+        reason = _scheduler.due(ch, rates[ch["channel_name"]])
+        if reason:
+            due.append((ch, reason))
+
+    spacing = interval / len(due) if interval and due else 0
+    results = await asyncio.gather(
+        *(probe_channel(ch, i * spacing, reason) for i, (ch, reason) in enumerate(due)),
+        return_exceptions=True
+    )
+
+    # Clean up stopped channels from cache, drop deleted ones
+    running_names = {ch["channel_name"] for ch in running}
+    close_taps(keep=running_names)
+    _scheduler.forget(running_names)
+    prune_srt_stats(running_names)
+    for name, tap in all_taps().items():
+        update_ts_health(name, tap.health.snapshot())
+    evict_stream_info({ch.channel_name for ch in channels})
+    for name, info in get_all_cached_stream_info().items():
+        if name not in running_names and info.get("status") != "offline":
+            set_cached_stream_info(name, {**info, "status": "offline"})
+
+    await run_io(save_cache)
+
+    durations = [r["probe_duration_s"] for r in results if isinstance(r, dict)]
+    waits = [r["probe_wait_s"] for r in results if isinstance(r, dict)]
+    cpu = [r["probe_resources"]["cpu_s"] for r in results
+           if isinstance(r, dict) and r.get("probe_resources", {}).get("cpu_s") is not None]
+    cycle = {
+        "started_at": datetime.now().isoformat(),
+        "duration_s": round(time.monotonic() - cycle_started, 3),
+        "channels": len(running),
+        "probed": len(due),
+        "skipped": len(running) - len(due),
+        "online": sum(1 for r in results if isinstance(r, dict) and r.get("success")),
+        "failed": sum(1 for r in results if not isinstance(r, dict) or not r.get("success")),
+        "avg_probe_s": round(sum(durations) / len(durations), 3) if durations else 0.0,
+        "max_probe_s": max(durations) if durations else 0.0,
+        "max_wait_s": max(waits) if waits else 0.0,
+        "probe_cpu_s": round(sum(cpu), 3),
+        "passive": sum(1 for r in results if isinstance(r, dict) and r.get("analyzer") == "passive"),
+        "concurrency": ANALYZER_CONCURRENCY,
+        "interval_s": interval,
+    }
+    _cycle_history.append(cycle)
+
+    if interval and cycle["duration_s"] > interval * 1.5:
+        print(f"Stream analyzer falling behind: {cycle['probed']} probes took {cycle['duration_s']}s (interval {interval}s)")
+
+    return cycle
+
+
+def get_analyzer_stats() -> dict:
+    """Timing of recent analyzer cycles"""
+    history = list(_cycle_history)
+    return {
+        "mode": STREAM_ANALYZER_MODE,
+        "concurrency": ANALYZER_CONCURRENCY,
+        "cycles": len(history),
+        "last_cycle": history[-1] if history else None,
+        "avg_cycle_s": round(sum(c["duration_s"] for c in history) / len(history), 3) if history else 0.0,
+        "history": history,
+        "schedule": _scheduler.snapshot(),
+        "single_flight": single_flight.stats(),
+    }
 
 
 async def stream_analyzer_loop(interval: int = 10):
     """Background loop to analyze streams periodically"""
-    print(f"Stream analyzer started (interval: {interval}s)")
+    print(f"Stream analyzer started (mode: {STREAM_ANALYZER_MODE}, interval: {interval}s, concurrency: {ANALYZER_CONCURRENCY})")
 
     while True:
+        started = time.monotonic()
         try:
-            await analyze_all_channels()
+            await analyze_all_channels(interval)
         except Exception as e:
             print(f"Stream analyzer error: {e}")
 
-        await asyncio.sleep(interval)
+        # Probes are already spread across the interval - only sleep the remainder
+        await asyncio.sleep(max(interval - (time.monotonic() - started), 1))
 
 
 def start_analyzer(interval: int = 10):
-    """Start the background analyzer task"""
+    """Start the background analyzer task (load_cache() first)"""
     global _analyzer_task
-    load_cache()
+    _scheduler.base_interval = interval
 
     loop = asyncio.get_event_loop()
     _analyzer_task = loop.create_task(stream_analyzer_loop(interval))
@@ -259,3 +578,4 @@ def stop_analyzer():
     if _analyzer_task:
         _analyzer_task.cancel()
         _analyzer_task = None
+    close_taps()
@@ -0,0 +1,75 @@
+"""
+Server resource usage - CPU, RAM and network rates
+
+Network rates are computed against the previous sample. Samples are shared
+for a second through single-flight, so the telemetry publisher and REST
+pollers do not shrink each other's rate window.
+"""
+
+import time
+
+import psutil
+
+from ..core.singleflight import single_flight
+from ..models.system import ServerStats
+
+SERVER_STATS_TTL = 1.0
+
+# Store previous network stats for rate calculation
+_prev_net_stats = {
+    'bytes_sent': 0,
+    'bytes_recv': 0,
+    'timestamp': time.time()
+}
+
+
+def collect_server_stats() -> ServerStats:
+    """Server resource usage (shared by concurrent callers)"""
+    return single_flight.do_sync(("system", "stats"), _sample_server_stats, ttl=SERVER_STATS_TTL)
+
+
+def _sample_server_stats() -> ServerStats:
+    global _prev_net_stats
+
+    # CPU usage (non-blocking, uses cached value)
+    cpu_percent = psutil.cpu_percent(interval=None)
+
+    # Memory usage
+    memory = psutil.virtual_memory()
+    memory_percent = memory.percent
+    memory_used_gb = memory.used / (1024 ** 3)
+    memory_total_gb = memory.total / (1024 ** 3)
+
+    # Network usage
+    net_io = psutil.net_io_counters()
+    current_time = time.time()
+
+    # Calculate rates
+    time_delta = current_time - _prev_net_stats['timestamp']
+    if time_delta > 0:
+        bytes_sent_delta = net_io.bytes_sent - _prev_net_stats['bytes_sent']
+        bytes_recv_delta = net_io.bytes_recv - _prev_net_stats['bytes_recv']
+        # Convert to Mbps (megabits per second)
+        rate_sent_mbps = (bytes_sent_delta * 8) / (time_delta * 1_000_000)
+        rate_recv_mbps = (bytes_recv_delta * 8) / (time_delta * 1_000_000)
+    else:
+        rate_sent_mbps = 0.0
+        rate_recv_mbps = 0.0
+
+    # Update previous stats
+    _prev_net_stats = {
+        'bytes_sent': net_io.bytes_sent,
+        'bytes_recv': net_io.bytes_recv,
+        'timestamp': current_time
+    }
+
+    return ServerStats(
+        cpu_percent=round(cpu_percent, 1),
+        memory_percent=round(memory_percent, 1),
+        memory_used_gb=round(memory_used_gb, 2),
+        memory_total_gb=round(memory_total_gb, 2),
+        network_bytes_sent=net_io.bytes_sent,
+        network_bytes_recv=net_io.bytes_recv,
+        network_rate_sent_mbps=round(rate_sent_mbps, 2),
+        network_rate_recv_mbps=round(rate_recv_mbps, 2)
+    )
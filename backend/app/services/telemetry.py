@@ -0,0 +1,341 @@
+"""
+Telemetry publisher - pushes channel and server telemetry over the WebSocket
+
+Clients subscribe to topics on /ws ("fleet", "system", "channel:<name>",
+"logs:<name>"). Every TELEMETRY_INTERVAL seconds the publisher samples only
+what has subscribers - once per sample, however many clients watch it - and
+pushes what changed: stats samples, status changes, media info updates, new
+log lines, the fleet summary and server stats. With no subscribers a tick
+does no work.
+"""
+
+import asyncio
+import os
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from ..core.executors import run_io
+from ..core.websocket import manager
+from ..models.channel import Channel
+from .channel_service import load_channels, check_channel_status, get_channel_log_files, STATS_FOLDER
+from .connection_index import get_connection_index
+from .log_tail import FileTail
+from .srt_stats_service import parse_srt_stats_csv, get_ts_health
+from .stream_analyzer import get_cached_stream_info
+from .system_stats import collect_server_stats
+
+TELEMETRY_INTERVAL = float(os.getenv("TELEMETRY_INTERVAL", "2"))
+# Log lines pushed per file and tick; older ones are skipped (and counted)
+LOG_LINES_PER_TICK = 200
+
+_publisher_task = None
+
+
+def channel_stats_path(channel: Channel) -> Path:
+    """Stats CSV of a channel (the configured one, else the default location)"""
+    if channel.stats_file:
+        return Path(channel.stats_file)
+    sanitized_name = channel.channel_name.replace(' ', '_').replace('/', '_').replace('\\', '_')
+    return STATS_FOLDER / f"{sanitized_name}.csv"
+
+
+def read_channel_stats(channel: Channel) -> Optional[dict]:
+    """Latest SRT stats row of a running channel"""
+    if channel.status != "running":
+        return None
+    stats_file = channel_stats_path(channel)
+    return parse_srt_stats_csv(stats_file) if stats_file.exists() else None
+
+
+def build_fleet_summary(channels: Optional[List[Channel]] = None,
+                        channel_stats: Optional[Dict[str, Optional[dict]]] = None) -> dict:
+    """
+    Analytics summary for the dashboard: channel counts, total bandwidth,
+    packet loss, average RTT and per-channel quick stats. Stats already read
+    by the caller can be passed in `channel_stats`.
+    """
+    if channels is None:
+        channels = load_channels()
+
+    summary = {
+        "total_channels": len(channels),
+        "running": 0,
+        "stopped": 0,
+        "total_bandwidth_mbps": 0.0,
+        "total_send_rate_mbps": 0.0,
+        "total_recv_rate_mbps": 0.0,
+        "total_packet_loss": 0,
+        "avg_rtt_ms": 0.0,
+        "channels": []
+    }
+
+    rtt_values = []
+
+    for channel in channels:
+        check_channel_status(channel)
+
+        ch_info = {
+            "name": channel.channel_name,
+            "status": channel.status,
+            "pid": channel.pid,
+            "pids": channel.pids,
+            "start_date": channel.start_date,
+            "srt_stats": None,
+            "media_info": None,
+            "connections": [],
+        }
+
+        if channel.status == "running":
+            summary["running"] += 1
+
+            # Get SRT stats
+            if channel_stats is not None and channel.channel_name in channel_stats:
+                stats = channel_stats[channel.channel_name]
+            else:
+                stats = read_channel_stats(channel)
+            if stats:
+                ch_info["srt_stats"] = {
+                    "bandwidth_mbps": stats.get("bandwidth_mbps", 0),
+                    "send_rate_mbps": stats.get("send_rate_mbps", 0),
+                    "recv_rate_mbps": stats.get("recv_rate_mbps", 0),
+                    "rtt_ms": stats.get("rtt_ms", 0),
+                    "packets_lost": stats.get("packets_lost_recv", 0) + stats.get("packets_lost_send", 0),
+                }
+
+                summary["total_bandwidth_mbps"] += stats.get("bandwidth_mbps", 0)
+                summary["total_send_rate_mbps"] += stats.get("send_rate_mbps", 0)
+                summary["total_recv_rate_mbps"] += stats.get("recv_rate_mbps", 0)
+                summary["total_packet_loss"] += stats.get("packets_lost_recv", 0) + stats.get("packets_lost_send", 0)
+
+                if stats.get("rtt_ms", 0) > 0:
+                    rtt_values.append(stats["rtt_ms"])
+
+            # Get media info
+            stream_info = get_cached_stream_info(channel.channel_name)
+            if stream_info and stream_info.get("success"):
+                ch_info["media_info"] = {
+                    "resolution": stream_info.get("video_streams", [{}])[0].get("resolution") if stream_info.get("video_streams") else None,
+                    "bitrate_mbps": stream_info.get("total_bitrate_mbps"),
+                }
+
+            # Get connections from the incremental SRT log index (more reliable than ss for SRT)
+            for log_info in get_channel_log_files(channel):
+                try:
+                    index = get_connection_index(log_info["file"])
+                    for client in index.active_clients():
+                        ch_info["connections"].append({
+                            "remote_ip": client["ip"],
+                            "remote_port": client["port"],
+                            "local_port": channel.output_port,
+                            "direction": "output",
+                            "state": "ESTAB"
+                        })
+                except Exception as e:
+                    print(f"Error reading connection index for {channel.channel_name}: {e}")
+        else:
+            summary["stopped"] += 1
+
+        summary["channels"].append(ch_info)
+
+    if rtt_values:
+        summary["avg_rtt_ms"] = round(sum(rtt_values) / len(rtt_values), 2)
+
+    return summary
+
+
+def _stats_signature(stats: dict) -> Tuple:
+    return (stats.get("timestamp"), stats.get("socket_id"),
+            stats.get("packets_sent"), stats.get("packets_received"))
+
+
+class TelemetryPublisher:
+    """Samples subscribed telemetry once per tick and publishes the changes"""
+
+    def __init__(self, interval: float = TELEMETRY_INTERVAL):
+        self.interval = interval
+        self._status: Dict[str, str] = {}
+        self._samples: Dict[str, Tuple] = {}
+        self._media: Dict[str, Optional[str]] = {}
+        self._fleet: Optional[dict] = None
+        self._log_tails: Dict[str, FileTail] = {}
+        # Last message per topic and kind, replayed to new subscribers
+        self._latest: Dict[str, Dict[Tuple, dict]] = {}
+        self._wake: Optional[asyncio.Event] = None
+        self.counters = {"ticks": 0, "idle_ticks": 0, "published": 0}
+        self.last_tick_ms = 0.0
+
+    def wake(self):
+        """Run the next tick now (e.g. after a new subscription)"""
+        if self._wake:
+            self._wake.set()
+
+    async def send_latest(self, websocket, topics):
+        """Replay the last known telemetry of `topics` to one connection"""
+        for topic in topics:
+            for message in list(self._latest.get(topic, {}).values()):
+                await manager.send_personal_message({**message, "topic": topic}, websocket)
+        self.wake()
+
+    async def tick(self):
+        topics = manager.subscribed_topics()
+        if not topics:
+            self.counters["idle_ticks"] += 1
+            return
+
+        started = time.perf_counter()
+        messages = await run_io(self._collect, topics)
+        for topic, key, message in messages:
+            # Keyed messages are state (latest wins), unkeyed ones a stream
+            if key is not None:
+                self._latest.setdefault(topic, {})[key] = message
+            await manager.publish(topic, message, coalesce=key is not None)
+        self.counters["ticks"] += 1
+        self.counters["published"] += len(messages)
+        self.last_tick_ms = round((time.perf_counter() - started) * 1000, 2)
+
+    def _collect(self, topics: set) -> List[Tuple[str, Tuple, dict]]:
+        """
+        Sample subscribed telemetry, returning (topic, kind key, message) for
+        changes; the key is None for stream messages (log lines)
+        """
+        messages = []
+        fleet = "fleet" in topics
+        channels = load_channels()
+        names = set()
+        log_files = set()
+
+        for channel in channels:
+            check_channel_status(channel)
+            name = channel.channel_name
+            names.add(name)
+            topic = f"channel:{name}"
+            watched = topic in topics
+            targets = ([topic] if watched else []) + (["fleet"] if fleet else [])
+
+            previous = self._status.get(name)
+            self._status[name] = channel.status
+            if previous is not None and previous != channel.status:
+                message = {"type": "channel_status", "channel_name": name,
+                           "status": channel.status, "pid": channel.pid}
+                messages += [(t, ("channel_status", name), message) for t in targets]
+
+            if f"logs:{name}" in topics:
+                messages += self._collect_logs(channel, log_files)
+
+            if not targets:
+                continue
+
+            info = get_cached_stream_info(name)
+            version = info.get("last_update") if info else None
+            if version != self._media.get(name):
+                self._media[name] = version
+                if info:
+                    message = {"type": "media_info", "channel_name": name, "info": info}
+                    messages += [(t, ("media_info", name), message) for t in targets]
+
+            if watched and channel.status == "running":
+                stats = read_channel_stats(channel)
+                if stats:
+                    signature = _stats_signature(stats)
+                    if signature != self._samples.get(name):
+                        self._samples[name] = signature
+                        messages.append((topic, ("stats_sample",), {
+                            "type": "stats_sample",
+                            "channel_name": name,
+                            "stats": stats,
+                            "ts_health": get_ts_health(name),
+                        }))
+
+        # Forget deleted channels
+        for state in (self._status, self._samples, self._media):
+            for name in [n for n in state if n not in names]:
+                del state[name]
+        for topic in [t for t in self._latest if t.startswith("channel:") and t[8:] not in names]:
+            del self._latest[topic]
+        for path in [p for p in self._log_tails if p not in log_files]:
+            del self._log_tails[path]
+
+        if fleet:
+            summary = build_fleet_summary(channels)
+            if summary != self._fleet:
+                self._fleet = summary
+                messages.append(("fleet", ("fleet_summary",), {"type": "fleet_summary", "summary": summary}))
+
+        if "system" in topics:
+            messages.append(("system", ("server_stats",), {
+                "type": "server_stats",
+                "stats": collect_server_stats().model_dump(),
+            }))
+
+        return messages
+
+    def _collect_logs(self, channel: Channel, log_files: set) -> List[Tuple[str, None, dict]]:
+        """New log lines of a channel since the previous tick"""
+        messages = []
+        topic = f"logs:{channel.channel_name}"
+        for log_info in get_channel_log_files(channel):
+            path = str(log_info["file"])
+            log_files.add(path)
+            tail = self._log_tails.get(path)
+            if tail is None:
+                # New subscription - history comes from the REST log endpoints
+                tail = FileTail(log_info["file"])
+                tail.seek_end()
+                self._log_tails[path] = tail
+                continue
+            lines = tail.read_lines()
+            if not lines:
+                continue
+            skipped = max(len(lines) - LOG_LINES_PER_TICK, 0)
+            messages.append((topic, None, {
+                "type": "log_lines",
+                "channel_name": channel.channel_name,
+                "process_idx": log_info["process_idx"],
+                "lines": [line for _, line in lines[skipped:]],
+                "skipped": skipped,
+            }))
+        return messages
+
+    async def run(self):
+        self._wake = asyncio.Event()
+        print(f"Telemetry publisher started (interval: {self.interval}s)")
+        while True:
+            try:
+                await self.tick()
+            except Exception as e:
+                print(f"Telemetry publisher error: {e}")
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+
+    def stats(self) -> dict:
+        return {
+            **self.counters,
+            "interval_s": self.interval,
+            "last_tick_ms": self.last_tick_ms,
+            "topics": sorted(manager.subscribed_topics()),
+            "websocket": manager.stats(),
+        }
+
+
+# Global publisher instance
+publisher = TelemetryPublisher()
+
+
+def start_telemetry():
+    """Start the background telemetry publisher"""
+    global _publisher_task
+    loop = asyncio.get_event_loop()
+    _publisher_task = loop.create_task(publisher.run())
+    return _publisher_task
+
+
+def stop_telemetry():
+    """Stop the background telemetry publisher"""
+    global _publisher_task
+    if _publisher_task:
+        _publisher_task.cancel()
+        _publisher_task = None
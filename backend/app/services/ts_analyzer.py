@@ -0,0 +1,606 @@
+"""
+Passive MPEG-TS analyzer - stream info without ffprobe
+
+Parses PAT/PMT, stream types, PES headers and video/audio headers (H.264 /
+HEVC SPS, MPEG-2 sequence header, ADTS, MPEG audio, AC-3) from a copy of the
+channel's transport stream, and measures per-PID bitrates. Packet batches
+are handled with NumPy; only packets that start a PSI section or PES packet
+are parsed in Python, and only until the stream layout is known.
+
+The produced info uses the same schema as the ffprobe entries in
+stream_analyzer._stream_info_cache.
+"""
+
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+TS_PACKET_SIZE = 188
+SYNC_BYTE = 0x47
+PAT_PID = 0x0000
+NULL_PID = 0x1FFF
+
+# Re-parse headers periodically to pick up layout changes
+REPARSE_INTERVAL = 10.0
+# Bitrate measurement window
+RATE_WINDOW = 2.0
+
+# stream_type -> (codec_type, codec_name)
+STREAM_TYPES = {
+    0x01: ("video", "mpeg1video"),
+    0x02: ("video", "mpeg2video"),
+    0x03: ("audio", "mp2"),
+    0x04: ("audio", "mp2"),
+    0x0F: ("audio", "aac"),
+    0x11: ("audio", "aac_latm"),
+    0x1B: ("video", "h264"),
+    0x24: ("video", "hevc"),
+    0x42: ("video", "cavs"),
+    0x81: ("audio", "ac3"),
+    0x87: ("audio", "eac3"),
+}
+
+# Private data (0x06) is identified by descriptor tag
+PRIVATE_DESCRIPTORS = {
+    0x6A: ("audio", "ac3"),
+    0x7A: ("audio", "eac3"),
+    0x7C: ("audio", "aac"),
+    0x56: ("subtitle", "dvb_teletext"),
+    0x59: ("subtitle", "dvb_subtitle"),
+}
+
+H264_PROFILES = {
+    66: "Baseline", 77: "Main", 88: "Extended", 100: "High",
+    110: "High 10", 122: "High 4:2:2", 244: "High 4:4:4 Predictive",
+}
+HEVC_PROFILES = {1: "Main", 2: "Main 10", 3: "Main Still Picture", 4: "Rext"}
+
+ADTS_SAMPLE_RATES = [96000, 88200, 64000, 48000, 44100, 32000, 24000, 22050,
+                     16000, 12000, 11025, 8000, 7350]
+MPEG_AUDIO_SAMPLE_RATES = {3: [44100, 48000, 32000], 2: [22050, 24000, 16000], 0: [11025, 12000, 8000]}
+AC3_SAMPLE_RATES = [48000, 44100, 32000]
+AC3_CHANNELS = [2, 1, 2, 3, 3, 4, 4, 5]
+CHANNEL_LAYOUTS = {1: "mono", 2: "stereo", 3: "3.0", 4: "quad", 5: "5.0", 6: "5.1", 8: "7.1"}
+MPEG2_FRAME_RATES = [0, 24000 / 1001, 24, 25, 30000 / 1001, 30, 50, 60000 / 1001, 60]
+
+
+def split_packets(data: bytes) -> np.ndarray:
+    """
+    View a buffer of TS data as an (n, 188) uint8 array of sync-aligned packets.
+    Leading garbage is skipped and packets with a bad sync byte are dropped.
+    """
+    buf = np.frombuffer(data, dtype=np.uint8)
+    start = 0
+    if len(buf) and buf[0] != SYNC_BYTE:
+        candidates = np.flatnonzero(buf[:TS_PACKET_SIZE] == SYNC_BYTE)
+        start = int(candidates[0]) if len(candidates) else len(buf)
+    count = (len(buf) - start) // TS_PACKET_SIZE
+    packets = buf[start:start + count * TS_PACKET_SIZE].reshape(count, TS_PACKET_SIZE)
+    return packets[packets[:, 0] == SYNC_BYTE]
+
+
+def packet_pids(packets: np.ndarray) -> np.ndarray:
+    """13-bit PID of every packet"""
+    return ((packets[:, 1].astype(np.uint16) & 0x1F) << 8) | packets[:, 2]
+
+
+def payload_offset(packet: np.ndarray) -> Optional[int]:
+    """Offset of the payload in a packet, or None when it carries none"""
+    afc = (int(packet[3]) >> 4) & 0x03
+    if afc == 1:
+        return 4
+    if afc == 3:
+        offset = 5 + int(packet[4])
+        return offset if offset < TS_PACKET_SIZE else None
+    return None
+
+
+class BitReader:
+    """MSB-first bit reader with Exp-Golomb support"""
+
+    def __init__(self, data: bytes):
+        self.data = data
+        self.pos = 0
+
+    def u(self, bits: int) -> int:
+        value = 0
+        for _ in range(bits):
+            byte = self.data[self.pos >> 3]
+            value = (value << 1) | ((byte >> (7 - (self.pos & 7))) & 1)
+            self.pos += 1
+        return value
+
+    def skip(self, bits: int):
+        self.pos += bits
+
+    def ue(self) -> int:
+        zeros = 0
+        while self.u(1) == 0:
+            zeros += 1
+            if zeros > 31:
+                raise ValueError("Invalid Exp-Golomb code")
+        return (1 << zeros) - 1 + self.u(zeros)
+
+    def se(self) -> int:
+        value = self.ue()
+        return (value + 1) // 2 if value & 1 else -(value // 2)
+
+
+def _unescape_rbsp(nal: bytes) -> bytes:
+    """Remove emulation prevention bytes (00 00 03)"""
+    return nal.replace(b"\x00\x00\x03", b"\x00\x00")
+
+
+def _find_nal(payload: bytes, match) -> Optional[bytes]:
+    """Find the first NAL unit in an Annex B payload accepted by `match(header_byte)`"""
+    pos = payload.find(b"\x00\x00\x01")
+    while pos >= 0 and pos + 3 < len(payload):
+        if match(payload[pos + 3]):
+            end = payload.find(b"\x00\x00\x01", pos + 3)
+            return payload[pos + 3:end if end > 0 else len(payload)]
+        pos = payload.find(b"\x00\x00\x01", pos + 3)
+    return None
+
+
+def parse_h264_sps(nal: bytes) -> Optional[dict]:
+    """Resolution, profile, pixel format and frame rate from an H.264 SPS NAL"""
+    try:
+        r = BitReader(_unescape_rbsp(nal[1:]))
+        profile_idc = r.u(8)
+        r.skip(8)  # constraint flags
+        r.u(8)  # level_idc
+        r.ue()  # seq_parameter_set_id
+        chroma_format_idc = 1
+        bit_depth = 8
+        if profile_idc in (100, 110, 122, 244, 44, 83, 86, 118, 128, 138, 139, 134, 135):
+            chroma_format_idc = r.ue()
+            if chroma_format_idc == 3:
+                r.skip(1)
+            bit_depth = r.ue() + 8
+            r.ue()  # bit_depth_chroma
+            r.skip(1)
+            if r.u(1):  # seq_scaling_matrix_present
+                for i in range(8 if chroma_format_idc != 3 else 12):
+                    if r.u(1):
+                        size = 16 if i < 6 else 64
+                        last = nxt = 8
+                        for _ in range(size):
+                            if nxt != 0:
+                                nxt = (last + r.se() + 256) % 256
+                            last = nxt if nxt != 0 else last
+        r.ue()  # log2_max_frame_num_minus4
+        poc_type = r.ue()
+        if poc_type == 0:
+            r.ue()
+        elif poc_type == 1:
+            r.skip(1)
+            r.se()
+            r.se()
+            for _ in range(r.ue()):
+                r.se()
+        r.ue()  # max_num_ref_frames
+        r.skip(1)
+        width_mbs = r.ue() + 1
+        height_units = r.ue() + 1
+        frame_mbs_only = r.u(1)
+        if not frame_mbs_only:
+            r.skip(1)
+        r.skip(1)  # direct_8x8_inference
+        crop = (0, 0, 0, 0)
+        if r.u(1):
+            crop = (r.ue(), r.ue(), r.ue(), r.ue())
+
+        sub_w = 1 if chroma_format_idc in (0, 3) else 2
+        sub_h = 2 if chroma_format_idc == 1 else 1
+        crop_x = sub_w if chroma_format_idc else 1
+        crop_y = (sub_h if chroma_format_idc else 1) * (2 - frame_mbs_only)
+        width = width_mbs * 16 - crop_x * (crop[0] + crop[1])
+        height = (2 - frame_mbs_only) * height_units * 16 - crop_y * (crop[2] + crop[3])
+
+        fps = None
+        if r.u(1):  # vui_parameters_present
+            if r.u(1):  # aspect_ratio_info_present
+                if r.u(8) == 255:
+                    r.skip(32)
+            if r.u(1):  # overscan_info_present
+                r.skip(1)
+            if r.u(1):  # video_signal_type_present
+                r.skip(4)
+                if r.u(1):
+                    r.skip(24)
+            if r.u(1):  # chroma_loc_info_present
+                r.ue()
+                r.ue()
+            if r.u(1):  # timing_info_present
+                num_units_in_tick = r.u(32)
+                time_scale = r.u(32)
+                if num_units_in_tick:
+                    fps = time_scale / (2 * num_units_in_tick)
+
+        pix_fmt = {0: "gray", 1: "yuv420p", 2: "yuv422p", 3: "yuv444p"}.get(chroma_format_idc, "")
+        if bit_depth > 8 and pix_fmt:
+            pix_fmt += f"{bit_depth}le"
+
+        return {
+            "profile": H264_PROFILES.get(profile_idc, str(profile_idc)),
+            "width": width,
+            "height": height,
+            "fps": fps,
+            "pix_fmt": pix_fmt,
+        }
+    except (IndexError, ValueError):
+        return None
+
+
+def parse_hevc_sps(nal: bytes) -> Optional[dict]:
+    """Resolution, profile and pixel format from an HEVC SPS NAL"""
+    try:
+        r = BitReader(_unescape_rbsp(nal[2:]))
+        r.skip(4)  # sps_video_parameter_set_id
+        max_sub_layers = r.u(3)
+        r.skip(1)
+        # profile_tier_level
+        r.skip(3)
+        profile_idc = r.u(5)
+        r.skip(32 + 48)
+        r.skip(8)  # general_level_idc
+        profile_present = []
+        level_present = []
+        for _ in range(max_sub_layers):
+            profile_present.append(r.u(1))
+            level_present.append(r.u(1))
+        if max_sub_layers > 0:
+            r.skip(2 * (8 - max_sub_layers))
+        for i in range(max_sub_layers):
+            if profile_present[i]:
+                r.skip(88)
+            if level_present[i]:
+                r.skip(8)
+        r.ue()  # sps_seq_parameter_set_id
+        chroma_format_idc = r.ue()
+        if chroma_format_idc == 3:
+            r.skip(1)
+        width = r.ue()
+        height = r.ue()
+        if r.u(1):  # conformance_window_flag
+            sub_w = 1 if chroma_format_idc in (0, 3) else 2
+            sub_h = 2 if chroma_format_idc == 1 else 1
+            left, right, top, bottom = r.ue(), r.ue(), r.ue(), r.ue()
+            width -= sub_w * (left + right)
+            height -= sub_h * (top + bottom)
+        bit_depth = r.ue() + 8
+
+        pix_fmt = {0: "gray", 1: "yuv420p", 2: "yuv422p", 3: "yuv444p"}.get(chroma_format_idc, "")
+        if bit_depth > 8 and pix_fmt:
+            pix_fmt += f"{bit_depth}le"
+
+        return {
+            "profile": HEVC_PROFILES.get(profile_idc, str(profile_idc)),
+            "width": width,
+            "height": height,
+            "fps": None,
+            "pix_fmt": pix_fmt,
+        }
+    except (IndexError, ValueError):
+        return None
+
+
+def parse_mpeg2_sequence_header(payload: bytes) -> Optional[dict]:
+    """Resolution and frame rate from an MPEG-1/2 video sequence header"""
+    pos = payload.find(b"\x00\x00\x01\xb3")
+    if pos < 0 or pos + 8 > len(payload):
+        return None
+    h = payload[pos + 4:pos + 8]
+    width = (h[0] << 4) | (h[1] >> 4)
+    height = ((h[1] & 0x0F) << 8) | h[2]
+    rate_code = h[3] & 0x0F
+    fps = MPEG2_FRAME_RATES[rate_code] if rate_code < len(MPEG2_FRAME_RATES) else None
+    return {"profile": "", "width": width, "height": height, "fps": fps or None, "pix_fmt": "yuv420p"}
+
+
+def parse_audio_header(codec: str, payload: bytes) -> Optional[dict]:
+    """Sample rate and channel count from the first audio frame header"""
+    if codec == "aac":
+        for pos in range(len(payload) - 7):
+            if payload[pos] == 0xFF and (payload[pos + 1] & 0xF6) == 0xF0:
+                sr_index = (payload[pos + 2] >> 2) & 0x0F
+                channels = ((payload[pos + 2] & 0x01) << 2) | (payload[pos + 3] >> 6)
+                if sr_index < len(ADTS_SAMPLE_RATES):
+                    return {"sample_rate": ADTS_SAMPLE_RATES[sr_index], "channels": 8 if channels == 7 else channels}
+                return None
+    elif codec in ("mp2", "mp3"):
+        for pos in range(len(payload) - 4):
+            if payload[pos] == 0xFF and (payload[pos + 1] & 0xE0) == 0xE0:
+                version = (payload[pos + 1] >> 3) & 0x03
+                sr_index = (payload[pos + 2] >> 2) & 0x03
+                rates = MPEG_AUDIO_SAMPLE_RATES.get(version)
+                if not rates or sr_index > 2:
+                    return None
+                mode = payload[pos + 3] >> 6
+                return {"sample_rate": rates[sr_index], "channels": 1 if mode == 3 else 2}
+    elif codec in ("ac3", "eac3"):
+        pos = payload.find(b"\x0b\x77")
+        if 0 <= pos and pos + 7 <= len(payload):
+            if codec == "eac3":
+                fscod = payload[pos + 4] >> 6
+                acmod = (payload[pos + 4] >> 1) & 0x07
+            else:
+                fscod = payload[pos + 4] >> 6
+                acmod = payload[pos + 6] >> 5
+            if fscod < 3:
+                return {"sample_rate": AC3_SAMPLE_RATES[fscod], "channels": AC3_CHANNELS[acmod]}
+    return None
+
+
+def parse_pes_header(payload: bytes) -> Optional[Tuple[int, Optional[int], bytes]]:
+    """Return (stream_id, pts, elementary data) of a PES packet start"""
+    if len(payload) < 9 or payload[:3] != b"\x00\x00\x01":
+        return None
+    stream_id = payload[3]
+    header_length = payload[8]
+    pts = None
+    if payload[7] & 0x80 and len(payload) >= 14:
+        p = payload[9:14]
+        pts = (((p[0] >> 1) & 0x07) << 30) | (p[1] << 22) | ((p[2] >> 1) << 15) | (p[3] << 7) | (p[4] >> 1)
+    return stream_id, pts, payload[9 + header_length:]
+
+
+def parse_psi_section(payload: bytes) -> Optional[bytes]:
+    """Return the first PSI section of a packet payload (without CRC)"""
+    if not payload:
+        return None
+    start = 1 + payload[0]  # pointer_field
+    if start + 3 > len(payload):
+        return None
+    section_length = ((payload[start + 1] & 0x0F) << 8) | payload[start + 2]
+    end = start + 3 + section_length
+    if end > len(payload) or section_length < 9:
+        return None
+    return payload[start:end - 4]
+
+
+def parse_pat(section: bytes) -> Dict[int, int]:
+    """program_number -> PMT PID"""
+    programs = {}
+    if section[0] != 0x00:
+        return programs
+    for pos in range(8, len(section) - 3, 4):
+        program = (section[pos] << 8) | section[pos + 1]
+        pid = ((section[pos + 2] & 0x1F) << 8) | section[pos + 3]
+        if program != 0:
+            programs[program] = pid
+    return programs
+
+
+def parse_pmt(section: bytes) -> Optional[dict]:
+    """PCR PID and elementary streams of a PMT section"""
+    if section[0] != 0x02:
+        return None
+    pcr_pid = ((section[8] & 0x1F) << 8) | section[9]
+    program_info_length = ((section[10] & 0x0F) << 8) | section[11]
+    pos = 12 + program_info_length
+    streams = []
+    while pos + 5 <= len(section):
+        stream_type = section[pos]
+        pid = ((section[pos + 1] & 0x1F) << 8) | section[pos + 2]
+        info_length = ((section[pos + 3] & 0x0F) << 8) | section[pos + 4]
+        descriptors = section[pos + 5:pos + 5 + info_length]
+        pos += 5 + info_length
+
+        codec_type, codec = STREAM_TYPES.get(stream_type, ("data", f"0x{stream_type:02x}"))
+        language = ""
+        d = 0
+        while d + 2 <= len(descriptors):
+            tag, length = descriptors[d], descriptors[d + 1]
+            body = descriptors[d + 2:d + 2 + length]
+            if tag == 0x0A and len(body) >= 3:
+                language = body[:3].decode("latin-1", errors="replace")
+            elif stream_type == 0x06 and tag in PRIVATE_DESCRIPTORS:
+                codec_type, codec = PRIVATE_DESCRIPTORS[tag]
+            d += 2 + length
+
+        streams.append({"pid": pid, "stream_type": stream_type, "codec_type": codec_type,
+                        "codec": codec, "language": language})
+    return {"pcr_pid": pcr_pid, "streams": streams}
+
+
+class TsAnalyzer:
+    """Continuously updated stream info for one transport stream"""
+
+    def __init__(self, channel_name: str, source: str = ""):
+        self.channel_name = channel_name
+        self.source = source
+        self.pmt_pids: Dict[int, int] = {}
+        self.pcr_pid: Optional[int] = None
+        self.streams: Dict[int, dict] = {}  # pid -> stream description
+        self.stream_order: List[int] = []
+        self.details: Dict[int, dict] = {}  # pid -> parsed codec details
+        # PIDs whose details are re-read from the next header; the old ones are
+        # reported until then
+        self._reparse_pids: Set[int] = set()
+        self.last_pts: Dict[int, int] = {}
+        self.pts_deltas: Dict[int, List[int]] = {}
+        self.pid_rates: Dict[int, float] = {}
+        self.total_rate = 0.0
+        self.packets_total = 0
+        self.last_packet_time: Optional[float] = None
+        self._window_start: Optional[float] = None
+        self._window_bytes = np.zeros(8192, dtype=np.int64)
+        self._last_parse = 0.0
+
+    def process(self, packets: np.ndarray, pids: np.ndarray, arrivals: Optional[np.ndarray] = None):
+        """
+        Consume a batch of aligned packets (see split_packets / packet_pids).
+        `arrivals` holds the monotonic receive time of every packet.
+        """
+        if not len(packets):
+            return
+        now = float(arrivals[-1]) if arrivals is not None else time.monotonic()
+        self.packets_total += len(packets)
+        self.last_packet_time = now
+
+        # Bitrates - one bincount per batch
+        if self._window_start is None:
+            self._window_start = now
+        self._window_bytes += np.bincount(pids, minlength=8192) * TS_PACKET_SIZE
+        elapsed = now - self._window_start
+        if elapsed >= RATE_WINDOW:
+            rates = self._window_bytes * 8 / elapsed
+            active = np.flatnonzero(rates)
+            self.pid_rates = {int(pid): float(rates[pid]) for pid in active}
+            self.total_rate = float(rates.sum())
+            self._window_bytes[:] = 0
+            self._window_start = now
+
+        # Headers: only parse packets that start a section/PES, and only when needed
+        reparse = now - self._last_parse >= REPARSE_INTERVAL
+        if reparse:
+            self._last_parse = now
+            self._reparse_pids = set(self.details)
+        pusi = (packets[:, 1] & 0x40) != 0
+        for i in np.flatnonzero(pusi):
+            pid = int(pids[i])
+            if pid == PAT_PID:
+                if reparse or not self.pmt_pids:
+                    self._parse_pat(packets[i])
+            elif pid in self.pmt_pids.values():
+                if reparse or not self.streams:
+                    self._parse_pmt(packets[i])
+            elif pid in self.streams:
+                self._parse_pes(pid, packets[i])
+
+    def _payload(self, packet: np.ndarray) -> bytes:
+        offset = payload_offset(packet)
+        return packet[offset:].tobytes() if offset is not None else b""
+
+    def _parse_pat(self, packet: np.ndarray):
+        section = parse_psi_section(self._payload(packet))
+        if section:
+            programs = parse_pat(section)
+            if programs:
+                self.pmt_pids = programs
+
+    def _parse_pmt(self, packet: np.ndarray):
+        section = parse_psi_section(self._payload(packet))
+        pmt = parse_pmt(section) if section else None
+        if not pmt:
+            return
+        self.pcr_pid = pmt["pcr_pid"]
+        for stream in pmt["streams"]:
+            pid = stream["pid"]
+            if pid not in self.streams:
+                self.stream_order.append(pid)
+            elif self.streams[pid]["codec"] != stream["codec"]:
+                # A different codec on the PID - its old details no longer apply
+                self.details.pop(pid, None)
+            self.streams[pid] = stream
+        self.stream_order = [pid for pid in self.stream_order if pid in {s["pid"] for s in pmt["streams"]}]
+
+    def _parse_pes(self, pid: int, packet: np.ndarray):
+        stream = self.streams[pid]
+        if stream["codec_type"] not in ("video", "audio"):
+            return
+        pes = parse_pes_header(self._payload(packet))
+        if not pes:
+            return
+        _, pts, data = pes
+
+        if pts is not None and stream["codec_type"] == "video":
+            previous = self.last_pts.get(pid)
+            self.last_pts[pid] = pts
+            if previous is not None and 0 < pts - previous < 90000:
+                deltas = self.pts_deltas.setdefault(pid, [])
+                deltas.append(pts - previous)
+                del deltas[:-50]
+
+        if pid in self.details and pid not in self._reparse_pids:
+            return
+
+        codec = stream["codec"]
+        details = None
+        if codec == "h264":
+            nal = _find_nal(data, lambda b: (b & 0x1F) == 7)
+            details = parse_h264_sps(nal) if nal else None
+        elif codec == "hevc":
+            nal = _find_nal(data, lambda b: ((b >> 1) & 0x3F) == 33)
+            details = parse_hevc_sps(nal) if nal else None
+        elif codec in ("mpeg2video", "mpeg1video"):
+            details = parse_mpeg2_sequence_header(data)
+        elif stream["codec_type"] == "audio":
+            details = parse_audio_header(codec, data)
+        if details:
+            self.details[pid] = details
+            self._reparse_pids.discard(pid)
+
+    def _pts_fps(self, pid: int) -> Optional[float]:
+        deltas = self.pts_deltas.get(pid)
+        if not deltas or len(deltas) < 5:
+            return None
+        # Frames arrive in decode order - the smallest common delta is one frame
+        frame = int(np.percentile(deltas, 10))
+        return 90000 / frame if frame > 0 else None
+
+    def is_live(self, max_age: float = 5.0) -> bool:
+        return self.last_packet_time is not None and time.monotonic() - self.last_packet_time <= max_age
+
+    def snapshot(self) -> dict:
+        """Stream info in the stream_info_cache schema"""
+        video_streams = []
+        audio_streams = []
+
+        for index, pid in enumerate(self.stream_order):
+            stream = self.streams[pid]
+            details = self.details.get(pid, {})
+            rate = self.pid_rates.get(pid)
+            bitrate = int(rate) if rate else None
+
+            if stream["codec_type"] == "video":
+                width = details.get("width", 0)
+                height = details.get("height", 0)
+                fps = details.get("fps") or self._pts_fps(pid) or 0
+                video_streams.append({
+                    "index": index,
+                    "pid": pid,
+                    "codec": stream["codec"],
+                    "profile": details.get("profile", ""),
+                    "width": width,
+                    "height": height,
+                    "resolution": f"{width}x{height}",
+                    "fps": round(fps, 2),
+                    "bitrate": bitrate,
+                    "pix_fmt": details.get("pix_fmt", ""),
+                })
+            elif stream["codec_type"] == "audio":
+                channels = details.get("channels", 0)
+                audio_streams.append({
+                    "index": index,
+                    "pid": pid,
+                    "codec": stream["codec"],
+                    "sample_rate": details.get("sample_rate", 0),
+                    "channels": channels,
+                    "channel_layout": CHANNEL_LAYOUTS.get(channels, ""),
+                    "bitrate": bitrate,
+                    "language": stream["language"],
+                })
+
+        total_bitrate = int(self.total_rate) if self.total_rate else None
+        live = self.is_live()
+
+        return {
+            "channel_name": self.channel_name,
+            "status": "online" if live else "timeout",
+            "success": live and bool(self.streams),
+            "probe_url": self.source,
+            "analyzer": "passive",
+            "format": "mpegts",
+            "total_bitrate": total_bitrate,
+            "total_bitrate_mbps": round(total_bitrate / 1000000, 2) if total_bitrate else None,
+            "video_streams": video_streams,
+            "audio_streams": audio_streams,
+            "video_count": len(video_streams),
+            "audio_count": len(audio_streams),
+            "pid_bitrates": {str(pid): int(rate) for pid, rate in self.pid_rates.items()},
+            "last_update": datetime.now().isoformat()
+        }
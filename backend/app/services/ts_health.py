@@ -0,0 +1,308 @@
+"""
+Transport stream health - TR 101 290 priority 1/2 subset
+
+Fed with the packet batches of a channel's tap. Every check is a vectorized
+NumPy pass over the batch, with the little per-PID state needed to carry
+continuity counters, PCRs and table timings across batches:
+
+- 1.1 TS_sync_loss / 1.2 Sync_byte_error
+- 1.3 PAT_error (repetition > 0.5 s, scrambled PAT)
+- 1.4 Continuity_count_error
+- 1.5 PMT_error (repetition > 0.5 s)
+- 1.6 PID_error (referenced PID absent for PID_TIMEOUT)
+- 2.1 Transport_error (TEI flag)
+- 2.3 PCR_repetition_error (> 100 ms) and PCR discontinuities
+- PCR jitter against packet arrival time, null packet ratio
+
+Arrival times are taken when the datagram reaches the tap, so the jitter
+figure includes network and event loop jitter - it is an indicator, not a
+PCR_accuracy (2.4) measurement.
+"""
+
+import time
+from collections import deque
+from datetime import datetime
+from typing import Deque, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .ts_analyzer import NULL_PID, PAT_PID, TsAnalyzer
+
+PCR_HZ = 27_000_000
+PCR_REPETITION_LIMIT = 0.1
+TABLE_REPETITION_LIMIT = 0.5
+PID_TIMEOUT = 5.0
+# PCR steps outside (0, PCR_DISCONTINUITY) seconds are discontinuities, not intervals
+PCR_DISCONTINUITY = 1.0
+# Window for "recent" error counts, jitter and null ratio
+HEALTH_WINDOW = 10.0
+
+PRIORITY1 = ("ts_sync_loss", "sync_byte_error", "pat_error", "continuity_count_error", "pmt_error", "pid_error")
+PRIORITY2 = ("transport_error", "pcr_repetition_error", "pcr_discontinuity")
+
+
+def extract_pcr(packets: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Return (mask of packets carrying a PCR, their PCR values in 27 MHz ticks)"""
+    has_adaptation = (packets[:, 3] & 0x20) != 0
+    mask = has_adaptation & (packets[:, 4] >= 7) & ((packets[:, 5] & 0x10) != 0)
+    rows = packets[mask, 6:12].astype(np.int64)
+    base = (rows[:, 0] << 25) | (rows[:, 1] << 17) | (rows[:, 2] << 9) | (rows[:, 3] << 1) | (rows[:, 4] >> 7)
+    ext = ((rows[:, 4] & 0x01) << 8) | rows[:, 5]
+    return mask, base * 300 + ext
+
+
+def _table_intervals(times: np.ndarray, last: Optional[float]) -> np.ndarray:
+    if last is not None:
+        times = np.concatenate(([last], times))
+    return np.diff(times)
+
+
+class TsHealth:
+    """Continuously updated health counters for one transport stream"""
+
+    def __init__(self, channel_name: str, analyzer: TsAnalyzer):
+        self.channel_name = channel_name
+        self.analyzer = analyzer
+        self.counters: Dict[str, int] = {name: 0 for name in PRIORITY1 + PRIORITY2}
+        self.packets = 0
+        self._last_cc = np.full(8192, -1, dtype=np.int16)
+        self._cc_errors_by_pid = np.zeros(8192, dtype=np.int64)
+        self._last_seen = np.full(8192, np.nan)
+        self._missing: set = set()
+        self._last_pat: Optional[float] = None
+        self._last_pmt: Dict[int, float] = {}
+        self._pat_interval_max = 0.0
+        self._pmt_interval_max = 0.0
+        self._last_pcr: Optional[int] = None
+        self._pcr_pid: Optional[int] = None
+        self._pcr_interval_sum = 0.0
+        self._pcr_interval_count = 0
+        self._pcr_interval_max = 0.0
+        # (time, min offset, max offset) of PCR-vs-arrival per batch since the last discontinuity
+        self._pcr_offsets: Deque[Tuple[float, float, float]] = deque()
+        # (time, null packets, packets, error counts) per batch
+        self._window: Deque[Tuple[float, int, int, Dict[str, int]]] = deque()
+        self._last_time: Optional[float] = None
+
+    def record_sync(self, bad: np.ndarray):
+        """Account for packets dropped by the tap because of a bad sync byte"""
+        errors = int(bad.sum())
+        if not errors:
+            return
+        edges = np.diff(np.concatenate(([0], bad.astype(np.int8), [0])))
+        runs = np.flatnonzero(edges == -1) - np.flatnonzero(edges == 1)
+        loss = int((runs >= 2).sum())
+        self.counters["sync_byte_error"] += errors
+        self.counters["ts_sync_loss"] += loss
+        self._window.append((time.monotonic(), 0, 0, {"sync_byte_error": errors, "ts_sync_loss": loss}))
+
+    def process(self, packets: np.ndarray, pids: np.ndarray, arrivals: np.ndarray):
+        """Consume a batch of aligned packets (tap consumer)"""
+        if not len(packets):
+            return
+        now = float(arrivals[-1])
+        self._last_time = now
+        self.packets += len(packets)
+        errors: Dict[str, int] = {}
+
+        b1 = packets[:, 1]
+        b3 = packets[:, 3]
+        pusi = (b1 & 0x40) != 0
+
+        # 2.1 Transport_error
+        errors["transport_error"] = int(((b1 & 0x80) != 0).sum())
+
+        # 1.4 Continuity_count_error - per PID, over payload-carrying packets
+        errors["continuity_count_error"] = self._check_continuity(packets, pids, b3)
+
+        # 1.3 PAT_error
+        pat_rows = (pids == PAT_PID) & pusi
+        pat_times = arrivals[pat_rows]
+        pat_error = int(((b3[pids == PAT_PID] & 0xC0) != 0).sum())
+        if len(pat_times):
+            intervals = _table_intervals(pat_times, self._last_pat)
+            pat_error += int((intervals > TABLE_REPETITION_LIMIT).sum())
+            if len(intervals):
+                self._pat_interval_max = max(self._pat_interval_max, float(intervals.max()))
+            self._last_pat = float(pat_times[-1])
+        errors["pat_error"] = pat_error
+
+        # 1.5 PMT_error
+        pmt_error = 0
+        for pmt_pid in set(self.analyzer.pmt_pids.values()):
+            times = arrivals[(pids == pmt_pid) & pusi]
+            if not len(times):
+                continue
+            intervals = _table_intervals(times, self._last_pmt.get(pmt_pid))
+            pmt_error += int((intervals > TABLE_REPETITION_LIMIT).sum())
+            if len(intervals):
+                self._pmt_interval_max = max(self._pmt_interval_max, float(intervals.max()))
+            self._last_pmt[pmt_pid] = float(times[-1])
+        errors["pmt_error"] = pmt_error
+
+        # 1.6 PID_error - referenced PIDs that stopped arriving
+        present = np.unique(pids)
+        errors["pid_error"] = 0
+        for pid in self.analyzer.streams:
+            last_seen = self._last_seen[pid]
+            if pid in self._missing:
+                continue
+            if not np.isnan(last_seen) and now - last_seen > PID_TIMEOUT:
+                self._missing.add(pid)
+                errors["pid_error"] += 1
+        self._last_seen[present] = now
+        self._missing.difference_update(int(pid) for pid in present)
+
+        # 2.3 PCR repetition / discontinuity, PCR jitter
+        pcr_errors, discontinuities = self._check_pcr(packets, pids, arrivals)
+        errors["pcr_repetition_error"] = pcr_errors
+        errors["pcr_discontinuity"] = discontinuities
+
+        for name, count in errors.items():
+            self.counters[name] += count
+
+        nulls = int((pids == NULL_PID).sum())
+        self._window.append((now, nulls, len(packets), {k: v for k, v in errors.items() if v}))
+        while self._window and now - self._window[0][0] > HEALTH_WINDOW:
+            self._window.popleft()
+
+    def _check_continuity(self, packets: np.ndarray, pids: np.ndarray, b3: np.ndarray) -> int:
+        has_payload = (b3 & 0x10) != 0
+        rows = np.flatnonzero(has_payload & (pids != NULL_PID))
+        if not len(rows):
+            return 0
+
+        order = rows[np.argsort(pids[rows], kind="stable")]
+        pid = pids[order]
+        cc = (b3[order] & 0x0F).astype(np.int16)
+        adaptation = (b3[order] & 0x20) != 0
+        discontinuity = adaptation & (packets[order, 4] > 0) & ((packets[order, 5] & 0x80) != 0)
+
+        first = np.ones(len(pid), dtype=bool)
+        first[1:] = pid[1:] != pid[:-1]
+        last = np.ones(len(pid), dtype=bool)
+        last[:-1] = first[1:]
+
+        previous = np.empty_like(cc)
+        previous[1:] = cc[:-1]
+        previous[first] = self._last_cc[pid[first]]
+
+        # One duplicate packet (same counter) is allowed
+        error = (previous >= 0) & ~discontinuity & (cc != ((previous + 1) & 0x0F)) & (cc != previous)
+        self._last_cc[pid[last]] = cc[last]
+
+        count = int(error.sum())
+        if count:
+            self._cc_errors_by_pid += np.bincount(pid[error], minlength=8192)
+        return count
+
+    def _check_pcr(self, packets: np.ndarray, pids: np.ndarray, arrivals: np.ndarray) -> Tuple[int, int]:
+        mask, pcr = extract_pcr(packets)
+        if not len(pcr):
+            return 0, 0
+        pcr_pids = pids[mask]
+
+        # Follow the program's PCR PID; before the PMT is known, the first PID seen carrying PCRs
+        pcr_pid = self.analyzer.pcr_pid
+        if pcr_pid is None:
+            pcr_pid = self._pcr_pid if self._pcr_pid is not None else int(pcr_pids[0])
+        if pcr_pid != self._pcr_pid:
+            self._pcr_pid = pcr_pid
+            self._last_pcr = None
+            self._pcr_offsets.clear()
+        selected = pcr_pids == pcr_pid
+        pcr = pcr[selected]
+        times = arrivals[mask][selected]
+        if not len(pcr):
+            return 0, 0
+
+        sequence = np.concatenate(([self._last_pcr], pcr)) if self._last_pcr is not None else pcr
+        steps = np.diff(sequence) / PCR_HZ
+        broken = (steps <= 0) | (steps > PCR_DISCONTINUITY)
+        intervals = steps[~broken]
+        repetition_errors = int((intervals > PCR_REPETITION_LIMIT).sum())
+        if len(intervals):
+            self._pcr_interval_sum += float(intervals.sum())
+            self._pcr_interval_count += len(intervals)
+            self._pcr_interval_max = max(self._pcr_interval_max, float(intervals.max()))
+        self._last_pcr = int(pcr[-1])
+
+        offsets = times - pcr / PCR_HZ
+        discontinuities = int(broken.sum())
+        if discontinuities:
+            # Only compare offsets on the same timeline
+            self._pcr_offsets.clear()
+            offset_in_batch = len(broken) - len(pcr)
+            last_break = int(np.flatnonzero(broken)[-1]) - offset_in_batch
+            offsets = offsets[max(last_break, 0):]
+
+        now = float(times[-1])
+        self._pcr_offsets.append((now, float(offsets.min()), float(offsets.max())))
+        while self._pcr_offsets and now - self._pcr_offsets[0][0] > HEALTH_WINDOW:
+            self._pcr_offsets.popleft()
+        return repetition_errors, discontinuities
+
+    def _recent(self) -> Tuple[Dict[str, int], int, int]:
+        recent = {name: 0 for name in PRIORITY1 + PRIORITY2}
+        nulls = total = 0
+        cutoff = time.monotonic() - HEALTH_WINDOW
+        for ts, batch_nulls, batch_total, errors in self._window:
+            if ts < cutoff:
+                continue
+            nulls += batch_nulls
+            total += batch_total
+            for name, count in errors.items():
+                recent[name] += count
+        return recent, nulls, total
+
+    def _pcr_jitter_ms(self) -> Optional[float]:
+        if not self._pcr_offsets:
+            return None
+        low = min(entry[1] for entry in self._pcr_offsets)
+        high = max(entry[2] for entry in self._pcr_offsets)
+        return round((high - low) * 1000, 3)
+
+    def _missing_pids(self) -> List[int]:
+        now = time.monotonic()
+        missing = []
+        for pid in self.analyzer.streams:
+            last_seen = self._last_seen[pid]
+            if np.isnan(last_seen) or now - last_seen > PID_TIMEOUT:
+                missing.append(pid)
+        return missing
+
+    def snapshot(self) -> dict:
+        """Health summary for the stats store"""
+        recent, nulls, total = self._recent()
+        if self._last_time is None or time.monotonic() - self._last_time > PID_TIMEOUT:
+            status = "no_data"
+        elif any(recent[name] for name in PRIORITY1):
+            status = "error"
+        elif any(recent[name] for name in PRIORITY2):
+            status = "warning"
+        else:
+            status = "ok"
+
+        top_cc = np.argsort(self._cc_errors_by_pid)[::-1][:10]
+        return {
+            "status": status,
+            "packets": self.packets,
+            "priority1": {name: self.counters[name] for name in PRIORITY1},
+            "priority2": {name: self.counters[name] for name in PRIORITY2},
+            "recent_errors": recent,
+            "window_s": HEALTH_WINDOW,
+            "null_ratio": round(nulls / total, 4) if total else None,
+            "pat_interval_max_ms": round(self._pat_interval_max * 1000, 1),
+            "pmt_interval_max_ms": round(self._pmt_interval_max * 1000, 1),
+            "pcr": {
+                "pid": self._pcr_pid,
+                "interval_avg_ms": round(self._pcr_interval_sum / self._pcr_interval_count * 1000, 2)
+                if self._pcr_interval_count else None,
+                "interval_max_ms": round(self._pcr_interval_max * 1000, 2),
+                "jitter_ms": self._pcr_jitter_ms(),
+            },
+            "cc_errors_by_pid": {str(int(pid)): int(self._cc_errors_by_pid[pid])
+                                 for pid in top_cc if self._cc_errors_by_pid[pid]},
+            "missing_pids": self._missing_pids(),
+            "last_update": datetime.now().isoformat(),
+        }
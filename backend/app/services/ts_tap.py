@@ -0,0 +1,234 @@
+"""
+Transport stream tap - receives a local copy of a channel's stream
+
+A tap listens on a loopback UDP port (channel.tap_port) or joins the
+channel's UDP multicast input group, batches the received datagrams and
+hands them to consumers as NumPy packet arrays. Nothing connects to the
+channel's real input, so the tap never competes with the source - which
+also means nothing here feeds tap_port: an external tee (a second encoder
+output, a relay) has to send the copy there.
+
+NumPy and the analyzers are imported when the first tap is created, so
+deployments without taps never load them.
+"""
+
+import asyncio
+import ipaddress
+import socket
+import struct
+import time
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Datagrams are handed to consumers in batches to keep per-packet overhead low
+FLUSH_INTERVAL = 0.5
+# Flush early when this much data is buffered (high bitrate streams)
+FLUSH_BYTES = 2 * 1024 * 1024
+SOCKET_RCVBUF = 4 * 1024 * 1024
+
+# consumer(packets, pids, arrivals)
+TapConsumer = Callable[["np.ndarray", "np.ndarray", "np.ndarray"], None]
+
+
+def resolve_tap_source(channel: dict) -> Optional[Tuple[str, int, Optional[str]]]:
+    """
+    Return (bind_host, port, multicast_group) for a channel's tap, or None when
+    the channel has no passive source.
+    """
+    tap_port = channel.get("tap_port")
+    if tap_port:
+        return "127.0.0.1", int(tap_port), None
+
+    if channel.get("input_protocol") == "udp":
+        try:
+            group = ipaddress.ip_address(channel.get("input_ip", ""))
+        except ValueError:
+            return None
+        if group.is_multicast:
+            return str(group), int(channel.get("input_port", 0)), str(group)
+    return None
+
+
+def _open_socket(host: str, port: int, group: Optional[str]) -> socket.socket:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    if hasattr(socket, "SO_REUSEPORT"):
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SOCKET_RCVBUF)
+    except OSError:
+        pass
+    sock.bind((host, port))
+    if group:
+        membership = struct.pack("4s4s", socket.inet_aton(group), socket.inet_aton("0.0.0.0"))
+        sock.setsockopt(socket.IPPROTO_IP, socket.IP_ADD_MEMBERSHIP, membership)
+    sock.setblocking(False)
+    return sock
+
+
+class TsTap(asyncio.DatagramProtocol):
+    """UDP receiver feeding TS packet batches to consumers"""
+
+    def __init__(self, channel_name: str, host: str, port: int, group: Optional[str] = None):
+        from .ts_analyzer import TsAnalyzer
+        from .ts_health import TsHealth
+
+        self.channel_name = channel_name
+        self.host = host
+        self.port = port
+        self.group = group
+        self.analyzer = TsAnalyzer(channel_name, source=self.url)
+        self.health = TsHealth(channel_name, self.analyzer)
+        self.consumers: List[TapConsumer] = [self.analyzer.process, self.health.process]
+        self.datagrams = 0
+        self.bytes_received = 0
+        self.started_at = time.monotonic()
+        self._chunks: List[bytes] = []
+        self._times: List[float] = []
+        self._buffered = 0
+        self._transport: Optional[asyncio.DatagramTransport] = None
+        self._flush_task: Optional[asyncio.Task] = None
+
+    @property
+    def url(self) -> str:
+        return f"udp://{self.group or self.host}:{self.port}"
+
+    @property
+    def source(self) -> Tuple[str, int, Optional[str]]:
+        return self.host, self.port, self.group
+
+    async def start(self):
+        loop = asyncio.get_running_loop()
+        sock = _open_socket(self.host, self.port, self.group)
+        self._transport, _ = await loop.create_datagram_endpoint(lambda: self, sock=sock)
+        self._flush_task = asyncio.create_task(self._flush_loop())
+
+    def close(self):
+        if self._flush_task:
+            self._flush_task.cancel()
+            self._flush_task = None
+        if self._transport:
+            self._transport.close()
+            self._transport = None
+
+    def add_consumer(self, consumer: TapConsumer):
+        self.consumers.append(consumer)
+
+    def datagram_received(self, data: bytes, addr):
+        self._chunks.append(data)
+        self._times.append(time.monotonic())
+        self._buffered += len(data)
+        self.datagrams += 1
+        self.bytes_received += len(data)
+        if self._buffered >= FLUSH_BYTES:
+            self.flush()
+
+    def error_received(self, exc):
+        print(f"Stream tap error for {self.channel_name}: {exc}")
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(FLUSH_INTERVAL)
+            self.flush()
+
+    def flush(self):
+        """Hand buffered datagrams to the consumers"""
+        if not self._chunks:
+            return
+        import numpy as np
+        from .ts_analyzer import TS_PACKET_SIZE, SYNC_BYTE, packet_pids, split_packets
+
+        chunks, times = self._chunks, self._times
+        self._chunks, self._times, self._buffered = [], [], 0
+
+        sizes = np.fromiter((len(c) for c in chunks), dtype=np.int64, count=len(chunks))
+        if not (sizes % TS_PACKET_SIZE).any():
+            # Common case: every datagram carries whole packets (7 x 188)
+            raw = np.frombuffer(b"".join(chunks), dtype=np.uint8).reshape(-1, TS_PACKET_SIZE)
+            counts = sizes // TS_PACKET_SIZE
+            bad = raw[:, 0] != SYNC_BYTE
+            packets = raw
+            if bad.any():
+                owner = np.repeat(np.arange(len(chunks)), counts)
+                counts = counts - np.bincount(owner[bad], minlength=len(chunks))
+                packets = raw[~bad]
+                self.health.record_sync(bad)
+        else:
+            # Misaligned datagrams - resynchronize each one on its own
+            parts = [split_packets(c) for c in chunks]
+            counts = np.array([len(p) for p in parts], dtype=np.int64)
+            packets = np.concatenate(parts)
+            dropped = int((sizes // TS_PACKET_SIZE).sum() - counts.sum())
+            if dropped > 0:
+                self.health.record_sync(np.ones(dropped, dtype=bool))
+        if not len(packets):
+            return
+
+        arrivals = np.repeat(np.asarray(times, dtype=np.float64), counts)
+        pids = packet_pids(packets)
+        for consumer in self.consumers:
+            try:
+                consumer(packets, pids, arrivals)
+            except Exception as e:
+                print(f"Stream tap consumer error for {self.channel_name}: {e}")
+
+    def stats(self) -> dict:
+        return {
+            "source": self.url,
+            "datagrams": self.datagrams,
+            "bytes": self.bytes_received,
+            "packets": self.analyzer.packets_total,
+            "sync_byte_errors": self.health.counters["sync_byte_error"],
+            "uptime_s": round(time.monotonic() - self.started_at, 1),
+        }
+
+
+# Global tap registry keyed by channel name
+_taps: Dict[str, TsTap] = {}
+
+
+def get_tap(channel_name: str) -> Optional[TsTap]:
+    return _taps.get(channel_name)
+
+
+def all_taps() -> Dict[str, TsTap]:
+    return dict(_taps)
+
+
+async def ensure_tap(channel: dict) -> Optional[TsTap]:
+    """Start (or reuse) the tap of a running channel; None when it has no tap source"""
+    channel_name = channel["channel_name"]
+    source = resolve_tap_source(channel)
+    tap = _taps.get(channel_name)
+
+    if tap and tap.source == source:
+        return tap
+    if tap:
+        tap.close()
+        _taps.pop(channel_name, None)
+    if source is None:
+        return None
+
+    tap = TsTap(channel_name, *source)
+    try:
+        await tap.start()
+    except OSError as e:
+        print(f"Could not open stream tap {tap.url} for {channel_name}: {e}")
+        return None
+    _taps[channel_name] = tap
+    return tap
+
+
+def close_tap(channel_name: str):
+    tap = _taps.pop(channel_name, None)
+    if tap:
+        tap.close()
+
+
+def close_taps(keep: Optional[set] = None):
+    """Close all taps except those of the channels in `keep`"""
+    for name in list(_taps.keys()):
+        if keep is None or name not in keep:
+            close_tap(name)
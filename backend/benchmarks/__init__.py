@@ -0,0 +1 @@
+"""Benchmarks and load tests (see benchmarks/load_test.py)"""
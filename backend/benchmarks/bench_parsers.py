@@ -0,0 +1,248 @@
+"""
+Micro-benchmarks for the parsing hot paths
+
+Each parser runs over generated inputs of increasing size. Reported per
+case: ops/s and µs/op (timed over at least --min-time seconds after a
+warm-up call), and the peak memory one call allocates (tracemalloc).
+
+    cd backend
+    python -m benchmarks.bench_parsers
+    python -m benchmarks.bench_parsers --filter log --json parsers.json
+    python -m benchmarks.bench_parsers --baseline parsers.json
+
+parse_srt_stats_csv reuses its result for SINGLE_FLIGHT_TTL, so the
+uncached parser behind it is what gets measured.
+"""
+
+import argparse
+import json
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+from app.models.channel import Channel
+from app.services.network_service import parse_ifconfig_output, parse_ip_addr_output
+from app.services.srt_command_builder import build_secure_srt_command_from_channel
+from app.services.srt_stats_service import (
+    _parse_srt_stats_csv, extract_timestamp, parse_srt_log_connections, parse_srt_stats_json,
+)
+from app.services.stream_analyzer import parse_probe_output
+
+from .fleet import log_line, write_log, write_stats
+
+SIZES = {
+    "stats_csv": (100, 10_000, 100_000),
+    "stats_json": (100, 10_000, 100_000),
+    "log_connections": (1_000, 10_000, 100_000),
+    "extract_timestamp": (80, 400, 4_000),
+    "ifconfig": (2, 16, 128),
+    "ip_addr": (2, 16, 128),
+    "probe_output": (2, 8, 32),
+    "srt_command": (0, 8, 64),
+}
+
+
+def make_stats_json(path: Path, rows: int, rng: random.Random):
+    with open(path, "w") as f:
+        for i in range(rows):
+            f.write(json.dumps({
+                "sid": 42945600, "timepoint": i * 1000,
+                "link": {"rtt": rng.uniform(5, 80), "bandwidth": rng.uniform(100, 900)},
+                "send": {"packets": i * 4000, "packetsLost": rng.randint(0, 40), "mbitRate": rng.uniform(2, 12)},
+                "recv": {"packets": i * 4000, "packetsLost": rng.randint(0, 40), "mbitRate": rng.uniform(2, 12)},
+            }) + "\n")
+
+
+def make_timestamp_line(length: int, rng: random.Random) -> str:
+    """A log line padded to `length`, with its timestamp at the end (worst case for the regexes)"""
+    line = log_line(rng, datetime.now(), 42945600)
+    stamp, message = line.split("/", 1)
+    padding = "x" * max(length - len(line), 0)
+    return f"{message} {padding} {stamp}"
+
+
+def make_ifconfig(interfaces: int) -> str:
+    blocks = []
+    for i in range(interfaces):
+        blocks.append(
+            f"eth{i}: flags=4163<UP,BROADCAST,RUNNING,MULTICAST>  mtu 1500\n"
+            f"        inet 10.0.{i // 256}.{i % 256 + 1}  netmask 255.255.255.0  broadcast 10.0.{i // 256}.255\n"
+            f"        inet6 fe80::{i:x}:ff:fe00:1  prefixlen 64  scopeid 0x20<link>\n"
+            f"        ether 02:42:ac:11:{i // 256:02x}:{i % 256:02x}  txqueuelen 1000  (Ethernet)\n"
+            f"        RX packets 123456  bytes 987654321 (941.9 MiB)\n"
+            f"        TX packets 654321  bytes 123456789 (117.7 MiB)\n"
+        )
+    return "\n".join(blocks)
+
+
+def make_ip_addr(interfaces: int) -> str:
+    blocks = []
+    for i in range(interfaces):
+        blocks.append(
+            f"{i + 2}: eth{i}: <BROADCAST,MULTICAST,UP,LOWER_UP> mtu 1500 qdisc fq_codel state UP group default qlen 1000\n"
+            f"    link/ether 02:42:ac:11:{i // 256:02x}:{i % 256:02x} brd ff:ff:ff:ff:ff:ff\n"
+            f"    inet 10.0.{i // 256}.{i % 256 + 1}/24 brd 10.0.{i // 256}.255 scope global eth{i}\n"
+            f"       valid_lft forever preferred_lft forever\n"
+            f"    inet6 fe80::{i:x}:ff:fe00:1/64 scope link\n"
+            f"       valid_lft forever preferred_lft forever"
+        )
+    return "\n".join(blocks)
+
+
+def make_probe_output(streams: int) -> str:
+    """ffprobe -print_format json output with alternating video and audio streams"""
+    entries = []
+    for i in range(streams):
+        if i % 2 == 0:
+            entries.append({"index": i, "codec_type": "video", "codec_name": "h264", "profile": "High",
+                            "width": 1920, "height": 1080, "r_frame_rate": "50/1", "pix_fmt": "yuv420p",
+                            "bit_rate": "8000000"})
+        else:
+            entries.append({"index": i, "codec_type": "audio", "codec_name": "aac", "sample_rate": "48000",
+                            "channels": 2, "channel_layout": "stereo", "bit_rate": "192000",
+                            "tags": {"language": "eng"}})
+    return json.dumps({"streams": entries, "format": {"format_name": "mpegts", "bit_rate": "8500000"}})
+
+
+def make_channel(extra_params: int) -> Channel:
+    extra = ",".join(f"opt{i}={i}" for i in range(extra_params))
+    return Channel(channel_name="bench", input_port=10000, output_port=10001,
+                   passphrase="benchmark-passphrase", streamid="#!::r=live/bench,m=publish",
+                   input_extra_params=extra, output_extra_params=extra)
+
+
+def build_cases(workdir: Path, seed: int) -> List[Tuple[str, int, Callable[[], object]]]:
+    """(parser, input size, zero-argument call) for every parser and size"""
+    rng = random.Random(seed)
+    cases = []
+    start = datetime.now()
+
+    for rows in SIZES["stats_csv"]:
+        path = workdir / f"stats_{rows}.csv"
+        write_stats(path, rows, 2, rng, start)
+        cases.append(("parse_srt_stats_csv", rows, lambda p=path: _parse_srt_stats_csv(p)))
+
+    for rows in SIZES["stats_json"]:
+        path = workdir / f"stats_{rows}.json"
+        make_stats_json(path, rows, rng)
+        cases.append(("parse_srt_stats_json", rows, lambda p=path: parse_srt_stats_json(p)))
+
+    for lines in SIZES["log_connections"]:
+        path = workdir / f"log_{lines}.log"
+        write_log(path, lines, rng, start)
+        cases.append(("parse_srt_log_connections", lines, lambda p=path: parse_srt_log_connections(p)))
+
+    for length in SIZES["extract_timestamp"]:
+        line = make_timestamp_line(length, rng)
+        cases.append(("extract_timestamp", length, lambda l=line: extract_timestamp(l)))
+
+    for count in SIZES["ifconfig"]:
+        output = make_ifconfig(count)
+        cases.append(("parse_ifconfig_output", count, lambda o=output: parse_ifconfig_output(o)))
+
+    for count in SIZES["ip_addr"]:
+        output = make_ip_addr(count)
+        cases.append(("parse_ip_addr_output", count, lambda o=output: parse_ip_addr_output(o)))
+
+    for count in SIZES["probe_output"]:
+        # analyze_stream_sync: decode ffprobe's stdout, then build the cache entry
+        stdout = make_probe_output(count)
+        cases.append(("parse_probe_output", count,
+                       lambda s=stdout: parse_probe_output("bench", "srt://127.0.0.1:10000", json.loads(s))))
+
+    for count in SIZES["srt_command"]:
+        channel = make_channel(count)
+        stats, log = workdir / "bench.csv", workdir / "bench.log"
+        cases.append(("build_secure_srt_command_from_channel", count,
+                      lambda c=channel: build_secure_srt_command_from_channel(c, stats, log)))
+
+    return cases
+
+
+def measure(fn: Callable[[], object], min_time: float) -> Dict[str, float]:
+    """ops/s over at least `min_time` seconds, and the peak allocation of one call"""
+    fn()
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    baseline = tracemalloc.get_traced_memory()[0]
+    fn()
+    peak = tracemalloc.get_traced_memory()[1] - baseline
+    tracemalloc.stop()
+
+    loops = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time:
+            break
+        # Aim a bit past min_time so one more round is enough
+        loops = max(loops * 2, int(loops * min_time * 1.2 / max(elapsed, 1e-9)))
+    return {
+        "ops_per_s": round(loops / elapsed, 1),
+        "us_per_op": round(elapsed / loops * 1e6, 2),
+        "peak_kb": round(peak / 1024, 1),
+    }
+
+
+def compare(results: List[dict], baseline: List[dict], tolerance: float) -> List[str]:
+    """Cases whose throughput fell by more than `tolerance`"""
+    previous = {(r["parser"], r["size"]): r for r in baseline}
+    regressions = []
+    for result in results:
+        base = previous.get((result["parser"], result["size"]))
+        if base and result["ops_per_s"] < base["ops_per_s"] * (1 - tolerance):
+            regressions.append(f"{result['parser']}[{result['size']}]: "
+                               f"{base['ops_per_s']} -> {result['ops_per_s']} ops/s")
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--filter", default="", help="Only run parsers whose name contains this")
+    parser.add_argument("--min-time", type=float, default=0.5, help="Seconds to time each case for")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", help="Write results to this file")
+    parser.add_argument("--baseline", help="Results of an earlier run (--json) to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed relative slowdown")
+    args = parser.parse_args(argv)
+
+    workdir = Path(tempfile.mkdtemp(prefix="srt-bench-parsers-"))
+    results = []
+    try:
+        print(f"{'parser':<40} {'size':>8} {'ops/s':>12} {'µs/op':>12} {'peak KB':>10}")
+        for name, size, fn in build_cases(workdir, args.seed):
+            if args.filter not in name:
+                continue
+            result = {"parser": name, "size": size, **measure(fn, args.min_time)}
+            results.append(result)
+            print(f"{name:<40} {size:>8} {result['ops_per_s']:>12} {result['us_per_op']:>12} {result['peak_kb']:>10}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"created": time.strftime("%Y-%m-%dT%H:%M:%S"), "results": results}, f, indent=2)
+        print(f"\nResults written to {args.json}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f)["results"], args.tolerance)
+        if regressions:
+            print(f"\nRegressions (tolerance {args.tolerance:.0%}):")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"\nNo regressions against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
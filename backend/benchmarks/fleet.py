@@ -0,0 +1,125 @@
+"""
+Synthetic channel fleet for benchmarks
+
+Writes a config.json with N channels plus, per channel, a stats CSV and a
+log in the formats srt-live-transmit produces (-statspf:csv with several
+sockets per file, and "HH:MM:SS.ffffff/srt-live-transmit*X:..." log lines
+with connection events) - the same rows and lines the simulator
+(app/services/srt_simulator.py) writes live. Everything is generated from
+a seed, so the same arguments always give the same files.
+"""
+
+import json
+import os
+import random
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List, Optional
+
+from app.services.srt_simulator import STATS_HEADER, connection_lines, log_line, stats_row
+
+
+@dataclass
+class FleetSpec:
+    """Size of a synthetic fleet"""
+    channels: int = 10
+    stats_rows: int = 1000
+    log_lines: int = 2000
+    sockets_per_channel: int = 2
+    destinations: int = 0
+    seed: int = 1
+
+
+def channel_name(idx: int) -> str:
+    return f"bench-{idx:04d}"
+
+
+def channel_config(idx: int, pid: Optional[int], spec: FleetSpec) -> dict:
+    """A channel as stored in config.json; `pid` marks it running"""
+    name = channel_name(idx)
+    channel = {
+        "channel_name": name,
+        "input_protocol": "srt",
+        "input_ip": "0.0.0.0",
+        "input_port": 10000 + idx * 2,
+        "input_mode": "listener",
+        "output_protocol": "srt",
+        "output_ip": "0.0.0.0",
+        "output_port": 10001 + idx * 2,
+        "mode": "listener",
+        "status": "running" if pid else "stopped",
+        "pid": pid,
+        "pids": [pid] if pid else None,
+        "stats_file": f"static/stats/{name}.csv",
+        "start_date": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+    }
+    if spec.destinations:
+        channel["destinations"] = [
+            {"protocol": "srt", "mode": "listener", "host": "", "port": 20000 + idx * 10 + d}
+            for d in range(spec.destinations)
+        ]
+        channel["stats_file"] = f"static/stats/{name}_dest0.csv"
+    return channel
+
+
+def write_stats(path: Path, rows: int, sockets: int, rng: random.Random, start: datetime):
+    """Stats CSV with `rows` rows spread round-robin over `sockets` sockets"""
+    socket_ids = [42945600 + rng.randint(0, 99999) for _ in range(max(sockets, 1))]
+    counters = {sid: [0, 0] for sid in socket_ids}
+    with open(path, "w") as f:
+        f.write(STATS_HEADER + "\n")
+        for i in range(rows):
+            sid = socket_ids[i % len(socket_ids)]
+            counters[sid][0] += rng.randint(3000, 6000)
+            counters[sid][1] += rng.randint(3000, 6000)
+            ts = start + timedelta(seconds=i // len(socket_ids))
+            f.write(stats_row(rng, ts, (i // len(socket_ids)) * 1000, sid, *counters[sid]) + "\n")
+
+
+def write_log(path: Path, lines: int, rng: random.Random, start: datetime):
+    """Log with `lines` lines and a client connecting/disconnecting every ~200 lines"""
+    socket_id = 42945600 + rng.randint(0, 99999)
+    connected: Optional[tuple] = None
+    with open(path, "w") as f:
+        for i in range(lines):
+            ts = start + timedelta(milliseconds=i * 50)
+            if i % 200 == 0:
+                if connected:
+                    f.write("\n".join(connection_lines(ts, socket_id, *connected, connect=False)) + "\n")
+                socket_id += 1
+                connected = (f"10.{rng.randint(0, 255)}.{rng.randint(0, 255)}.{rng.randint(1, 254)}",
+                             rng.randint(1024, 65535))
+                f.write("\n".join(connection_lines(ts, socket_id, *connected, connect=True)) + "\n")
+            f.write(log_line(rng, ts, socket_id) + "\n")
+
+
+def build_fleet(root: Path, spec: FleetSpec, pid: Optional[int] = None, running: bool = True) -> List[dict]:
+    """
+    Write config.json, static/stats and static/logs for `spec` under `root`.
+    Running channels get `pid` (defaults to this process, which the
+    backend's liveness check then sees as alive); with running=False they
+    are stopped, ready to be started for real.
+    """
+    root = Path(root)
+    stats_dir = root / "static" / "stats"
+    logs_dir = root / "static" / "logs"
+    stats_dir.mkdir(parents=True, exist_ok=True)
+    logs_dir.mkdir(parents=True, exist_ok=True)
+    pid = (pid or os.getpid()) if running else None
+
+    rng = random.Random(spec.seed)
+    start = datetime.now().replace(microsecond=0) - timedelta(seconds=spec.stats_rows)
+    channels = []
+    for idx in range(spec.channels):
+        channel = channel_config(idx, pid, spec)
+        channels.append(channel)
+        name = channel["channel_name"]
+        suffixes = [f"_dest{d}" for d in range(spec.destinations)] or [""]
+        for suffix in suffixes:
+            write_stats(stats_dir / f"{name}{suffix}.csv", spec.stats_rows, spec.sockets_per_channel, rng, start)
+            write_log(logs_dir / f"{name}{suffix}.log", spec.log_lines, rng, start)
+
+    with open(root / "config.json", "w") as f:
+        json.dump({"channels": channels, "users": []}, f, indent=2)
+    return channels
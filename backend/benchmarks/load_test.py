@@ -0,0 +1,367 @@
+"""
+Load test: the real backend against a simulated fleet
+
+For every combination of --channels and --stats-rows, a synthetic fleet is
+written to a temporary directory (see benchmarks/fleet.py), the app is
+started there with uvicorn in a subprocess, and each endpoint is driven by
+--concurrency clients for --duration seconds. Reported per endpoint:
+throughput, p50/p95/p99/max latency (measured by the clients) and errors,
+plus the server's own event loop lag from /api/system/perf.
+
+    cd backend
+    pip install -r benchmarks/requirements.txt
+    python -m benchmarks.load_test --channels 10,100 --stats-rows 1000,20000
+
+With --simulate the channels start stopped and are started through the API
+with SRT_SIMULATE=1, so every one runs a simulated srt-live-transmit
+process (app/services/srt_simulator.py) that keeps appending stats and
+log lines during the run.
+
+--json writes the results; --baseline compares against an earlier --json
+file and exits with status 1 when an endpoint's p95 or throughput is worse
+by more than --tolerance.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import httpx
+
+from .fleet import FleetSpec, build_fleet, channel_name
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# name -> path; {channel} is replaced by a channel name, rotating per request
+ENDPOINTS = {
+    "channels": "/api/channels",
+    "stats_all": "/api/channels/stats/all",
+    "summary": "/api/channels/analytics/summary",
+    "full_info": "/api/channels/{channel}/full-info",
+    "logs": "/api/channels/{channel}/logs?lines=100",
+    "ws": "/ws",
+}
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    idx = min(int(q * len(sorted_values)), len(sorted_values) - 1)
+    return sorted_values[idx]
+
+
+def summarize(latencies_ms: List[float], errors: int, elapsed: float, **extra) -> dict:
+    values = sorted(latencies_ms)
+    return {
+        "requests": len(values),
+        "errors": errors,
+        "rps": round(len(values) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(values, 0.50), 2),
+        "p95_ms": round(percentile(values, 0.95), 2),
+        "p99_ms": round(percentile(values, 0.99), 2),
+        "max_ms": round(values[-1], 2) if values else 0.0,
+        **extra,
+    }
+
+
+class Server:
+    """The backend running in a fleet directory"""
+
+    def __init__(self, workdir: Path, port: int, env: Optional[Dict[str, str]] = None):
+        self.workdir = workdir
+        self.port = port
+        self.base_url = f"http://127.0.0.1:{port}"
+        self.env = env or {}
+        self.proc: Optional[subprocess.Popen] = None
+        self.log_path = workdir / "server.log"
+
+    def start(self, timeout: float = 60):
+        env = {**os.environ, **self.env, "PYTHONPATH": str(BACKEND_DIR)}
+        self._log = open(self.log_path, "w")
+        self.proc = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "main:app", "--app-dir", str(BACKEND_DIR),
+             "--host", "127.0.0.1", "--port", str(self.port), "--log-level", "warning"],
+            cwd=self.workdir, env=env, stdout=self._log, stderr=subprocess.STDOUT,
+        )
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.proc.poll() is not None:
+                raise RuntimeError(f"Server exited with {self.proc.returncode}, see {self.log_path}")
+            try:
+                if httpx.get(f"{self.base_url}/ready", timeout=1).status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+            time.sleep(0.2)
+        raise RuntimeError(f"Server did not become ready in {timeout}s, see {self.log_path}")
+
+    def start_channels(self, token: str, channels: int, concurrency: int = 8) -> int:
+        """Start every channel through the API; returns how many started"""
+        return asyncio.run(self._post_all(token, channels, "start", concurrency))
+
+    def stop_channels(self, token: str, channels: int, concurrency: int = 8):
+        asyncio.run(self._post_all(token, channels, "stop", concurrency))
+        # Whatever the API could not stop must not outlive the run
+        try:
+            with open(self.workdir / "config.json") as f:
+                leftover = [pid for ch in json.load(f)["channels"] for pid in (ch.get("pids") or [])]
+        except (OSError, ValueError, KeyError):
+            leftover = []
+        for pid in leftover:
+            try:
+                os.killpg(pid, signal.SIGTERM)
+            except OSError:
+                pass
+
+    async def _post_all(self, token: str, channels: int, action: str, concurrency: int) -> int:
+        slots = asyncio.Semaphore(concurrency)
+        async with httpx.AsyncClient(base_url=self.base_url, headers={"Authorization": f"Bearer {token}"},
+                                     timeout=60) as client:
+            async def post(idx: int) -> bool:
+                async with slots:
+                    response = await client.post(f"/api/channels/{channel_name(idx)}/{action}")
+                    return response.status_code == 200
+            return sum(await asyncio.gather(*(post(i) for i in range(channels))))
+
+    def stop(self):
+        if self.proc and self.proc.poll() is None:
+            self.proc.terminate()
+            try:
+                self.proc.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.proc.kill()
+                self.proc.wait()
+        self._log.close()
+
+    def login(self, username: str, password: str) -> str:
+        response = httpx.post(f"{self.base_url}/api/auth/login",
+                              data={"username": username, "password": password}, timeout=30)
+        response.raise_for_status()
+        return response.json()["access_token"]
+
+
+async def drive_http(base_url: str, token: str, path: str, channels: int,
+                     concurrency: int, duration: float) -> dict:
+    """`concurrency` clients requesting `path` back to back for `duration` seconds"""
+    latencies: List[float] = []
+    errors = 0
+    counter = 0
+    deadline = time.perf_counter() + duration
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, headers={"Authorization": f"Bearer {token}"},
+                                 limits=limits, timeout=60) as client:
+        async def worker():
+            nonlocal errors, counter
+            while time.perf_counter() < deadline:
+                counter += 1
+                url = path.replace("{channel}", channel_name(counter % channels))
+                started = time.perf_counter()
+                try:
+                    response = await client.get(url)
+                    await response.aread()
+                    if response.status_code >= 400:
+                        errors += 1
+                        continue
+                except httpx.HTTPError:
+                    errors += 1
+                    continue
+                latencies.append((time.perf_counter() - started) * 1000)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    return summarize(latencies, errors, elapsed)
+
+
+async def drive_ws(base_url: str, token: str, channels: int, clients: int, duration: float) -> dict:
+    """
+    `clients` WebSocket connections, each subscribed to the fleet topic and
+    one channel, sending get_channels back to back; latency is the round trip
+    to its channel_update/channel_delta answer
+    """
+    import websockets
+
+    ws_url = base_url.replace("http://", "ws://") + f"/ws?token={token}"
+    latencies: List[float] = []
+    errors = 0
+    frames = 0
+    deadline = time.perf_counter() + duration
+
+    def is_channel_reply(frame) -> bool:
+        if isinstance(frame, bytes):
+            return False
+        message = json.loads(frame)
+        if message.get("type") == "batch":
+            return any(m.get("type") in ("channel_update", "channel_delta") for m in message["messages"])
+        return message.get("type") in ("channel_update", "channel_delta")
+
+    async def client(idx: int):
+        nonlocal errors, frames
+        try:
+            async with websockets.connect(ws_url, max_size=None) as ws:
+                await ws.send(json.dumps({"type": "subscribe",
+                                          "topics": ["fleet", f"channel:{channel_name(idx % channels)}"]}))
+                while time.perf_counter() < deadline:
+                    started = time.perf_counter()
+                    await ws.send(json.dumps({"type": "get_channels"}))
+                    while True:
+                        frame = await asyncio.wait_for(ws.recv(), timeout=30)
+                        frames += 1
+                        if is_channel_reply(frame):
+                            break
+                    latencies.append((time.perf_counter() - started) * 1000)
+        except Exception as e:
+            print(f"  ws client {idx}: {e}")
+            errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client(i) for i in range(clients)))
+    elapsed = time.perf_counter() - started
+    return summarize(latencies, errors, elapsed, frames_per_s=round(frames / elapsed, 1))
+
+
+def server_perf(server: Server, token: str) -> dict:
+    try:
+        response = httpx.get(f"{server.base_url}/api/system/perf",
+                             headers={"Authorization": f"Bearer {token}"}, timeout=10)
+        return response.json()
+    except (httpx.HTTPError, ValueError):
+        return {}
+
+
+def run_scenario(spec: FleetSpec, args) -> dict:
+    workdir = Path(tempfile.mkdtemp(prefix=f"srt-bench-{spec.channels}ch-"))
+    print(f"\n== {spec.channels} channels, {spec.stats_rows} stats rows, {spec.log_lines} log lines ({workdir})")
+    build_fleet(workdir, spec, running=not args.simulate)
+    server = Server(workdir, args.port, env={"SRT_SIMULATE": "1"} if args.simulate else None)
+    results = {}
+    perf = {}
+    token = None
+    try:
+        server.start()
+        token = server.login(args.username, args.password)
+        if args.simulate:
+            started = server.start_channels(token, spec.channels)
+            print(f"   started {started}/{spec.channels} simulated channels")
+        for name in args.endpoints:
+            if name == "ws":
+                result = asyncio.run(drive_ws(server.base_url, token, spec.channels,
+                                              args.ws_clients, args.duration))
+            else:
+                result = asyncio.run(drive_http(server.base_url, token, ENDPOINTS[name], spec.channels,
+                                                args.concurrency, args.duration))
+            results[name] = result
+            print_row(name, result)
+        perf = server_perf(server, token)
+        lag = perf.get("loop_lag", {})
+        print(f"   server loop lag p99 {lag.get('p99_ms', 0)}ms max {lag.get('max_ms', 0)}ms")
+    finally:
+        if args.simulate and token:
+            server.stop_channels(token, spec.channels)
+        server.stop()
+        if args.keep:
+            print(f"   kept {workdir}")
+        else:
+            shutil.rmtree(workdir, ignore_errors=True)
+    return {
+        "channels": spec.channels,
+        "stats_rows": spec.stats_rows,
+        "log_lines": spec.log_lines,
+        "endpoints": results,
+        "server_loop_lag": perf.get("loop_lag", {}),
+    }
+
+
+def print_row(name: str, result: dict):
+    extra = f" {result['frames_per_s']:>8} frames/s" if "frames_per_s" in result else ""
+    print(f"   {name:<10} {result['rps']:>8} req/s  p50 {result['p50_ms']:>8}ms  p95 {result['p95_ms']:>8}ms"
+          f"  p99 {result['p99_ms']:>8}ms  max {result['max_ms']:>8}ms  errors {result['errors']}{extra}")
+
+
+def compare(results: List[dict], baseline: List[dict], tolerance: float) -> List[str]:
+    """Endpoints whose p95 rose or throughput fell by more than `tolerance`"""
+    previous = {(r["channels"], r["stats_rows"], name): ep
+                for r in baseline for name, ep in r["endpoints"].items()}
+    regressions = []
+    for scenario in results:
+        for name, current in scenario["endpoints"].items():
+            base = previous.get((scenario["channels"], scenario["stats_rows"], name))
+            if not base:
+                continue
+            label = f"{scenario['channels']}ch/{scenario['stats_rows']}rows {name}"
+            if base["p95_ms"] and current["p95_ms"] > base["p95_ms"] * (1 + tolerance):
+                regressions.append(f"{label}: p95 {base['p95_ms']}ms -> {current['p95_ms']}ms")
+            if base["rps"] and current["rps"] < base["rps"] * (1 - tolerance):
+                regressions.append(f"{label}: {base['rps']} -> {current['rps']} req/s")
+    return regressions
+
+
+def _int_list(value: str) -> List[int]:
+    return [int(v) for v in value.split(",") if v]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--channels", type=_int_list, default=[10, 100], help="Channel counts (comma separated)")
+    parser.add_argument("--stats-rows", type=_int_list, default=[1000, 20000],
+                        help="Rows per stats CSV (comma separated)")
+    parser.add_argument("--log-lines", type=int, default=5000, help="Lines per channel log")
+    parser.add_argument("--sockets", type=int, default=2, help="SRT sockets per stats file")
+    parser.add_argument("--endpoints", default=",".join(ENDPOINTS),
+                        help=f"Endpoints to drive (comma separated, from {', '.join(ENDPOINTS)})")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent HTTP clients")
+    parser.add_argument("--ws-clients", type=int, default=20, help="Concurrent WebSocket clients")
+    parser.add_argument("--duration", type=float, default=10, help="Seconds per endpoint")
+    parser.add_argument("--port", type=int, default=18900)
+    parser.add_argument("--username", default="admin")
+    parser.add_argument("--password", default="admin")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", help="Write results to this file")
+    parser.add_argument("--baseline", help="Results of an earlier run (--json) to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed relative regression")
+    parser.add_argument("--simulate", action="store_true",
+                        help="Start the channels with the srt-live-transmit simulator")
+    parser.add_argument("--keep", action="store_true", help="Keep the fleet directories")
+    args = parser.parse_args(argv)
+
+    args.endpoints = [e for e in args.endpoints.split(",") if e]
+    unknown = [e for e in args.endpoints if e not in ENDPOINTS]
+    if unknown:
+        parser.error(f"unknown endpoints: {', '.join(unknown)}")
+
+    results = []
+    for channels in args.channels:
+        for rows in args.stats_rows:
+            spec = FleetSpec(channels=channels, stats_rows=rows, log_lines=args.log_lines,
+                             sockets_per_channel=args.sockets, seed=args.seed)
+            results.append(run_scenario(spec, args))
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"created": time.strftime("%Y-%m-%dT%H:%M:%S"), "results": results}, f, indent=2)
+        print(f"\nResults written to {args.json}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f)["results"], args.tolerance)
+        if regressions:
+            print(f"\nRegressions (tolerance {args.tolerance:.0%}):")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"\nNo regressions against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
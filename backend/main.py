@@ -3,6 +3,10 @@ SRT Channel Manager API
 Main application entry point with modular architecture
 """
 
+import time
+
+_import_started = time.perf_counter()
+
 import os
 import json
 import asyncio
@@ -11,6 +15,7 @@ from pathlib import Path
 
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from dotenv import load_dotenv
 from jose import JWTError
 
@@ -18,12 +23,18 @@ from jose import JWTError
 load_dotenv()
 
 # Import from new modular structure
-from app.api import auth_router, channels_router, system_router, users_router
+from app.api import auth_router, channels_router, dashboard_router, system_router, users_router
 from app.database import init_database
 from app.core.websocket import manager
+from app.core.executors import run_io, start_loop_watchdog, loop_watchdog, shutdown_executors
+from app.core.perf import PERF_ENABLED, PerfMiddleware, start_lag_sampler, stop_lag_sampler
 from app.core.security import SECRET_KEY, ALGORITHM, decode_token
-from app.services.channel_service import load_channels, save_channels, ensure_directories
+from app.services.channel_service import config_lock, load_channels, save_channels, ensure_directories, ensure_indexes
+from app.services.channel_journal import channel_journal
 from app.services.stream_analyzer import start_analyzer, load_cache
+from app.services.telemetry import start_telemetry, publisher
+
+IMPORT_MS = round((time.perf_counter() - _import_started) * 1000, 1)
 
 # Create FastAPI app
 app = FastAPI(
@@ -40,46 +51,110 @@ app.add_middleware(
     allow_origins=cors_origins,
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "PATCH", "DELETE"],
-    allow_headers=["Authorization", "Content-Type"],
+    allow_headers=["Authorization", "Content-Type", "If-None-Match"],
+    expose_headers=["ETag", "X-Total-Count", "X-Next-Cursor"],
 )
 
+# Per-route latency histograms (/api/system/perf)
+if PERF_ENABLED:
+    app.add_middleware(PerfMiddleware)
+
 # Include routers
 app.include_router(auth_router)
 app.include_router(channels_router)
+app.include_router(dashboard_router)
 app.include_router(system_router)
 app.include_router(users_router)
 
 
+def _sync_startup_statuses():
+    """Mark channels whose process is gone (or never recorded) as stopped"""
+    # Requests are served while this runs - hold the lock across load and save
+    # so a concurrent edit is neither overwritten nor lost
+    with config_lock:
+        channels = load_channels()
+        for channel in channels:
+            if channel.pid:
+                try:
+                    os.kill(channel.pid, 0)
+                    channel.status = "running"
+                except OSError:
+                    channel.status = "stopped"
+                    channel.pid = None
+            else:
+                channel.status = "stopped"
+
+        save_channels(channels)
+        return channels
+
+
+# Filled in by _load_state(); /ready reports it
+startup_state = {"ready": False, "error": None, "import_ms": IMPORT_MS, "phases_ms": {}, "total_ms": None}
+_startup_task = None
+
+
+async def _timed(phase: str, fn):
+    started = time.perf_counter()
+    result = await run_io(fn)
+    startup_state["phases_ms"][phase] = round((time.perf_counter() - started) * 1000, 1)
+    return result
+
+
+async def _load_state():
+    """
+    Load users, channel statuses and the stream info cache, then start the
+    background tasks. The three loads touch separate files, so they run
+    concurrently; the status reconcile holds config_lock for its
+    load-modify-save, so API edits made meanwhile are serialized with it.
+    """
+    started = time.perf_counter()
+    try:
+        _, channels, _ = await asyncio.gather(
+            _timed("init_database", init_database),
+            _timed("reconcile_channels", _sync_startup_statuses),
+            _timed("load_cache", load_cache),
+        )
+        print(f"Startup complete: {len(channels)} channels processed")
+
+        # Start background stream analyzer (every 10 seconds)
+        start_analyzer(interval=10)
+        print("Stream analyzer started")
+
+        # Push telemetry to WebSocket subscribers
+        start_telemetry()
+    except Exception as e:
+        startup_state["error"] = str(e)
+        print(f"Startup failed: {e}")
+        return
+
+    startup_state["total_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    startup_state["ready"] = True
+    phases = ", ".join(f"{name} {ms}ms" for name, ms in startup_state["phases_ms"].items())
+    print(f"Ready in {startup_state['total_ms']}ms after {IMPORT_MS}ms of imports ({phases})")
+
+
 @app.on_event("startup")
 async def startup_event():
     """Initialize application on startup"""
-    # Initialize database
-    init_database()
+    global _startup_task
+    # Report callbacks that block the event loop (LOOP_BLOCK_DEBUG)
+    start_loop_watchdog()
+    start_lag_sampler()
 
     # Ensure directories exist
     ensure_directories()
     Path("static/uploads").mkdir(parents=True, exist_ok=True)
 
-    # Sync channel statuses with actual process states
-    channels = load_channels()
-    for channel in channels:
-        if channel.pid:
-            try:
-                os.kill(channel.pid, 0)
-                channel.status = "running"
-            except OSError:
-                channel.status = "stopped"
-                channel.pid = None
-        else:
-            channel.status = "stopped"
+    # Serve right away; /ready turns 200 once the state is loaded
+    _startup_task = asyncio.create_task(_load_state())
 
-    save_channels(channels)
-    print(f"Startup complete: {len(channels)} channels processed")
 
-    # Start background stream analyzer (every 10 seconds)
-    load_cache()
-    start_analyzer(interval=10)
-    print("Stream analyzer started")
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background work on shutdown"""
+    loop_watchdog.stop()
+    stop_lag_sampler()
+    shutdown_executors()
 
 
 @app.get("/")
@@ -92,20 +167,67 @@ async def root():
         "endpoints": {
             "login": "/api/auth/login",
             "channels": "/api/channels",
+            "dashboard": "/api/dashboard",
             "system": "/api/system/info",
             "interfaces": "/api/system/interfaces",
             "docs": "/docs",
-            "websocket": "/ws"
+            "websocket": "/ws",
+            "health": "/health",
+            "ready": "/ready"
         }
     }
 
 
 @app.get("/health")
 async def health_check():
-    """API health check"""
+    """API health check (the process is up)"""
     return {"status": "healthy", "timestamp": datetime.now().isoformat()}
 
 
+@app.get("/ready")
+async def readiness_check():
+    """Readiness check: 200 once users, channel statuses and caches are loaded, 503 before"""
+    status = "ready" if startup_state["ready"] else "failed" if startup_state["error"] else "starting"
+    return JSONResponse(
+        {"status": status, **startup_state, "timestamp": datetime.now().isoformat()},
+        status_code=200 if startup_state["ready"] else 503
+    )
+
+
+def _channel_sync_message(message: dict) -> dict:
+    """
+    Answer get_channels: only the channels changed or deleted since the
+    client's version, or a full snapshot when no delta is possible
+    """
+    try:
+        since = int(message["since"]) if message.get("since") is not None else None
+    except (TypeError, ValueError):
+        since = None
+
+    delta = channel_journal.changes_since(since, message.get("epoch")) if since is not None else None
+    if delta is not None:
+        version, changed, deleted = delta
+        return {
+            "type": "channel_delta",
+            "epoch": channel_journal.epoch,
+            "since": since,
+            "version": version,
+            "changed": changed,
+            "deleted": deleted
+        }
+
+    # Journal edits made outside this process too (reloads under config_lock
+    # when config.json changed since the indexes were built)
+    ensure_indexes()
+    version, channels = channel_journal.snapshot()
+    return {
+        "type": "channel_update",
+        "epoch": channel_journal.epoch,
+        "version": version,
+        "channels": channels
+    }
+
+
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket, token: str = None):
     """WebSocket for real-time channel status updates with authentication"""
@@ -158,17 +280,38 @@ async def websocket_endpoint(websocket: WebSocket, token: str = None):
                     message_type = message.get("type")
 
                     if message_type == "ping":
-                        await websocket.send_json({
+                        await manager.send_personal_message({
                             "type": "pong",
                             "timestamp": datetime.now().isoformat()
-                        })
+                        }, websocket)
                         last_pong_time = asyncio.get_event_loop().time()
                     elif message_type == "get_channels":
-                        channels = load_channels()
-                        await websocket.send_json({
-                            "type": "channel_update",
-                            "channels": [ch.model_dump() for ch in channels]
-                        })
+                        await manager.send_personal_message(await run_io(_channel_sync_message, message), websocket)
+                    elif message_type == "subscribe":
+                        topics = message.get("topics") or []
+                        if isinstance(topics, str):
+                            topics = [topics]
+                        added = manager.subscribe(websocket, topics)
+                        await manager.send_personal_message({
+                            "type": "subscribed",
+                            "topics": sorted(manager.topics_of(websocket))
+                        }, websocket)
+                        await publisher.send_latest(websocket, added)
+                    elif message_type == "configure":
+                        await manager.send_personal_message(manager.configure(
+                            websocket,
+                            batch=message.get("batch"),
+                            encoding=message.get("encoding")
+                        ), websocket)
+                    elif message_type == "unsubscribe":
+                        topics = message.get("topics") or []
+                        if isinstance(topics, str):
+                            topics = [topics]
+                        manager.unsubscribe(websocket, topics)
+                        await manager.send_personal_message({
+                            "type": "subscribed",
+                            "topics": sorted(manager.topics_of(websocket))
+                        }, websocket)
                     else:
                         print(f"Unknown WebSocket message type: {message_type} from {username}")
                 except json.JSONDecodeError as e:
@@ -184,9 +327,9 @@ async def websocket_endpoint(websocket: WebSocket, token: str = None):
 
     except WebSocketDisconnect:
         print(f"WebSocket disconnected normally: {username} ({client_id})")
-        manager.disconnect(websocket)
     except Exception as e:
         print(f"WebSocket error for {username} ({client_id}): {type(e).__name__}: {str(e)}")
+    finally:
         manager.disconnect(websocket)
 
 
@@ -195,4 +338,8 @@ if __name__ == "__main__":
     print("Initializing database...")
     init_database()
     print("Starting server...")
-    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True, log_level="info")
+    uvicorn.run(
+        "main:app", host="0.0.0.0", port=8000, reload=True, log_level="info",
+        ws="websockets",
+        ws_per_message_deflate=os.getenv("WS_PER_MESSAGE_DEFLATE", "1").lower() in ("1", "true", "yes")
+    )
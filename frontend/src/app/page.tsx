@@ -2,8 +2,8 @@
 
 import { useState, useEffect } from 'react'
 import { Channel, NetworkInterface } from '@/types'
-import { channelsAPI, systemAPI, StreamInfo, SrtStatus, AnalyticsSummary, ServerStats } from '@/lib/api'
-import { useWebSocket } from '@/hooks/useWebSocket'
+import { channelsAPI, systemAPI, dashboardAPI, StreamInfo, SrtStatus, AnalyticsSummary, ServerStats } from '@/lib/api'
+import { useWebSocket, TelemetryMessage } from '@/hooks/useWebSocket'
 import { useStore } from '@/store/useStore'
 import ChannelDialog from '@/components/channels/ChannelDialog'
 import ChannelLogsModal from '@/components/channels/ChannelLogsModal'
@@ -50,8 +50,22 @@ export default function Dashboard() {
   const [analytics, setAnalytics] = useState<AnalyticsSummary | null>(null)
   const [serverStats, setServerStats] = useState<ServerStats | null>(null)
 
+  // Fleet summary, media info and server stats are pushed over the WebSocket
+  const handleTelemetry = (message: TelemetryMessage) => {
+    if (message.type === 'fleet_summary') {
+      setAnalytics(message.summary as AnalyticsSummary)
+    } else if (message.type === 'server_stats') {
+      setServerStats(message.stats as ServerStats)
+    } else if (message.type === 'media_info' && message.channel_name) {
+      const name = message.channel_name
+      setStreamInfoCache((prev) => ({ ...prev, [name]: message.info as StreamInfo }))
+    }
+  }
+
   const { channels: wsChannels, isConnected } = useWebSocket({
-    onChannelsUpdate: (updated) => setChannels(updated)
+    onChannelsUpdate: (updated) => setChannels(updated),
+    onTelemetry: handleTelemetry,
+    topics: ['fleet', 'system']
   })
 
   // Load data
@@ -80,36 +94,32 @@ export default function Dashboard() {
     if (wsChannels.length > 0) setChannels(wsChannels)
   }, [wsChannels])
 
-  // Periodically load stream info and analytics for all running channels
+  // Load stream info and analytics for all running channels - polled only
+  // while the WebSocket is down, otherwise kept current by pushed telemetry
   useEffect(() => {
     const loadAllData = async () => {
       try {
-        const [allInfo, analyticsData] = await Promise.all([
-          channelsAPI.getAllStreamInfo(),
-          channelsAPI.getAnalyticsSummary()
+        // Server stats change on every call - fetched apart so the rest can be a 304
+        const [dashboard, server] = await Promise.all([
+          dashboardAPI.get(['summary', 'media']),
+          systemAPI.getStats(),
         ])
-        setStreamInfoCache(allInfo)
-        setAnalytics(analyticsData)
+        if (dashboard.media) setStreamInfoCache(dashboard.media)
+        if (dashboard.summary) setAnalytics(dashboard.summary)
+        setServerStats(server)
       } catch {
         // Ignore errors
       }
-
-      // Load server stats separately (may fail if psutil not installed)
-      try {
-        const stats = await systemAPI.getStats()
-        setServerStats(stats)
-      } catch {
-        // Ignore - server stats are optional
-      }
     }
 
     // Load immediately
     loadAllData()
+    if (isConnected) return
 
     // Then every 3 seconds for real-time stats
     const interval = setInterval(loadAllData, 3000)
     return () => clearInterval(interval)
-  }, [])
+  }, [isConnected])
 
   // Toggle dark mode
   const toggleDarkMode = () => {
@@ -193,18 +203,15 @@ export default function Dashboard() {
     setModalOpen(true)
   }
 
+  // Errors (e.g. a 409 port conflict) propagate to the dialog, which shows them
   const handleSave = async (data: any) => {
-    try {
-      if (modalMode === 'create') {
-        await channelsAPI.create(data)
-      } else {
-        // Use original channel name for API call (in case of rename)
-        await channelsAPI.update(originalChannelName, data)
-      }
-      loadData()
-    } catch (error) {
-      console.error('Failed to save:', error)
+    if (modalMode === 'create') {
+      await channelsAPI.create(data)
+    } else {
+      // Use original channel name for API call (in case of rename)
+      await channelsAPI.update(originalChannelName, data)
     }
+    loadData()
   }
 
   // Toggle expanded channel
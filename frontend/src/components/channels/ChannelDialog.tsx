@@ -2,6 +2,7 @@
 
 import { useState, useEffect } from 'react'
 import { Channel, NetworkInterface, DestinationOutput } from '@/types'
+import { channelsAPI, APIError, PortConflict } from '@/lib/api'
 import { X, Plus, Trash2, ChevronDown, ChevronUp } from 'lucide-react'
 
 // Extra Parameters Templates
@@ -50,7 +51,7 @@ const defaultOutput: OutputConfig = {
 interface ChannelDialogProps {
   open: boolean
   onClose: () => void
-  onSave: (channel: any) => void
+  onSave: (channel: any) => Promise<void>
   mode: 'create' | 'edit'
   initialData?: Channel
   interfaces?: NetworkInterface[]
@@ -91,9 +92,17 @@ export default function ChannelDialog({
   const [latency, setLatency] = useState(120)
   const [passphrase, setPassphrase] = useState('')
 
+  // Save state - a 409 lists the ports other channels already use
+  const [saving, setSaving] = useState(false)
+  const [saveError, setSaveError] = useState('')
+  const [conflicts, setConflicts] = useState<PortConflict[]>([])
+
   // Reset form when dialog opens
   useEffect(() => {
     if (open) {
+      setSaving(false)
+      setSaveError('')
+      setConflicts([])
       if (initialData && mode === 'edit') {
         setChannelName(initialData.channel_name)
         setInputProtocol(initialData.input_protocol as 'srt' | 'udp')
@@ -161,6 +170,20 @@ export default function ChannelDialog({
         setLatency(120)
         setPassphrase('')
         setOutputs([{ ...defaultOutput }])
+
+        // Pre-fill ports no channel uses yet, keeping the defaults if the lookup fails
+        let cancelled = false
+        Promise.all([channelsAPI.getFreePorts('input'), channelsAPI.getFreePorts('output')])
+          .then(([input, output]) => {
+            if (cancelled) return
+            if (input.ports.length) setInputPort(input.ports[0])
+            if (output.ports.length) {
+              setOutputPort(output.ports[0])
+              setOutputs(prev => prev.map((out, i) => i === 0 ? { ...out, port: output.ports[0] } : out))
+            }
+          })
+          .catch(error => console.error('Failed to load free ports:', error))
+        return () => { cancelled = true }
       }
     }
   }, [open, initialData, mode])
@@ -185,7 +208,7 @@ export default function ChannelDialog({
     setOutputs(outputs.map((out, i) => i === idx ? { ...out, expanded: !out.expanded } : out))
   }
 
-  const handleSubmit = (e: React.FormEvent) => {
+  const handleSubmit = async (e: React.FormEvent) => {
     e.preventDefault()
 
     // Convert outputs to destinations array
@@ -227,8 +250,20 @@ export default function ChannelDialog({
       destinations: destinations.length > 1 ? destinations : undefined,
     }
 
-    onSave(channel)
-    onClose()
+    setSaving(true)
+    setSaveError('')
+    setConflicts([])
+    try {
+      await onSave(channel)
+      onClose()
+    } catch (error) {
+      if (error instanceof APIError && error.status === 409 && Array.isArray(error.detail?.conflicts)) {
+        setConflicts(error.detail.conflicts)
+      }
+      setSaveError(error instanceof Error ? error.message : 'Failed to save channel')
+    } finally {
+      setSaving(false)
+    }
   }
 
   if (!open) return null
@@ -558,6 +593,26 @@ export default function ChannelDialog({
             ))}
           </div>
 
+          {saveError && (
+            <div className="p-3 rounded-lg bg-red-50 dark:bg-red-900/20 border border-red-200 dark:border-red-800">
+              {conflicts.length > 0 ? (
+                <>
+                  <p className="text-sm font-medium text-red-600 dark:text-red-400">Ports already in use:</p>
+                  <ul className="mt-1 space-y-0.5 text-sm text-red-600 dark:text-red-400">
+                    {conflicts.map((c, i) => (
+                      <li key={i}>
+                        {c.protocol.toUpperCase()} {c.address}:{c.port} ({c.role}) is used by{' '}
+                        <span className="font-medium">{c.channel}</span> ({c.other_role}{c.running ? ', running' : ''})
+                      </li>
+                    ))}
+                  </ul>
+                </>
+              ) : (
+                <p className="text-sm text-red-600 dark:text-red-400">{saveError}</p>
+              )}
+            </div>
+          )}
+
           {/* Actions */}
           <div className="flex justify-end gap-3 pt-4 border-t border-[#e5e5e5] dark:border-[#333]">
             <button
@@ -569,7 +624,7 @@ export default function ChannelDialog({
             </button>
             <button
               type="submit"
-              disabled={!channelName}
+              disabled={!channelName || saving}
               className="px-4 py-2 bg-[#111] dark:bg-white text-white dark:text-[#111] rounded-lg hover:bg-[#333] dark:hover:bg-[#eee] transition-colors disabled:opacity-50"
             >
               {mode === 'create' ? 'Create' : 'Save'}
@@ -2,6 +2,7 @@
 
 import { useState, useEffect } from 'react'
 import { Users, Globe, Clock, Activity, TrendingUp, AlertCircle } from 'lucide-react'
+import { channelsAPI } from '@/lib/api'
 
 interface Client {
   id: string
@@ -12,9 +13,14 @@ interface Client {
   bytesReceived: number
   bytesSent: number
   bandwidth: number
+  rtt: number | null
+  lossPct: number | null
   status: 'active' | 'idle' | 'warning'
 }
 
+// Send loss above this share of packets marks a client as degraded
+const LOSS_WARNING_PCT = 5
+
 interface ClientsTabProps {
   channelName: string
   autoRefresh: boolean
@@ -24,51 +30,40 @@ export default function ClientsTab({ channelName, autoRefresh }: ClientsTabProps
   const [clients, setClients] = useState<Client[]>([])
   const [loading, setLoading] = useState(true)
 
-  // Mock data - replace with actual API call
-  const fetchClients = async () => {
-    // TODO: Replace with actual API call
-    // const response = await channelsAPI.getClients(channelName)
-    // setClients(response.clients)
+  const formatDuration = (seconds: number | null) => {
+    if (seconds === null) return 'unknown'
+    const h = Math.floor(seconds / 3600)
+    const m = Math.floor((seconds % 3600) / 60)
+    if (h > 0) return `${h}h ${m}m`
+    if (m > 0) return `${m}m`
+    return `${Math.floor(seconds)}s`
+  }
 
-    // Mock data for demonstration
-    setTimeout(() => {
-      setClients([
-        {
-          id: '1',
-          ip: '192.168.1.100',
-          port: 45123,
-          connectedAt: new Date(Date.now() - 3600000).toISOString(),
-          duration: '1h 0m',
-          bytesReceived: 1024 * 1024 * 500, // 500 MB
-          bytesSent: 1024 * 1024 * 10, // 10 MB
-          bandwidth: 5.2,
-          status: 'active'
-        },
-        {
-          id: '2',
-          ip: '10.0.0.50',
-          port: 51234,
-          connectedAt: new Date(Date.now() - 1800000).toISOString(),
-          duration: '30m',
-          bytesReceived: 1024 * 1024 * 250,
-          bytesSent: 1024 * 1024 * 5,
-          bandwidth: 4.8,
-          status: 'active'
-        },
-        {
-          id: '3',
-          ip: '172.16.0.10',
-          port: 49876,
-          connectedAt: new Date(Date.now() - 120000).toISOString(),
-          duration: '2m',
-          bytesReceived: 1024 * 1024 * 20,
-          bytesSent: 1024 * 100,
-          bandwidth: 0.5,
-          status: 'warning'
+  const fetchClients = async () => {
+    try {
+      const response = await channelsAPI.getClients(channelName)
+      setClients(response.active_clients.map((session): Client => {
+        const stats = session.stats
+        const lossPct = stats ? Math.max(stats.send_loss_pct, stats.recv_loss_pct) : null
+        return {
+          id: `${session.process_idx ?? 0}-${session.ip}:${session.port}`,
+          ip: session.ip,
+          port: session.port,
+          connectedAt: session.connected_at || new Date().toISOString(),
+          duration: formatDuration(session.duration_seconds),
+          bytesReceived: stats?.totals.byte_recv ?? 0,
+          bytesSent: stats?.totals.byte_sent ?? 0,
+          bandwidth: stats ? stats.send_rate_mbps + stats.recv_rate_mbps : 0,
+          rtt: stats?.rtt_ms ?? null,
+          lossPct,
+          status: !stats ? 'active' : !stats.active ? 'idle' : (lossPct ?? 0) > LOSS_WARNING_PCT ? 'warning' : 'active'
         }
-      ])
+      }))
+    } catch (err) {
+      console.error('Error fetching clients:', err)
+    } finally {
       setLoading(false)
-    }, 500)
+    }
   }
 
   useEffect(() => {
@@ -213,20 +208,32 @@ export default function ClientsTab({ channelName, autoRefresh }: ClientsTabProps
                     {client.status === 'warning' && (
                       <>
                         <AlertCircle className="inline w-3 h-3 mr-1" />
-                        Low Bandwidth
+                        Packet Loss
                       </>
                     )}
                   </span>
                 </div>
               </div>
 
-              <div className="grid grid-cols-2 md:grid-cols-4 gap-4 pt-3 border-t border-gray-100 dark:border-gray-800">
+              <div className="grid grid-cols-2 md:grid-cols-6 gap-4 pt-3 border-t border-gray-100 dark:border-gray-800">
                 <div>
                   <p className="text-xs text-gray-500 dark:text-gray-400">Bandwidth</p>
                   <p className="text-sm font-semibold text-gray-900 dark:text-gray-100">
                     {client.bandwidth.toFixed(2)} Mbps
                   </p>
                 </div>
+                <div>
+                  <p className="text-xs text-gray-500 dark:text-gray-400">RTT</p>
+                  <p className="text-sm font-semibold text-gray-900 dark:text-gray-100">
+                    {client.rtt !== null ? `${client.rtt.toFixed(1)} ms` : '-'}
+                  </p>
+                </div>
+                <div>
+                  <p className="text-xs text-gray-500 dark:text-gray-400">Loss</p>
+                  <p className={`text-sm font-semibold ${client.status === 'warning' ? 'text-orange-600 dark:text-orange-400' : 'text-gray-900 dark:text-gray-100'}`}>
+                    {client.lossPct !== null ? `${client.lossPct.toFixed(2)}%` : '-'}
+                  </p>
+                </div>
                 <div>
                   <p className="text-xs text-gray-500 dark:text-gray-400">Received</p>
                   <p className="text-sm font-semibold text-gray-900 dark:text-gray-100">
@@ -260,22 +267,6 @@ export default function ClientsTab({ channelName, autoRefresh }: ClientsTabProps
           ))}
         </div>
       )}
-
-      {/* Note about API */}
-      <div className="p-4 bg-blue-50 dark:bg-blue-900/20 border border-blue-200 dark:border-blue-800 rounded-lg">
-        <div className="flex items-start gap-2">
-          <AlertCircle className="w-5 h-5 text-blue-600 dark:text-blue-400 flex-shrink-0 mt-0.5" />
-          <div>
-            <h4 className="text-sm font-semibold text-blue-900 dark:text-blue-100 mb-1">
-              API Integration Required
-            </h4>
-            <p className="text-sm text-blue-700 dark:text-blue-300">
-              This tab displays mock data. Connect your backend API endpoint for real client connection data.
-              Expected endpoint: <code className="px-1.5 py-0.5 bg-blue-100 dark:bg-blue-900/50 rounded font-mono text-xs">GET /api/channels/{`{name}`}/clients</code>
-            </p>
-          </div>
-        </div>
-      </div>
     </div>
   )
 }
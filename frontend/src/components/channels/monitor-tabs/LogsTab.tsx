@@ -7,7 +7,8 @@ import { channelsAPI } from '@/lib/api'
 interface LogEntry {
   process_idx: number
   text: string
-  timestamp: string
+  timestamp: string | null
+  level?: string
 }
 
 interface ProcessInfo {
@@ -37,9 +38,17 @@ export default function LogsTab({ channelName, autoRefresh }: LogsTabProps) {
   const [loading, setLoading] = useState(true)
   const logsEndRef = useRef<HTMLDivElement>(null)
 
+  // Filtering happens server-side against the log index
   const fetchLogs = async () => {
     try {
-      const response = await channelsAPI.getLogs(channelName, 500, selectedProcess)
+      const windowMs = getTimeFilterMs(timeRange)
+      const response = await channelsAPI.searchLogs(channelName, {
+        from: windowMs > 0 ? new Date(Date.now() - windowMs).toISOString() : undefined,
+        level: logLevel === 'all' ? undefined : logLevel,
+        q: searchTerm || undefined,
+        limit: 500,
+        processIdx: selectedProcess,
+      })
       setLogs(response.logs)
       setProcesses(response.processes)
     } catch (err) {
@@ -50,14 +59,15 @@ export default function LogsTab({ channelName, autoRefresh }: LogsTabProps) {
   }
 
   useEffect(() => {
-    fetchLogs()
-  }, [channelName, selectedProcess])
+    const timeout = setTimeout(fetchLogs, searchTerm ? 300 : 0)
+    return () => clearTimeout(timeout)
+  }, [channelName, selectedProcess, logLevel, timeRange, searchTerm])
 
   useEffect(() => {
     if (!autoRefresh) return
     const interval = setInterval(fetchLogs, 3000)
     return () => clearInterval(interval)
-  }, [autoRefresh, channelName, selectedProcess])
+  }, [autoRefresh, channelName, selectedProcess, logLevel, timeRange, searchTerm])
 
   useEffect(() => {
     if (autoScroll && logsEndRef.current) {
@@ -65,7 +75,9 @@ export default function LogsTab({ channelName, autoRefresh }: LogsTabProps) {
     }
   }, [logs, autoScroll])
 
-  // Classify log entry
+  // Classify log entry (level is provided by the backend index)
+  const levelOf = (log: LogEntry): LogLevel => (log.level as LogLevel) || classifyLog(log.text)
+
   const classifyLog = (text: string): LogLevel => {
     const lowerText = text.toLowerCase()
 
@@ -130,23 +142,6 @@ export default function LogsTab({ channelName, autoRefresh }: LogsTabProps) {
     return hours[range] * 60 * 60 * 1000
   }
 
-  // Filter logs
-  const filteredLogs = logs.filter(log => {
-    const level = classifyLog(log.text)
-    const matchesLevel = logLevel === 'all' || level === logLevel
-    const matchesSearch = searchTerm === '' || log.text.toLowerCase().includes(searchTerm.toLowerCase())
-
-    // Time filter
-    let matchesTime = true
-    if (timeRange !== 'all' && log.timestamp) {
-      const logTime = new Date(log.timestamp).getTime()
-      const cutoffTime = Date.now() - getTimeFilterMs(timeRange)
-      matchesTime = logTime >= cutoffTime
-    }
-
-    return matchesLevel && matchesSearch && matchesTime
-  })
-
   // Get process label
   const getProcessLabel = (process: ProcessInfo) => {
     return `P${process.idx + 1}: ${process.protocol.toUpperCase()} ${process.mode} ${process.host ? `${process.host}:` : ''}${process.port}`
@@ -238,17 +233,17 @@ export default function LogsTab({ channelName, autoRefresh }: LogsTabProps) {
 
         {/* Stats */}
         <div className="flex items-center gap-4 text-xs text-gray-500 dark:text-gray-400">
-          <span>{filteredLogs.length} entries shown</span>
+          <span>{logs.length} entries shown</span>
           <span className="w-px h-3 bg-gray-300 dark:bg-gray-600"></span>
-          <span>{logs.filter(l => classifyLog(l.text) === 'error').length} errors</span>
-          <span>{logs.filter(l => classifyLog(l.text) === 'warning').length} warnings</span>
-          <span>{logs.filter(l => classifyLog(l.text) === 'connection').length} connections</span>
+          <span>{logs.filter(l => levelOf(l) === 'error').length} errors</span>
+          <span>{logs.filter(l => levelOf(l) === 'warning').length} warnings</span>
+          <span>{logs.filter(l => levelOf(l) === 'connection').length} connections</span>
         </div>
       </div>
 
       {/* Logs Display */}
       <div className="flex-1 overflow-y-auto p-4 bg-gray-900 font-mono text-xs">
-        {filteredLogs.length === 0 ? (
+        {logs.length === 0 ? (
           <div className="flex items-center justify-center h-full">
             <div className="text-center">
               <Info className="w-12 h-12 mx-auto mb-3 text-gray-600" />
@@ -257,8 +252,8 @@ export default function LogsTab({ channelName, autoRefresh }: LogsTabProps) {
           </div>
         ) : (
           <div className="space-y-0.5">
-            {filteredLogs.map((log, index) => {
-              const level = classifyLog(log.text)
+            {logs.map((log, index) => {
+              const level = levelOf(log)
               const style = getLogStyle(level)
 
               return (
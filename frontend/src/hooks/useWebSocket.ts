@@ -1,17 +1,36 @@
 import { useState, useEffect, useCallback, useRef } from 'react'
 import type { Channel } from '@/types'
+import { decodeBinaryBatch, BinarySchemas } from '@/lib/telemetryCodec'
 
 export type ConnectionStatus = 'connecting' | 'connected' | 'disconnected' | 'error'
 
 export interface WebSocketMessage {
-  type: 'channel_update' | 'pong' | 'error'
+  type: 'channel_update' | 'channel_delta' | 'pong' | 'error' | 'ping' | 'get_channels' | 'subscribe' | 'unsubscribe' | 'subscribed' | 'configure'
   channels?: Channel[]
+  changed?: Channel[]
+  deleted?: string[]
+  version?: number
+  since?: number
+  epoch?: string
+  topics?: string[]
   message?: string
   timestamp?: string
 }
 
+// Pushed telemetry ("fleet", "system", "channel:<name>" and "logs:<name>" topics)
+export interface TelemetryMessage {
+  type: 'stats_sample' | 'channel_status' | 'media_info' | 'fleet_summary' | 'server_stats' | 'log_lines'
+  topic: string
+  channel_name?: string
+  [key: string]: unknown
+}
+
 export interface UseWebSocketOptions {
   onChannelsUpdate?: (channels: Channel[]) => void
+  onTelemetry?: (message: TelemetryMessage) => void
+  topics?: string[]
+  // Receive telemetry as compact binary batches instead of JSON
+  binaryTelemetry?: boolean
   onError?: (error: string) => void
   reconnectInterval?: number
   maxReconnectAttempts?: number
@@ -46,6 +65,9 @@ function getAuthToken(): string | null {
 export function useWebSocket(options: UseWebSocketOptions = {}): UseWebSocketReturn {
   const {
     onChannelsUpdate,
+    onTelemetry,
+    topics,
+    binaryTelemetry = true,
     onError,
     reconnectInterval = 3000,
     maxReconnectAttempts = 10,
@@ -63,6 +85,20 @@ export function useWebSocket(options: UseWebSocketOptions = {}): UseWebSocketRet
   const heartbeatCheckIntervalRef = useRef<NodeJS.Timeout>()
   const lastPongTimeRef = useRef<number>(Date.now())
   const isIntentionalClose = useRef(false)
+  const onTelemetryRef = useRef(onTelemetry)
+  onTelemetryRef.current = onTelemetry
+  const topicsRef = useRef(topics)
+  topicsRef.current = topics
+  // Last channel list and its server version, for delta sync on reconnect
+  const channelsRef = useRef<Channel[]>([])
+  const syncRef = useRef<{ version: number; epoch: string } | null>(null)
+  const schemasRef = useRef<BinarySchemas>({})
+
+  const applyChannels = useCallback((next: Channel[]) => {
+    channelsRef.current = next
+    setChannels(next)
+    onChannelsUpdate?.(next)
+  }, [onChannelsUpdate])
 
   // Send ping to keep connection alive
   const startPingInterval = useCallback(() => {
@@ -114,6 +150,7 @@ export function useWebSocket(options: UseWebSocketOptions = {}): UseWebSocketRet
       setError(null)
 
       const ws = new WebSocket(url)
+      ws.binaryType = 'arraybuffer'
       wsRef.current = ws
 
       ws.onopen = () => {
@@ -122,19 +159,56 @@ export function useWebSocket(options: UseWebSocketOptions = {}): UseWebSocketRet
         setReconnectAttempts(0)
         startPingInterval()
 
-        // Request initial channel data
-        ws.send(JSON.stringify({ type: 'get_channels' }))
+        // Request channel data - only what changed if we have seen a version
+        ws.send(JSON.stringify(
+          syncRef.current
+            ? { type: 'get_channels', since: syncRef.current.version, epoch: syncRef.current.epoch }
+            : { type: 'get_channels' }
+        ))
+
+        // Subscribe to pushed telemetry, batched per topic
+        if (topicsRef.current?.length) {
+          ws.send(JSON.stringify({ type: 'configure', batch: true, encoding: binaryTelemetry ? 'binary' : 'json' }))
+          ws.send(JSON.stringify({ type: 'subscribe', topics: topicsRef.current }))
+        }
       }
 
       ws.onmessage = (event) => {
         try {
-          const message: WebSocketMessage = JSON.parse(event.data)
+          if (event.data instanceof ArrayBuffer) {
+            const batch = decodeBinaryBatch(event.data, schemasRef.current)
+            batch.messages.forEach((m) => onTelemetryRef.current?.({ ...m, topic: batch.topic } as TelemetryMessage))
+            return
+          }
+
+          const message = JSON.parse(event.data)
 
-          if (message.type === 'pong') {
+          if (message.type === 'batch') {
+            message.messages.forEach((m: Record<string, unknown>) =>
+              onTelemetryRef.current?.({ ...m, topic: message.topic } as TelemetryMessage))
+          } else if (message.topic) {
+            onTelemetryRef.current?.(message as TelemetryMessage)
+          } else if (message.type === 'configured') {
+            schemasRef.current = message.schemas || {}
+          } else if (message.type === 'pong') {
             lastPongTimeRef.current = Date.now()
           } else if (message.type === 'channel_update' && message.channels) {
-            setChannels(message.channels)
-            onChannelsUpdate?.(message.channels)
+            if (message.version !== undefined) {
+              syncRef.current = { version: message.version, epoch: message.epoch }
+            }
+            applyChannels(message.channels)
+          } else if (message.type === 'channel_delta') {
+            syncRef.current = { version: message.version, epoch: message.epoch }
+            const changed: Channel[] = message.changed || []
+            const deleted = new Set<string>(message.deleted || [])
+            if (changed.length || deleted.size) {
+              const updates = new Map(changed.map((ch) => [ch.channel_name, ch]))
+              const merged = channelsRef.current
+                .filter((ch) => !deleted.has(ch.channel_name))
+                .map((ch) => updates.get(ch.channel_name) ?? ch)
+              const known = new Set(merged.map((ch) => ch.channel_name))
+              applyChannels([...merged, ...changed.filter((ch) => !known.has(ch.channel_name))])
+            }
           } else if (message.type === 'error') {
             setError(message.message || 'Unknown error')
             onError?.(message.message || 'Unknown error')
@@ -192,7 +266,8 @@ export function useWebSocket(options: UseWebSocketOptions = {}): UseWebSocketRet
     maxReconnectAttempts,
     reconnectInterval,
     startPingInterval,
-    onChannelsUpdate,
+    applyChannels,
+    binaryTelemetry,
     onError
   ])
 
@@ -25,6 +25,18 @@ function getAuthToken(): string | null {
   }
 }
 
+// Non-2xx response, with the `detail` of the FastAPI error body
+export class APIError extends Error {
+  status: number
+  detail: any
+
+  constructor(status: number, statusText: string, detail: any) {
+    super(typeof detail === 'string' ? detail : detail?.message || `API Error: ${status} ${statusText}`)
+    this.status = status
+    this.detail = detail
+  }
+}
+
 async function fetchAPI<T>(endpoint: string, options?: RequestInit): Promise<T> {
   const token = getAuthToken()
   const headers: Record<string, string> = {
@@ -45,7 +57,8 @@ async function fetchAPI<T>(endpoint: string, options?: RequestInit): Promise<T>
     if (response.status === 401 || response.status === 403) {
       throw new Error('Authentication required. Please login again.')
     }
-    throw new Error(`API Error: ${response.status} ${response.statusText}`)
+    const body = await response.json().catch(() => null)
+    throw new APIError(response.status, response.statusText, body?.detail)
   }
 
   return response.json()
@@ -130,6 +143,23 @@ export const channelsAPI = {
     }>(`/api/channels/${name}/logs?${params.toString()}`)
   },
 
+  searchLogs: (name: string, filters: LogSearchFilters = {}) => {
+    const params = new URLSearchParams()
+    if (filters.from) params.append('from', filters.from)
+    if (filters.to) params.append('to', filters.to)
+    if (filters.level) params.append('level', filters.level)
+    if (filters.q) params.append('q', filters.q)
+    if (filters.limit !== undefined) params.append('limit', filters.limit.toString())
+    if (filters.processIdx !== undefined) params.append('process_idx', filters.processIdx.toString())
+    return fetchAPI<{
+      logs: Array<{ process_idx: number; text: string; timestamp: string | null; level: string }>
+      processes: Array<{ idx: number; protocol: string; mode: string; host: string; port: number }>
+      has_multiple_processes: boolean
+      total_logs: number
+      scanned_blocks: number
+    }>(`/api/channels/${name}/logs/search?${params.toString()}`)
+  },
+
   getStreamInfo: (name: string, force: boolean = false) =>
     fetchAPI<StreamInfo>(`/api/channels/${name}/stream-info?force=${force}`),
 
@@ -144,6 +174,85 @@ export const channelsAPI = {
 
   getAnalyticsSummary: () =>
     fetchAPI<AnalyticsSummary>('/api/channels/analytics/summary'),
+
+  getClients: (name: string, history: number = 50) =>
+    fetchAPI<ChannelClients>(`/api/channels/${name}/clients?history=${history}`),
+
+  getFreePorts: (pool: 'input' | 'output' | 'tap', count: number = 1) =>
+    fetchAPI<{ pool: string; ports: number[] }>(`/api/channels/ports/free?pool=${pool}&count=${count}`),
+}
+
+// One entry of the `conflicts` of a 409 from creating/updating a channel
+export interface PortConflict {
+  protocol: string
+  address: string
+  port: number
+  role: string
+  channel: string
+  other_role: string
+  other_address: string
+  running: boolean
+}
+
+export interface LogSearchFilters {
+  from?: string
+  to?: string
+  level?: string
+  q?: string
+  limit?: number
+  processIdx?: number
+}
+
+// Per-socket SRT statistics demultiplexed from the stats CSV
+export interface ClientStats {
+  socket_id: number
+  rtt_ms: number
+  rtt_avg_ms: number | null
+  bandwidth_mbps: number
+  send_rate_mbps: number
+  recv_rate_mbps: number
+  send_loss_pct: number
+  recv_loss_pct: number
+  retransmitted: number
+  samples: number
+  totals: {
+    pkt_sent: number
+    pkt_snd_loss: number
+    pkt_retrans: number
+    pkt_snd_drop: number
+    pkt_recv: number
+    pkt_rcv_loss: number
+    pkt_rcv_drop: number
+    byte_sent: number
+    byte_recv: number
+  }
+  first_seen: string | null
+  last_seen: string | null
+  active: boolean
+  process_idx?: number
+}
+
+// Client sessions from the connection-event index
+export interface ClientSession {
+  ip: string
+  port: number
+  socket_id?: number | null
+  connected_at: string | null
+  disconnected_at: string | null
+  duration_seconds: number | null
+  active: boolean
+  process_idx?: number
+  stats?: ClientStats | null
+}
+
+export interface ChannelClients {
+  channel_name: string
+  status: string
+  active_clients: ClientSession[]
+  history: ClientSession[]
+  total_sessions: number
+  unmatched_streams?: ClientStats[]
+  timestamp: string
 }
 
 // Full channel info with SRT stats
@@ -323,6 +432,44 @@ export const systemAPI = {
   },
 }
 
+// Dashboard API - one round trip, revalidated with ETag
+export type DashboardField = 'channels' | 'summary' | 'stats' | 'media' | 'server'
+
+export interface Dashboard {
+  channels?: Channel[]
+  summary?: AnalyticsSummary
+  stats?: Record<string, SrtStats>
+  media?: Record<string, StreamInfo>
+  server?: ServerStats
+}
+
+const dashboardCache: Record<string, { etag: string; data: Dashboard }> = {}
+
+export const dashboardAPI = {
+  get: async (fields?: DashboardField[]): Promise<Dashboard> => {
+    const query = fields?.length ? `?fields=${fields.join(',')}` : ''
+    const cached = dashboardCache[query]
+    const token = getAuthToken()
+    const headers: Record<string, string> = {}
+    if (token) headers['Authorization'] = `Bearer ${token}`
+    if (cached) headers['If-None-Match'] = cached.etag
+
+    const response = await fetch(`${API_BASE}/api/dashboard${query}`, { headers, cache: 'no-store' })
+    if (response.status === 304 && cached) return cached.data
+    if (!response.ok) {
+      if (response.status === 401 || response.status === 403) {
+        throw new Error('Authentication required. Please login again.')
+      }
+      throw new Error(`API Error: ${response.status} ${response.statusText}`)
+    }
+
+    const data: Dashboard = await response.json()
+    const etag = response.headers.get('ETag')
+    if (etag) dashboardCache[query] = { etag, data }
+    return data
+  },
+}
+
 // Users API
 export type UserRole = 'admin' | 'readonly'
 
@@ -0,0 +1,84 @@
+// Decoder for binary telemetry batch frames (see backend app/core/ws_codec.py)
+
+export interface BinarySchema {
+  type: string
+  container: string
+  fields: string[]
+  format: string
+}
+
+export type BinarySchemas = Record<string, BinarySchema>
+
+const FIELD_SIZES: Record<string, number> = { B: 1, H: 2, I: 4, Q: 8, f: 4, d: 8 }
+
+function readField(view: DataView, offset: number, code: string): number {
+  switch (code) {
+    case 'B': return view.getUint8(offset)
+    case 'H': return view.getUint16(offset, true)
+    case 'I': return view.getUint32(offset, true)
+    case 'Q': return Number(view.getBigUint64(offset, true))
+    case 'f': return Math.round(view.getFloat32(offset, true) * 1e4) / 1e4
+    case 'd': return view.getFloat64(offset, true)
+    default: throw new Error(`Unsupported field format: ${code}`)
+  }
+}
+
+export function decodeBinaryBatch(buffer: ArrayBuffer, schemas: BinarySchemas): { topic: string; messages: Record<string, unknown>[] } {
+  const view = new DataView(buffer)
+  const bytes = new Uint8Array(buffer)
+  const text = new TextDecoder()
+  let offset = 1 // format version
+
+  const readString = (length: number) => {
+    const value = text.decode(bytes.subarray(offset, offset + length))
+    offset += length
+    return value
+  }
+
+  const topicLength = view.getUint16(offset, true)
+  offset += 2
+  const topic = readString(topicLength)
+  const count = view.getUint16(offset, true)
+  offset += 2
+
+  const messages: Record<string, unknown>[] = []
+  for (let i = 0; i < count; i++) {
+    const schemaId = view.getUint8(offset)
+    offset += 1
+
+    if (schemaId === 0) {
+      const length = view.getUint32(offset, true)
+      offset += 4
+      messages.push(JSON.parse(readString(length)))
+      continue
+    }
+
+    const schema = schemas[String(schemaId)]
+    if (!schema) throw new Error(`Unknown telemetry schema: ${schemaId}`)
+
+    const nameLength = view.getUint16(offset, true)
+    offset += 2
+    const channelName = readString(nameLength)
+
+    const values: Record<string, unknown> = {}
+    const codes = schema.format.replace(/^[<>=!@]/, '')
+    schema.fields.forEach((field, idx) => {
+      values[field] = readField(view, offset, codes[idx])
+      offset += FIELD_SIZES[codes[idx]]
+    })
+
+    const extraLength = view.getUint32(offset, true)
+    offset += 4
+    const extra: Record<string, unknown> = extraLength ? JSON.parse(readString(extraLength)) : {}
+    const container = (extra[schema.container] as Record<string, unknown> | undefined) || {}
+
+    messages.push({
+      ...extra,
+      type: schema.type,
+      ...(channelName ? { channel_name: channelName } : {}),
+      [schema.container]: { ...container, ...values }
+    })
+  }
+
+  return { topic, messages }
+}
@@ -77,6 +77,7 @@ export interface Channel {
   error_message?: string
   sources?: SourceInput[]
   destinations?: DestinationOutput[]
+  tap_port?: number | null  // Loopback UDP port the passive analyzer reads; an external tee must send the copy
 }
 
 export interface NetworkInterface {